@@ -1,48 +1,116 @@
 """
 Application Registry - Track allowed/blocked/unknown applications
 """
-import json
-import os
-from typing import Set, Dict
-from config import SETTINGS_FILE, DEFAULT_SETTINGS
+import threading
+from typing import Set, Dict, List
+from config import SETTINGS_FILE, DEFAULT_SETTINGS, SETTINGS_SAVE_DELAY, REGISTRY_BACKEND
+from paths import normalize_path
+from persistence import atomic_write_json
+from registry_storage import (
+    JsonStorage, create_storage, read_json_state,
+    EVENT_WHITELIST, EVENT_BLACKLIST, EVENT_FORGET, EVENT_CLEAR, EVENT_SETTING
+)
 
 class AppRegistry:
     """Manages whitelist, blacklist, and tracks known applications."""
     
-    def __init__(self, settings_file: str = None):
+    in_memory = True  # Queries are dict lookups (no I/O)
+    
+    def __init__(self, settings_file: str = None, save_delay: float = SETTINGS_SAVE_DELAY, storage=None):
+        """
+        Args:
+            settings_file: Settings (snapshot) file path
+            save_delay: Debounce window for snapshot writes (JSON backend)
+            storage: Storage backend (default: JsonStorage)
+        """
         self.settings_file = settings_file or SETTINGS_FILE
         self.whitelist: Set[str] = set()  # Allowed apps (paths)
         self.blacklist: Set[str] = set()  # Blocked apps (paths)
         self.pending_decisions: Set[str] = set()  # Apps waiting for user decision
         self.settings: Dict = DEFAULT_SETTINGS.copy()  # User settings
+        # Normalized path -> stored path, kept in sync with the sets above
+        self._whitelist_index: Dict[str, str] = {}
+        self._blacklist_index: Dict[str, str] = {}
+        self._lock = threading.RLock()  # Guards mutations vs. background snapshot
+        self.revision = 0  # Bumped on every whitelist/blacklist change
+        self.storage = storage or JsonStorage(self.settings_file, save_delay)
+        self.storage.bind(self._snapshot)
         self._load_settings()
     
     def _load_settings(self):
-        """Load whitelist/blacklist/settings from file."""
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.whitelist = set(data.get('whitelist', []))
-                    self.blacklist = set(data.get('blacklist', []))
-                    # Load user settings, merge with defaults
-                    saved_settings = data.get('settings', {})
-                    self.settings.update(saved_settings)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-    
-    def _save_settings(self):
-        """Save whitelist/blacklist/settings to file."""
-        try:
-            data = {
+        """Load whitelist/blacklist/settings from storage."""
+        data = self.storage.load()
+        self.whitelist = set(data['whitelist'])
+        self.blacklist = set(data['blacklist'])
+        # Load user settings, merge with defaults
+        self.settings.update(data['settings'])
+        self._rebuild_indexes()
+    
+    def _record(self, events: List):
+        """Persist change events through the storage backend."""
+        if any(event[0] != EVENT_SETTING for event in events):
+            self.revision += 1
+        self.storage.record(events)
+    
+    def _snapshot(self) -> Dict:
+        """Get serializable copy of current state (may be called from other threads)."""
+        with self._lock:
+            return {
                 'whitelist': list(self.whitelist),
                 'blacklist': list(self.blacklist),
-                'settings': self.settings
+                'settings': dict(self.settings)
             }
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+    
+    def flush(self):
+        """Write pending changes to disk now."""
+        self.storage.flush()
+    
+    def close(self):
+        """Flush pending changes and release storage."""
+        self.storage.close()
+    
+    def export_json(self, path: str):
+        """Export lists and settings in the standard settings JSON format."""
+        atomic_write_json(path, self._snapshot())
+    
+    def import_json(self, path: str):
+        """Replace lists and settings with the contents of a JSON export."""
+        data = read_json_state(path)
+        with self._lock:
+            self.whitelist = set(data['whitelist'])
+            self.blacklist = set(data['blacklist'])
+            self.pending_decisions.clear()
+            self.settings = DEFAULT_SETTINGS.copy()
+            self.settings.update(data['settings'])
+            self._rebuild_indexes()
+            events = [(EVENT_CLEAR,)]
+            events += [(EVENT_WHITELIST, p) for p in self.whitelist]
+            events += [(EVENT_BLACKLIST, p) for p in self.blacklist]
+            events += [(EVENT_SETTING, k, v) for k, v in self.settings.items()]
+            self._record(events)
+    
+    def _rebuild_indexes(self):
+        """Rebuild normalized path indexes from whitelist/blacklist."""
+        self._whitelist_index = {normalize_path(p): p for p in self.whitelist}
+        self._blacklist_index = {normalize_path(p): p for p in self.blacklist}
+    
+    @staticmethod
+    def _add_path(paths: Set[str], index: Dict[str, str], app_path: str):
+        """Add path to a list, replacing any equivalent spelling."""
+        key = normalize_path(app_path)
+        previous = index.get(key)
+        if previous is not None:
+            paths.discard(previous)
+        paths.add(app_path)
+        index[key] = app_path
+    
+    @staticmethod
+    def _discard_path(paths: Set[str], index: Dict[str, str], app_path: str):
+        """Remove path (or any equivalent spelling) from a list."""
+        previous = index.pop(normalize_path(app_path), None)
+        if previous is not None:
+            paths.discard(previous)
+        paths.discard(app_path)
     
     def get_setting(self, key: str):
         """Get a setting value."""
@@ -50,60 +118,136 @@ class AppRegistry:
     
     def update_setting(self, key: str, value):
         """Update a setting value."""
-        self.settings[key] = value
-        self._save_settings()
+        with self._lock:
+            self.settings[key] = value
+            self._record([(EVENT_SETTING, key, value)])
     
     def is_whitelisted(self, app_path: str) -> bool:
         """Check if app is in whitelist."""
-        return app_path.lower() in {p.lower() for p in self.whitelist}
+        return normalize_path(app_path) in self._whitelist_index
     
     def is_blacklisted(self, app_path: str) -> bool:
         """Check if app is in blacklist."""
-        return app_path.lower() in {p.lower() for p in self.blacklist}
+        return normalize_path(app_path) in self._blacklist_index
     
     def is_known(self, app_path: str) -> bool:
         """Check if app decision was made (in whitelist or blacklist)."""
-        path_lower = app_path.lower()
-        return path_lower in {p.lower() for p in self.whitelist} or \
-               path_lower in {p.lower() for p in self.blacklist}
+        key = normalize_path(app_path)
+        return key in self._whitelist_index or key in self._blacklist_index
     
     def add_to_whitelist(self, app_path: str):
         """Add app to whitelist."""
-        self.whitelist.add(app_path)
-        # Remove from blacklist if present
-        self.blacklist.discard(app_path)
-        self.pending_decisions.discard(app_path)
-        self._save_settings()
+        self.add_many_to_whitelist([app_path])
     
     def add_to_blacklist(self, app_path: str):
         """Add app to blacklist."""
-        self.blacklist.add(app_path)
-        # Remove from whitelist if present
-        self.whitelist.discard(app_path)
-        self.pending_decisions.discard(app_path)
-        self._save_settings()
+        self.add_many_to_blacklist([app_path])
+    
+    def add_many_to_whitelist(self, app_paths: list):
+        """Add several apps to whitelist with a single save."""
+        with self._lock:
+            for app_path in app_paths:
+                self._add_path(self.whitelist, self._whitelist_index, app_path)
+                # Remove from blacklist if present
+                self._discard_path(self.blacklist, self._blacklist_index, app_path)
+                self.pending_decisions.discard(app_path)
+            self._record([(EVENT_WHITELIST, p) for p in app_paths])
+    
+    def add_many_to_blacklist(self, app_paths: list):
+        """Add several apps to blacklist with a single save."""
+        with self._lock:
+            for app_path in app_paths:
+                self._add_path(self.blacklist, self._blacklist_index, app_path)
+                # Remove from whitelist if present
+                self._discard_path(self.whitelist, self._whitelist_index, app_path)
+                self.pending_decisions.discard(app_path)
+            self._record([(EVENT_BLACKLIST, p) for p in app_paths])
     
     def remove_from_whitelist(self, app_path: str):
         """Remove app from whitelist."""
-        self.whitelist.discard(app_path)
-        self._save_settings()
+        with self._lock:
+            if not self.is_whitelisted(app_path):
+                return
+            self._discard_path(self.whitelist, self._whitelist_index, app_path)
+            self._record([(EVENT_FORGET, app_path)])
     
     def remove_from_blacklist(self, app_path: str):
         """Remove app from blacklist."""
-        self.blacklist.discard(app_path)
-        self._save_settings()
+        with self._lock:
+            if not self.is_blacklisted(app_path):
+                return
+            self._discard_path(self.blacklist, self._blacklist_index, app_path)
+            self._record([(EVENT_FORGET, app_path)])
     
     def forget_app(self, app_path: str):
         """Remove app from both lists (will ask again on next connection)."""
-        self.whitelist.discard(app_path)
-        self.blacklist.discard(app_path)
-        self.pending_decisions.discard(app_path)
-        self._save_settings()
+        with self._lock:
+            self._discard_path(self.whitelist, self._whitelist_index, app_path)
+            self._discard_path(self.blacklist, self._blacklist_index, app_path)
+            self.pending_decisions.discard(app_path)
+            self._record([(EVENT_FORGET, app_path)])
+    
+    def clear_lists(self):
+        """Remove all apps from whitelist and blacklist."""
+        with self._lock:
+            self.whitelist.clear()
+            self.blacklist.clear()
+            self.pending_decisions.clear()
+            self._rebuild_indexes()
+            self._record([(EVENT_CLEAR,)])
+    
+    def query_apps(self, list_type: str, search: str = None, offset: int = 0, limit: int = None) -> List[str]:
+        """
+        Get one page of a list, sorted by path.
+        
+        Args:
+            list_type: 'whitelist' or 'blacklist'
+            search: Case-insensitive substring of the path to filter by
+            offset: Number of matching apps to skip
+            limit: Maximum number of apps to return (None = all)
+        """
+        apps = self._filtered(list_type, search)
+        return apps[offset:] if limit is None else apps[offset:offset + limit]
+    
+    def count_apps(self, list_type: str, search: str = None) -> int:
+        """Count apps in a list (optionally filtered by path substring)."""
+        if not search:
+            return len(self.whitelist if list_type == 'whitelist' else self.blacklist)
+        return len(self._filtered(list_type, search))
+    
+    def _filtered(self, list_type: str, search: str = None) -> List[str]:
+        """Get sorted list contents matching a path substring."""
+        if list_type == 'whitelist':
+            apps = self.get_whitelist()
+        elif list_type == 'blacklist':
+            apps = self.get_blacklist()
+        else:
+            raise ValueError(f"Unknown list: {list_type}")
+        if search:
+            needle = search.casefold().replace('/', '\\')
+            apps = [p for p in apps if needle in normalize_path(p)]
+        return apps
     
     def get_whitelist(self) -> list:
         """Get list of whitelisted apps."""
-        return sorted(list(self.whitelist))
+        with self._lock:
+            return sorted(list(self.whitelist))
     
     def get_blacklist(self) -> list:
         """Get list of blacklisted apps."""
-        return sorted(list(self.blacklist))
+        with self._lock:
+            return sorted(list(self.blacklist))
+
+def open_registry(backend: str = REGISTRY_BACKEND, settings_file: str = None):
+    """
+    Create the app registry for a backend.
+    
+    Args:
+        backend: "json", "journal" or "sqlite" (see config.REGISTRY_BACKEND)
+        settings_file: JSON settings file (snapshot, or import source for sqlite)
+    """
+    settings_file = settings_file or SETTINGS_FILE
+    if backend == "sqlite":
+        from sqlite_registry import SqliteAppRegistry
+        return SqliteAppRegistry(import_from=settings_file)
+    return AppRegistry(settings_file=settings_file, storage=create_storage(backend, settings_file))
@@ -0,0 +1,243 @@
+"""
+Async API - asyncio facade over the monitor, registry and firewall worker
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+from concurrent.futures import Future
+from monitor import ConnectionDelta, ConnectionSnapshot, NetworkMonitor
+
+SUPERSEDED = "Superseded by a later command for the same app"
+
+class _Consumer:
+    """One async iterator's pending update and wake-up future (event loop only)."""
+    __slots__ = ('pending', 'waiter')
+    
+    def __init__(self):
+        self.pending: Optional[ConnectionSnapshot] = None
+        self.waiter: Optional[asyncio.Future] = None
+
+class AsyncMonitor:
+    """
+    Async iterators over a NetworkMonitor's snapshots.
+    
+    All consumers in the event loop share one monitor subscription. Its
+    notify callback schedules a single fan-out on the loop per batch
+    (call_soon_threadsafe), so no thread is started per consumer and the
+    monitor thread's work doesn't grow with the number of consumers. A
+    consumer that falls behind gets one snapshot whose delta is merged
+    over everything it missed.
+    """
+    
+    def __init__(self, monitor: NetworkMonitor):
+        self.monitor = monitor
+        self._consumers: Dict[int, _Consumer] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscription = None
+        self._closed = False
+    
+    async def snapshots(self, current: bool = False) -> AsyncIterator[ConnectionSnapshot]:
+        """
+        Yield each published snapshot that changed something.
+        
+        Args:
+            current: Yield the latest snapshot first (full state to start from)
+        """
+        self._ensure_subscribed()
+        consumer = _Consumer()
+        self._consumers[id(consumer)] = consumer
+        try:
+            if current:
+                yield self.monitor.get_snapshot()
+            while not self._closed:
+                if consumer.pending is None:
+                    consumer.waiter = self._loop.create_future()
+                    await consumer.waiter
+                    consumer.waiter = None
+                    continue
+                snapshot, consumer.pending = consumer.pending, None
+                yield snapshot
+        finally:
+            self._consumers.pop(id(consumer), None)
+    
+    async def deltas(self) -> AsyncIterator[ConnectionDelta]:
+        """Yield the changes of each update (merged if the consumer lagged)."""
+        async for snapshot in self.snapshots():
+            yield snapshot.delta
+    
+    def consumers(self) -> int:
+        """Number of active iterators."""
+        return len(self._consumers)
+    
+    def close(self):
+        """Unsubscribe from the monitor and end all iterators."""
+        self._closed = True
+        if self._subscription is not None:
+            self.monitor.unsubscribe(self._subscription)
+            self._subscription = None
+        for consumer in self._consumers.values():
+            if consumer.waiter is not None and not consumer.waiter.done():
+                consumer.waiter.set_result(None)
+    
+    def _ensure_subscribed(self):
+        """Subscribe once, bound to the running loop."""
+        if self._subscription is None and not self._closed:
+            self._loop = asyncio.get_running_loop()
+            self._subscription = self.monitor.subscribe(maxsize=1, notify=self._notify)
+    
+    def _notify(self):
+        """Queue became non-empty (monitor thread): schedule one fan-out."""
+        try:
+            self._loop.call_soon_threadsafe(self._fan_out)
+        except RuntimeError:
+            pass  # Loop closed
+    
+    def _fan_out(self):
+        """Hand queued snapshots to every consumer (event loop)."""
+        subscription = self._subscription
+        if subscription is None:
+            return
+        for snapshot in subscription.drain():
+            for consumer in self._consumers.values():
+                if consumer.pending is None:
+                    consumer.pending = snapshot
+                else:
+                    consumer.pending = snapshot.merged_after(consumer.pending)
+                if consumer.waiter is not None and not consumer.waiter.done():
+                    consumer.waiter.set_result(None)
+
+class AsyncFirewall:
+    """
+    Awaitable firewall operations on a FirewallWorker.
+    
+    Awaiting a worker future costs a done-callback, not a thread. A full
+    worker queue raises queue.Full (nothing waits on the loop). A command
+    superseded by the opposite one for the same app (the worker cancels
+    it) returns (False, SUPERSEDED) rather than raising CancelledError,
+    which would look like the awaiting task itself was cancelled.
+    Cancelling the awaiting task still cancels the queued command.
+    """
+    
+    def __init__(self, worker):
+        """
+        Args:
+            worker: Started FirewallWorker
+        """
+        self.worker = worker
+    
+    async def block(self, app_path: str) -> tuple[bool, str]:
+        """Block an application; returns (success, message)."""
+        return await self._result(self.worker.block(app_path))
+    
+    async def unblock(self, app_path: str) -> tuple[bool, str]:
+        """Remove an application's block rule; returns (success, message)."""
+        return await self._result(self.worker.unblock(app_path))
+    
+    async def apply_batch(self, block: Iterable[str] = (), unblock: Iterable[str] = ()) -> Dict[str, tuple[bool, str]]:
+        """Block/unblock many applications; returns path -> (success, message)."""
+        futures = self.worker.apply(block=block, unblock=unblock)
+        results = await asyncio.gather(*(self._result(f) for f in futures.values()),
+                                       return_exceptions=True)
+        return {app_path: result if isinstance(result, tuple) else (False, str(result) or type(result).__name__)
+                for app_path, result in zip(futures, results)}
+    
+    async def is_blocked(self, app_path: str) -> bool:
+        """Check if an application is currently blocked."""
+        return await self.call(self.worker.manager.is_blocked, app_path)
+    
+    async def get_active_rules(self) -> List:
+        """Get all rules created by this application."""
+        return await self.call(self.worker.manager.get_active_rules)
+    
+    async def call(self, func: Callable, *args):
+        """Run func(*args) on the firewall thread and await the result."""
+        return await asyncio.wrap_future(self.worker.submit(func, *args))
+    
+    @staticmethod
+    async def _result(future: Future) -> tuple[bool, str]:
+        """Await a block/unblock future; a cancelled one means it was superseded."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        
+        def copy(source: Future):
+            if waiter.done():
+                return  # The awaiting task was cancelled
+            if source.cancelled():
+                waiter.set_result((False, SUPERSEDED))
+            elif source.exception() is not None:
+                waiter.set_exception(source.exception())
+            else:
+                waiter.set_result(source.result())
+        
+        def on_done(source: Future):
+            try:
+                loop.call_soon_threadsafe(copy, source)
+            except RuntimeError:
+                pass  # Loop closed
+        
+        future.add_done_callback(on_done)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            future.cancel()  # Drop the command if it hasn't run yet
+            raise
+
+class AsyncRegistry:
+    """
+    Awaitable registry queries.
+    
+    The in-memory registry (AppRegistry) answers from dicts, so queries
+    run inline on the loop. Backends that do I/O (SqliteAppRegistry) run
+    on one executor thread shared by all calls.
+    """
+    
+    def __init__(self, registry, executor: ThreadPoolExecutor = None):
+        """
+        Args:
+            registry: AppRegistry or SqliteAppRegistry
+            executor: Executor for I/O-bound backends (default: one shared thread)
+        """
+        self.registry = registry
+        self._owns_executor = False
+        if getattr(registry, 'in_memory', False):
+            executor = None  # Dict lookups: cheaper inline than a thread hop
+        elif executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="registry")
+            self._owns_executor = True
+        self.executor = executor
+    
+    async def is_whitelisted(self, app_path: str) -> bool:
+        """Check if app is whitelisted."""
+        return await self.call(self.registry.is_whitelisted, app_path)
+    
+    async def is_blacklisted(self, app_path: str) -> bool:
+        """Check if app is blacklisted."""
+        return await self.call(self.registry.is_blacklisted, app_path)
+    
+    async def is_known(self, app_path: str) -> bool:
+        """Check if app is in either list."""
+        return await self.call(self.registry.is_known, app_path)
+    
+    async def query_apps(self, list_type: str, search: str = None, offset: int = 0, limit: int = None) -> List[str]:
+        """Get one page of a list (see AppRegistry.query_apps)."""
+        return await self.call(partial(self.registry.query_apps, list_type, search, offset, limit))
+    
+    async def count_apps(self, list_type: str, search: str = None) -> int:
+        """Count apps in a list (optionally filtered by path substring)."""
+        return await self.call(self.registry.count_apps, list_type, search)
+    
+    async def get_setting(self, key: str):
+        """Get a setting value."""
+        return await self.call(self.registry.get_setting, key)
+    
+    async def call(self, func: Callable, *args):
+        """Run a registry call inline or on the executor thread."""
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+    
+    def close(self):
+        """Shut down the executor thread if this facade created it."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,91 @@
+"""
+Benchmark - Async consumers of monitor snapshots: shared vs per-consumer subscription
+
+Usage:
+    python -m benchmarks.bench_async_fanout
+"""
+import asyncio
+import threading
+import time
+from async_api import AsyncMonitor
+from monitor import Connection, ConnectionDelta, NetworkMonitor
+
+TICKS = 20
+
+
+def make_tick(i: int):
+    conn = Connection("app.exe", "C:\\Apps\\app.exe", 100, "127.0.0.1", 1000 + i,
+                      "10.0.0.1", 443, "ESTABLISHED", "TCP")
+    return [conn], ConnectionDelta(opened=[conn], total=1)
+
+
+async def run_consumers(consumers: int, make_iterator, monitor: NetworkMonitor):
+    """Start consumers, publish TICKS ticks from a thread, wait until all saw the last one."""
+    received = [0]
+    done = asyncio.Event()
+    
+    async def consume(iterator):
+        async for snapshot in iterator:
+            received[0] += 1
+            if snapshot.version == TICKS:
+                return
+    
+    iterators = [make_iterator() for _ in range(consumers)]
+    for iterator in iterators:
+        await iterator.__anext__()  # Register (yields the current snapshot)
+    tasks = [asyncio.ensure_future(consume(iterator)) for iterator in iterators]
+    await asyncio.sleep(0)
+    
+    publish_time = [0.0]
+    
+    def publish():
+        for i in range(TICKS):
+            start = time.perf_counter()
+            monitor._publish(*make_tick(i))
+            publish_time[0] += time.perf_counter() - start
+            time.sleep(0.001)
+    
+    start = time.perf_counter()
+    thread = threading.Thread(target=publish)
+    thread.start()
+    await asyncio.gather(*tasks)
+    total = time.perf_counter() - start
+    thread.join()
+    return total, publish_time[0] / TICKS, received[0]
+
+
+def per_consumer_iterator(monitor: NetworkMonitor):
+    """Naive facade: one monitor subscription per consumer."""
+    async def iterate():
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        subscription = monitor.subscribe(maxsize=1, notify=lambda: loop.call_soon_threadsafe(wake.set))
+        try:
+            yield monitor.get_snapshot()
+            while True:
+                await wake.wait()
+                wake.clear()
+                for snapshot in subscription.drain():
+                    yield snapshot
+        finally:
+            monitor.unsubscribe(subscription)
+    return iterate()
+
+
+async def main():
+    for consumers in (100, 1000, 5000):
+        monitor = NetworkMonitor()
+        facade = AsyncMonitor(monitor)
+        shared = await run_consumers(consumers, lambda: facade.snapshots(current=True), monitor)
+        facade.close()
+        
+        monitor = NetworkMonitor()
+        naive = await run_consumers(consumers, lambda: per_consumer_iterator(monitor), monitor)
+        
+        for label, (total, publish, received) in (("shared", shared), ("per-consumer", naive)):
+            print(f"{consumers:>5} consumers {label:>12}: all delivered in {total * 1e3:7.1f} ms | "
+                  f"monitor thread {publish * 1e3:7.3f} ms/tick | {received} updates received")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
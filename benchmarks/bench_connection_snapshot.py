@@ -0,0 +1,96 @@
+"""
+Benchmark - Memory and allocations of a 10k-connection snapshot
+
+Feeds NetworkMonitor._fetch_connections 10,000 synthetic sockets spread
+over 200 processes (500 remote hosts) and compares the retained snapshot as:
+  - dict-based dataclass records (the previous Connection)
+  - slotted Connection list
+  - columnar ConnectionTable
+Reports retained bytes and live allocated blocks per snapshot, and peak
+traced memory and time (with tracing on) for one tick.
+
+Usage:
+    python -m benchmarks.bench_connection_snapshot
+"""
+import gc
+import socket
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from connection_sources import PollingConnectionSource
+from monitor import NetworkMonitor
+from proc_net import Address, SocketEntry
+
+SOCKETS = 10000
+PROCESSES = 200
+REMOTE_HOSTS = 500
+
+
+@dataclass
+class DictConnection:
+    """Previous Connection layout (per-instance __dict__)."""
+    process_name: str
+    process_path: str
+    pid: int
+    local_addr: str
+    local_port: int
+    remote_addr: str
+    remote_port: int
+    status: str
+    protocol: str
+
+
+def make_entries():
+    """Synthetic psutil-style socket records."""
+    return [SocketEntry(-1, socket.AF_INET, socket.SOCK_STREAM,
+                        Address('10.0.0.2', 1024 + i), Address(f"93.184.{i % REMOTE_HOSTS // 256}.{i % 256}", 443),
+                        'ESTABLISHED', 1000 + i % PROCESSES)
+            for i in range(SOCKETS)]
+
+
+def make_monitor(entries, columnar_threshold: int) -> NetworkMonitor:
+    """Monitor with process lookups stubbed out (no psutil calls)."""
+    monitor = NetworkMonitor(source=PollingConnectionSource(lambda: entries), columnar_threshold=columnar_threshold)
+    infos = {pid: {'name': sys.intern(f"app{pid % 20}.exe"), 'path': sys.intern(f"C:\\Apps\\app{pid % 20}.exe")}
+             for pid in range(1000, 1000 + PROCESSES)}
+    monitor.resolver.resolve_many = lambda pids: {pid: infos[pid] for pid in pids}
+    return monitor
+
+
+def measure(label: str, build):
+    """Retained size/blocks and peak memory of build()."""
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    start = time.perf_counter()
+    snapshot = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks_before
+    print(f"{label:<22} {retained / 1024:>9.0f} KiB {blocks:>9} {peak / 1024:>9.0f} KiB {elapsed * 1000:>8.1f}ms")
+    return snapshot
+
+
+def main():
+    entries = make_entries()
+    print(f"{SOCKETS} connections, {PROCESSES} processes")
+    print(f"{'snapshot':<22} {'retained':>13} {'blocks':>9} {'peak':>13} {'tick':>10}")
+    
+    slotted = make_monitor(entries, columnar_threshold=0)
+    columnar = make_monitor(entries, columnar_threshold=1)
+    
+    def dict_records():
+        return [DictConnection(*(getattr(c, f) for f in DictConnection.__dataclass_fields__))
+                for c in slotted._fetch_connections()]
+    
+    keep = [measure("dataclass (__dict__)", dict_records),
+            measure("slotted Connection", slotted._fetch_connections),
+            measure("ConnectionTable", columnar._fetch_connections)]
+    return keep
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark - Caller blocking time: direct FirewallManager calls vs FirewallWorker
+
+A fake policy with a simulated per-call COM cost stands in for FwPolicy2.
+
+Usage:
+    python -m benchmarks.bench_firewall_worker
+"""
+import os
+import tempfile
+import time
+from firewall_manager import FirewallManager
+from firewall_worker import FirewallWorker
+from tests.fake_policy import FakeFwPolicy2, FakeRules, fake_rule_factory
+
+COM_CALL_COST = 0.002  # seconds per Rules.Add/Remove
+DECISIONS = 100
+REPEATS = 3  # Each app decided this many times in a row (e.g. double clicks, monitor + UI)
+
+
+class SlowRules(FakeRules):
+    def Add(self, rule):
+        time.sleep(COM_CALL_COST)
+        super().Add(rule)
+    
+    def Remove(self, name):
+        time.sleep(COM_CALL_COST)
+        super().Remove(name)
+
+
+def make_manager():
+    policy = FakeFwPolicy2()
+    policy.Rules = SlowRules()
+    policy.add_system_rules(10_000)
+    return FirewallManager(fw_policy=policy, rule_factory=fake_rule_factory)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        apps = []
+        for i in range(DECISIONS):
+            app_path = os.path.join(temp_dir, f"app{i}.exe")
+            open(app_path, 'w').close()
+            apps.append(app_path)
+        decisions = [app_path for app_path in apps for _ in range(REPEATS)]
+        
+        manager = make_manager()
+        longest = 0.0
+        start = time.perf_counter()
+        for app_path in decisions:
+            call_start = time.perf_counter()
+            manager.add_block_rule(app_path)
+            longest = max(longest, time.perf_counter() - call_start)
+        direct_total = time.perf_counter() - start
+        
+        worker = FirewallWorker(make_manager)
+        worker.start()
+        futures = []
+        submit_longest = 0.0
+        start = time.perf_counter()
+        for app_path in decisions:
+            call_start = time.perf_counter()
+            futures.append(worker.block(app_path))
+            submit_longest = max(submit_longest, time.perf_counter() - call_start)
+        submit_total = time.perf_counter() - start
+        for future in futures:
+            future.result()
+        worker_total = time.perf_counter() - start
+        stats = worker.stats()
+        worker.stop()
+    
+    print(f"{len(decisions)} block decisions ({DECISIONS} apps), {COM_CALL_COST * 1e3:.0f} ms per COM call")
+    print(f"  direct: caller blocked {direct_total * 1e3:7.1f} ms total, longest call {longest * 1e3:6.2f} ms")
+    print(f"  worker: caller blocked {submit_total * 1e3:7.1f} ms total, longest submit {submit_longest * 1e3:6.3f} ms; "
+          f"all applied after {worker_total * 1e3:7.1f} ms")
+    print(f"          coalesced {stats['coalesced']}, max depth {stats['max_depth']}, "
+          f"avg latency {stats['avg_latency'] * 1e3:.1f} ms, max latency {stats['max_latency'] * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark - Allowed/Blocked tab update cost per user action
+
+Compares, for registries of 1k/10k/50k apps, what one allow/block click
+costs the list tabs:
+  - rebuild: re-read and sort the registry list and render a card for
+    every app (what _load_lists used to do, widgets excluded)
+  - keyed: reconcile the one changed app into SortedKeyList and redraw
+    only the visible rows whose app changed (VirtualAppList)
+
+Usage:
+    python -m benchmarks.bench_list_tabs
+"""
+import os
+import time
+from virtual_list import SortedKeyList, VirtualListModel
+
+SIZES = (1000, 10000, 50000)
+ACTIONS = 200
+VIEWPORT_HEIGHT = 800
+ROW_HEIGHT = 72
+
+
+def render(app_path: str) -> tuple:
+    """Card content, as ListCard shows it."""
+    return (os.path.basename(app_path), app_path)
+
+
+def main():
+    print(f"{'apps':>8} {'rebuild/action':>15} {'keyed/action':>13} {'rows redrawn':>13}")
+    for size in SIZES:
+        apps = {f"C:\\Apps\\Vendor{i % 97}\\app{i:06}.exe" for i in range(size)}
+        moving = sorted(apps)[size // 3]  # Toggled between the two tabs
+        
+        start = time.perf_counter()
+        for _ in range(ACTIONS // 10):
+            cards = [render(app) for app in sorted(list(apps))]
+        rebuild = (time.perf_counter() - start) / (ACTIONS // 10)
+        
+        keys = SortedKeyList(apps)
+        model = VirtualListModel(ROW_HEIGHT, render)
+        model.resize(VIEWPORT_HEIGHT)
+        model.set_items(keys)
+        model.scroll_to(keys.index(moving) - 2)  # Changed app is on screen
+        model.pending_updates()
+        
+        redrawn = 0
+        start = time.perf_counter()
+        for action in range(ACTIONS):
+            if action % 2:
+                keys.add(moving)
+            else:
+                keys.discard(moving)
+            model.set_items(keys)
+            redrawn += len(model.pending_updates())
+        keyed = (time.perf_counter() - start) / ACTIONS
+        
+        print(f"{size:>8} {rebuild * 1000:>13.2f}ms {keyed * 1000:>11.3f}ms {redrawn / ACTIONS:>13.1f}")
+        del cards
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark - Burst of 300 newly detected apps
+
+Runs 300 new apps (plus already-known and system apps in the same burst)
+through:
+  - per-app: is_known, is_safe_to_block, add_to_blacklist, add_block_rule
+    and a list-tab update for every app (the previous new_app_callback path)
+  - batched: triage_new_apps, add_many_to_blacklist, apply_batch and one
+    list-tab update for the whole batch (_on_new_apps_detected)
+against a registry with immediate saves and a fake policy with 10,000
+system rules. Reports total time, registry writes and UI-thread updates.
+
+Usage:
+    python -m benchmarks.bench_new_apps
+"""
+import os
+import shutil
+import tempfile
+import time
+from app_registry import AppRegistry
+from firewall_manager import FirewallManager
+from safety import is_safe_to_block, triage_new_apps
+from tests.fake_policy import FakeFwPolicy2, fake_rule_factory
+from virtual_list import SortedKeyList, VirtualListModel
+
+NEW_APPS = 300
+SYSTEM_RULES = 10000
+
+
+def make_burst():
+    """New apps, some known ones and system processes, with duplicates."""
+    burst = [f"C:\\Apps\\Vendor{i % 9}\\new{i:03}.exe" for i in range(NEW_APPS)]
+    burst += [f"C:\\Apps\\known{i}.exe" for i in range(20)]
+    burst += ["C:\\Windows\\System32\\svchost.exe", "C:\\Windows\\System32\\lsass.exe"]
+    return burst + burst[:50]
+
+
+class Setup:
+    """Fresh registry, firewall and Blocked tab model."""
+    
+    def __init__(self, directory: str):
+        self.registry = AppRegistry(settings_file=os.path.join(directory, "settings.json"), save_delay=0)
+        self.registry.add_many_to_whitelist([f"C:\\Apps\\known{i}.exe" for i in range(20)])
+        self.fw = FirewallManager(fw_policy=FakeFwPolicy2(system_rules=SYSTEM_RULES), rule_factory=fake_rule_factory)
+        self.keys = SortedKeyList()
+        self.model = VirtualListModel(72, lambda path: path)
+        self.model.resize(800)
+        self.ui_updates = 0
+    
+    def update_tab(self, app_paths):
+        """What _update_app_lists does for the Blocked tab."""
+        for app_path in app_paths:
+            self.keys.add(app_path)
+        self.model.set_items(self.keys)
+        self.model.pending_updates()
+        self.ui_updates += 1
+
+
+def per_app(setup: Setup, burst):
+    for app_path in burst:
+        if setup.registry.is_known(app_path):
+            continue
+        if not is_safe_to_block(app_path=app_path)[0]:
+            continue
+        setup.registry.add_to_blacklist(app_path)
+        setup.fw.add_block_rule(app_path)
+        setup.update_tab([app_path])
+
+
+def batched(setup: Setup, burst):
+    app_paths = triage_new_apps(burst, setup.registry.is_known)
+    setup.registry.add_many_to_blacklist(app_paths)
+    setup.fw.apply_batch(block=app_paths)
+    setup.update_tab(app_paths)
+
+
+def main():
+    burst = make_burst()
+    print(f"{len(burst)} detections, {NEW_APPS} new apps, {SYSTEM_RULES} system rules")
+    print(f"{'mode':<9} {'total':>10} {'registry writes':>16} {'UI updates':>11} {'blocked':>8}")
+    for label, run in (("per-app", per_app), ("batched", batched)):
+        directory = tempfile.mkdtemp()
+        try:
+            setup = Setup(directory)
+            writes = setup.registry.storage.write_count
+            start = time.perf_counter()
+            run(setup, burst)
+            setup.registry.flush()
+            elapsed = time.perf_counter() - start
+            writes = setup.registry.storage.write_count - writes
+            blocked = len(setup.registry.get_blacklist())
+            print(f"{label:<9} {elapsed * 1000:>8.1f}ms {writes:>16} {setup.ui_updates:>11} {blocked:>8}")
+            setup.registry.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark - New apps dialog with a large pending queue
+
+For 500/5,000/20,000 pending apps, times one decision on an app near
+the bottom of the queue (averaged over 200 decisions) with:
+  - list: pending_apps list + list.remove per decision, one row widget
+    per app (what NewAppsDialog used to do; widgets counted, not built)
+  - queue: PendingQueue + virtualized list redraw per decision
+Also times grouping the queue by folder.
+
+Usage:
+    python -m benchmarks.bench_pending_apps
+"""
+import time
+from pending_apps import PendingQueue
+from virtual_list import VirtualListModel
+
+SIZES = (500, 5000, 20000)
+VIEWPORT_HEIGHT = 400
+ROW_HEIGHT = 60
+DECISIONS = 200
+
+
+def make_apps(size: int):
+    return [f"C:\\Program Files\\Vendor{i % 40}\\Product{i % 400}\\app{i:05}.exe" for i in range(size)]
+
+
+def with_list(apps, decided):
+    pending = list(apps)
+    widgets = len(pending)
+    start = time.perf_counter()
+    for app_path in decided:
+        pending.remove(app_path)
+    return widgets, (time.perf_counter() - start) / len(decided)
+
+
+def with_queue(apps, decided):
+    pending = PendingQueue()
+    model = VirtualListModel(ROW_HEIGHT, lambda app_path: app_path)
+    model.resize(VIEWPORT_HEIGHT)
+    pending.add_many(apps)
+    model.set_items(pending.items())
+    model.scroll_to(len(apps))  # Looking at the bottom of the queue
+    model.pending_updates()
+    start = time.perf_counter()
+    for app_path in decided:
+        pending.discard_many([app_path])
+        model.set_items(pending.items())
+        model.pending_updates()
+    return model.slot_count(), (time.perf_counter() - start) / len(decided)
+
+
+def main():
+    print(f"{'pending':>8} {'list/decision':>14} {'widgets':>8} {'queue/decision':>15} {'widgets':>8} "
+          f"{'group by folder':>16}")
+    for size in SIZES:
+        apps = make_apps(size)
+        decided = apps[-DECISIONS:][::-1]
+        list_widgets, list_time = with_list(apps, decided)
+        queue_widgets, queue_time = with_queue(apps, decided)
+        
+        pending = PendingQueue()
+        pending.add_many(apps)
+        start = time.perf_counter()
+        pending.groups('directory')
+        group_time = time.perf_counter() - start
+        
+        print(f"{size:>8} {list_time * 1e6:>12.1f}us {list_widgets:>8} {queue_time * 1e6:>13.1f}us "
+              f"{queue_widgets:>8} {group_time * 1000:>14.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
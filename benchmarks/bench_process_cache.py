@@ -0,0 +1,81 @@
+"""
+Benchmark - Per-tick process lookups with and without the process cache
+
+Starts a few child processes holding TCP connections to a local server,
+then runs NetworkMonitor._fetch_connections for several ticks and counts
+psutil name()/exe() calls and tick time.
+
+Usage:
+    python -m benchmarks.bench_process_cache
+"""
+import socket
+import subprocess
+import sys
+import time
+import psutil
+from monitor import NetworkMonitor
+from process_cache import ProcessInfoCache
+
+CHILDREN = 20
+TICKS = 10
+
+CHILD_CODE = """
+import socket, sys, time
+s = socket.create_connection(('127.0.0.1', int(sys.argv[1])))
+time.sleep(60)
+"""
+
+
+class CallCounter:
+    """Count calls to psutil.Process name()/exe()."""
+    
+    def __init__(self):
+        self.calls = 0
+        self._originals = {}
+    
+    def __enter__(self):
+        for attr in ('name', 'exe'):
+            original = getattr(psutil.Process, attr)
+            self._originals[attr] = original
+            
+            def wrapper(proc, _original=original):
+                self.calls += 1
+                return _original(proc)
+            setattr(psutil.Process, attr, wrapper)
+        return self
+    
+    def __exit__(self, *exc):
+        for attr, original in self._originals.items():
+            setattr(psutil.Process, attr, original)
+
+
+def measure(monitor: NetworkMonitor, label: str):
+    with CallCounter() as counter:
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            connections = monitor._fetch_connections()
+        elapsed = (time.perf_counter() - start) / TICKS
+    print(f"{label:<10} | {len(connections):>4} connections | "
+          f"{counter.calls / TICKS:6.1f} name/exe calls per tick | {elapsed * 1e3:7.2f} ms per tick | "
+          f"{monitor.process_cache.stats()}")
+
+
+if __name__ == "__main__":
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(CHILDREN)
+    port = server.getsockname()[1]
+    children = [subprocess.Popen([sys.executable, '-c', CHILD_CODE, str(port)]) for _ in range(CHILDREN)]
+    accepted = [server.accept()[0] for _ in range(CHILDREN)]
+    
+    try:
+        uncached = NetworkMonitor()
+        uncached.process_cache = uncached.resolver.cache = ProcessInfoCache(max_size=0)
+        measure(uncached, "no cache")
+        measure(NetworkMonitor(), "cache")
+    finally:
+        for child in children:
+            child.kill()
+        for conn in accepted:
+            conn.close()
+        server.close()
@@ -0,0 +1,56 @@
+"""
+Benchmark - Reconciliation pass: full diff vs fingerprint skip
+
+Usage:
+    python -m benchmarks.bench_reconciler
+"""
+import os
+import tempfile
+import time
+from app_registry import AppRegistry
+from firewall_manager import FirewallManager
+from reconciler import RuleReconciler
+from tests.fake_policy import FakeFwPolicy2, fake_rule_factory
+
+APPS = 500
+PASSES = 200
+
+
+def run(system_rules: int, temp_dir: str):
+    apps = []
+    for i in range(APPS):
+        app_path = os.path.join(temp_dir, f"app{i}.exe")
+        if not os.path.exists(app_path):
+            open(app_path, 'w').close()
+        apps.append(app_path)
+    
+    policy = FakeFwPolicy2(system_rules=system_rules)
+    fw = FirewallManager(fw_policy=policy, rule_factory=fake_rule_factory)
+    registry = AppRegistry(settings_file=os.path.join(temp_dir, f"settings{system_rules}.json"))
+    registry.add_many_to_blacklist(apps)
+    reconciler = RuleReconciler(fw, registry)
+    
+    start = time.perf_counter()
+    result = reconciler.reconcile()
+    initial = time.perf_counter() - start
+    assert len(result.blocked) == APPS
+    
+    start = time.perf_counter()
+    for _ in range(PASSES):
+        reconciler.reconcile(force=True)
+    full = (time.perf_counter() - start) / PASSES
+    
+    start = time.perf_counter()
+    for _ in range(PASSES):
+        assert reconciler.reconcile().skipped
+    skipped = (time.perf_counter() - start) / PASSES
+    registry.close()
+    
+    print(f"{system_rules:>7} rules, {APPS} apps | initial sync {initial * 1e3:7.1f} ms | "
+          f"full diff {full * 1e3:6.2f} ms/pass | fingerprint skip {skipped * 1e6:5.2f} us/pass")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in (10_000, 100_000):
+            run(size, temp_dir)
@@ -0,0 +1,44 @@
+"""
+Benchmark - AppRegistry membership checks from 100 to 100k entries
+
+Usage:
+    python -m benchmarks.bench_registry_lookup
+"""
+import json
+import os
+import tempfile
+import time
+from app_registry import AppRegistry
+
+LOOKUPS = 20_000
+
+
+def make_registry(size: int, settings_file: str) -> AppRegistry:
+    paths = [f"C:\\Program Files\\Vendor{i % 50}\\app{i}.exe" for i in range(size)]
+    with open(settings_file, 'w', encoding='utf-8') as f:
+        json.dump({'whitelist': paths[::2], 'blacklist': paths[1::2]}, f)
+    return AppRegistry(settings_file=settings_file)
+
+
+def run(size: int, settings_file: str):
+    registry = make_registry(size, settings_file)
+    hits = [f"c:/program files/vendor{i % 50}/APP{i}.exe" for i in range(0, size, max(1, size // 100))]
+    misses = [f"C:\\Other\\app{i}.exe" for i in range(100)]
+    queries = (hits + misses) * (LOOKUPS // (len(hits) + len(misses)) + 1)
+    queries = queries[:LOOKUPS]
+    
+    start = time.perf_counter()
+    for path in queries:
+        registry.is_known(path)
+    elapsed = (time.perf_counter() - start) / LOOKUPS
+    print(f"{size:>7} entries | is_known {elapsed * 1e6:6.2f} us/call")
+
+
+if __name__ == "__main__":
+    fd, settings_file = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        for size in (100, 1_000, 10_000, 100_000):
+            run(size, settings_file)
+    finally:
+        os.unlink(settings_file)
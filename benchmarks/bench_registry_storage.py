@@ -0,0 +1,61 @@
+"""
+Benchmark - AppRegistry storage: JSON snapshot vs append-only journal
+
+Measures startup load time and per-decision write cost at 1k/10k/100k
+entries. The JSON backend runs with save_delay=0, i.e. one full snapshot
+rewrite per decision (the cost the journal avoids).
+
+Usage:
+    python -m benchmarks.bench_registry_storage
+"""
+import os
+import shutil
+import tempfile
+import time
+from app_registry import AppRegistry
+from persistence import atomic_write_json
+from registry_storage import JsonStorage, JournalStorage
+
+DECISIONS = 50
+
+
+def seed(path: str, size: int):
+    paths = [f"C:\\Program Files\\Vendor{i % 50}\\app{i}.exe" for i in range(size)]
+    atomic_write_json(path, {'whitelist': paths[::2], 'blacklist': paths[1::2], 'settings': {}})
+
+
+def measure(make_storage, path: str, size: int):
+    seed(path, size)
+    
+    start = time.perf_counter()
+    registry = AppRegistry(settings_file=path, storage=make_storage(path))
+    load = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for i in range(DECISIONS):
+        registry.add_to_blacklist(f"C:\\New\\app{i}.exe")
+    write = (time.perf_counter() - start) / DECISIONS
+    registry.close()
+    return load, write
+
+
+def run(size: int, temp_dir: str):
+    path = os.path.join(temp_dir, 'settings.json')
+    json_load, json_write = measure(lambda p: JsonStorage(p, 0), path, size)
+    for name in os.listdir(temp_dir):
+        os.unlink(os.path.join(temp_dir, name))
+    journal_load, journal_write = measure(lambda p: JournalStorage(p), path, size)
+    for name in os.listdir(temp_dir):
+        os.unlink(os.path.join(temp_dir, name))
+    
+    print(f"{size:>7} entries | load json {json_load * 1e3:7.1f} ms, journal {journal_load * 1e3:7.1f} ms | "
+          f"per decision json {json_write * 1e3:8.2f} ms, journal {journal_write * 1e3:6.3f} ms")
+
+
+if __name__ == "__main__":
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for size in (1_000, 10_000, 100_000):
+            run(size, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir)
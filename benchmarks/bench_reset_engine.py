@@ -0,0 +1,63 @@
+"""
+Benchmark - Emergency reset: count + scan + remove vs single-pass engine
+
+Usage:
+    python -m benchmarks.bench_reset_engine
+"""
+import os
+import tempfile
+import time
+from config import RULE_PREFIX
+from reset_engine import ResetEngine
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
+
+SYSTEM_RULES = 50_000
+
+
+def make_policy(app_rules: int):
+    policy = FakeFwPolicy2(system_rules=SYSTEM_RULES)
+    for i in range(app_rules):
+        policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} app{i}.exe #{i:016x}", f"C:\\Apps\\app{i}.exe"))
+    return policy
+
+
+def old_reset(policy):
+    """Previous GUI flow: count pass for the dialog, then scan and remove one by one."""
+    count = sum(1 for rule in policy.Rules if rule.Name.startswith(RULE_PREFIX))
+    names = [rule.Name for rule in policy.Rules if rule.Name.startswith(RULE_PREFIX)]
+    for name in names:
+        policy.Rules.Remove(name)
+    return count
+
+
+def run(app_rules: int, temp_dir: str):
+    policy = make_policy(app_rules)
+    start = time.perf_counter()
+    old_reset(policy)
+    old = time.perf_counter() - start
+    old_scans = policy.Rules.enumerations
+    
+    policy = make_policy(app_rules)
+    engine = ResetEngine(policy, rule_factory=fake_rule_factory)
+    backup_file = os.path.join(temp_dir, f"rules_{app_rules}.json")
+    start = time.perf_counter()
+    rows = engine.collect()
+    result = engine.reset(backup_file, rows=rows)
+    new = time.perf_counter() - start
+    assert result.count == app_rules and policy.Rules.Count == SYSTEM_RULES
+    
+    start = time.perf_counter()
+    restored = engine.restore(backup_file)
+    restore = time.perf_counter() - start
+    assert restored.count == app_rules
+    
+    phases = ", ".join(f"{phase} {seconds * 1e3:.1f}" for phase, seconds in result.timings.items())
+    print(f"{app_rules:>6} app rules | old {old * 1e3:7.1f} ms ({old_scans} scans) | "
+          f"engine {new * 1e3:7.1f} ms ({policy.Rules.enumerations - 1} scan; {phases}) | "
+          f"backup {os.path.getsize(backup_file) / 1024:6.1f} KiB | restore {restore * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in (100, 1_000, 10_000):
+            run(size, temp_dir)
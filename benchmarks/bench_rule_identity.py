@@ -0,0 +1,70 @@
+"""
+Benchmark - Resolving an app's block rule: scan by path vs path-hash name
+
+Usage:
+    python -m benchmarks.bench_rule_identity
+"""
+import os
+import tempfile
+import time
+from config import RULE_PREFIX
+from firewall_manager import FirewallManager
+from paths import normalize_path
+from rule_index import rule_name_for_path
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
+
+APP_RULES = 200
+LOOKUPS = 200
+
+
+def scan_for_path(policy, app_path):
+    """Without a path-derived name: compare every rule's application path."""
+    key = normalize_path(app_path)
+    for rule in policy.Rules:
+        if rule.Name.startswith(RULE_PREFIX) and normalize_path(rule.ApplicationName) == key:
+            return rule
+    return None
+
+
+def item_for_path(policy, app_path):
+    """Path-hash name: one keyed Rules.Item() call."""
+    try:
+        return policy.Rules.Item(rule_name_for_path(app_path))
+    except Exception:
+        return None
+
+
+def timed(func, targets):
+    start = time.perf_counter()
+    for target in targets:
+        func(target)
+    return (time.perf_counter() - start) / len(targets)
+
+
+def run(system_rules: int, temp_dir: str):
+    # Same basename in every folder - collided under basename naming
+    paths = [os.path.join(temp_dir, f"app{i}", "updater.exe") for i in range(APP_RULES)]
+    targets = [paths[i % APP_RULES] for i in range(LOOKUPS)]
+    
+    policy = FakeFwPolicy2(system_rules=system_rules)
+    for i, app_path in enumerate(paths):
+        policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} updater{i}.exe", app_path))  # Legacy names
+    
+    start = time.perf_counter()
+    fw = FirewallManager(fw_policy=policy, rule_factory=fake_rule_factory)
+    startup = time.perf_counter() - start
+    
+    scan = timed(lambda p: scan_for_path(policy, p), targets)
+    item = timed(lambda p: item_for_path(policy, p), targets)
+    indexed = timed(fw.is_blocked, targets)
+    assert all(fw.is_blocked(p) for p in paths)
+    
+    print(f"{system_rules:>7} rules | startup + migrate {APP_RULES} {startup * 1e3:7.1f} ms | "
+          f"scan {scan * 1e6:9.1f} us | Rules.Item {item * 1e6:5.2f} us | "
+          f"is_blocked {indexed * 1e6:5.2f} us")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in (10_000, 100_000):
+            run(size, temp_dir)
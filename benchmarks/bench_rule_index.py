@@ -0,0 +1,62 @@
+"""
+Benchmark - Rule lookup via linear COM-style scan vs RuleIndex
+
+Usage:
+    python -m benchmarks.bench_rule_index
+"""
+import time
+from config import RULE_PREFIX
+from rule_index import RuleIndex
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule
+
+APP_RULES = 200
+LOOKUPS = 200
+
+
+class Record:
+    def __init__(self, name, app_path):
+        self.name = name
+        self.app_path = app_path
+
+
+def linear_find(policy, rule_name):
+    """Previous FirewallManager._find_rule behaviour."""
+    for rule in policy.Rules:
+        if rule.Name == rule_name:
+            return rule
+    return None
+
+
+def run(system_rules: int):
+    policy = FakeFwPolicy2(system_rules=system_rules)
+    names = []
+    for i in range(APP_RULES):
+        name = f"{RULE_PREFIX} app{i}.exe"
+        policy.Rules.Add(FakeFwRule(name, f"C:\\Apps\\app{i}.exe"))
+        names.append(name)
+    targets = [names[i % APP_RULES] for i in range(LOOKUPS)]
+    
+    start = time.perf_counter()
+    for name in targets:
+        linear_find(policy, name)
+    linear = (time.perf_counter() - start) / LOOKUPS
+    
+    index = RuleIndex(max_age=0)
+    start = time.perf_counter()
+    index.rebuild(policy.Rules, lambda r: Record(r.Name, r.ApplicationName))
+    build = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for name in targets:
+        if index.is_stale(policy.Rules.Count):
+            index.rebuild(policy.Rules, lambda r: Record(r.Name, r.ApplicationName))
+        index.get(name)
+    indexed = (time.perf_counter() - start) / LOOKUPS
+    
+    print(f"{system_rules:>7} rules | linear {linear * 1e6:10.1f} us/lookup | "
+          f"index build {build * 1e3:8.1f} ms | indexed {indexed * 1e6:6.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    for size in (10_000, 100_000):
+        run(size)
@@ -0,0 +1,83 @@
+"""
+Benchmark - Search box query time over 100k rows
+
+Indexes 100,000 synthetic connections (500 processes, 20,000 remote
+hosts) and 100,000 allowed/blocked app paths, then times each query as:
+  - scan: lowercase and test every row's fields (search without an index)
+  - index: SearchIndex.search()
+Selective queries (what people type to find one app or host) are the
+target; broad one/two-character queries cost time in proportion to the
+rows they match.
+
+Usage:
+    python -m benchmarks.bench_search_index
+"""
+import time
+from search_index import SearchIndex
+
+ROWS = 100000
+PROCESSES = 500
+REMOTE_HOSTS = 20000
+REPEAT = 5
+
+CONNECTION_QUERIES = ("app123", "vendor7\\app", "52.113", "8443", "app44 443", "zzz", "ap", "1")
+APP_QUERIES = ("app004217", "product42", "vendor3\\product", "setup", "zzz", "ap", ".exe")
+
+
+def connection_rows():
+    """(key, fields) as the GUI indexes connections."""
+    rows = []
+    for i in range(ROWS):
+        pid = 1000 + i % PROCESSES
+        host = i % REMOTE_HOSTS
+        rows.append(((pid, 'TCP', '10.0.0.2', 1024 + i % 60000, f"52.{host % 200}.{host // 200}.{i % 7}", 443),
+                     (f"app{pid % 300}.exe", f"C:\\Program Files\\Vendor{pid % 40}\\app{pid % 300}.exe",
+                      f"52.{host % 200}.{host // 200}.{i % 7}", (443, 80, 8443, 53)[i % 4])))
+    return rows
+
+
+def app_rows():
+    """(key, fields) as the list tabs index app paths."""
+    paths = [f"C:\\Program Files\\Vendor{i % 97}\\Product{i % 1000}\\app{i:06}.exe" for i in range(ROWS)]
+    return [(path, (path,)) for path in paths]
+
+
+def scan(rows, query: str) -> set:
+    """Filter without an index: every row, every keystroke."""
+    terms = query.lower().split()
+    return {key for key, fields in rows
+            if all(any(term in str(field).lower() for field in fields) for term in terms)}
+
+
+def timed(function, *args):
+    """(result, average ms)."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = function(*args)
+    return result, (time.perf_counter() - start) / REPEAT * 1000
+
+
+def run(label: str, rows, queries):
+    index = SearchIndex()
+    start = time.perf_counter()
+    for key, fields in rows:
+        index.add(key, *fields)
+    build = time.perf_counter() - start
+    
+    print(f"{label}: {len(rows)} rows, index built in {build * 1000:.0f}ms "
+          f"({build / len(rows) * 1e6:.1f}us per add)")
+    print(f"  {'query':<18} {'matches':>8} {'scan':>10} {'index':>10}")
+    for query in queries:
+        expected, scan_ms = timed(scan, rows, query)
+        found, index_ms = timed(index.search, query)
+        assert found == expected, query
+        print(f"  {query:<18} {len(found):>8} {scan_ms:>8.2f}ms {index_ms:>8.2f}ms")
+
+
+def main():
+    run("connections", connection_rows(), CONNECTION_QUERIES)
+    run("apps", app_rows(), APP_QUERIES)
+
+
+if __name__ == '__main__':
+    main()
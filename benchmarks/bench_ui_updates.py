@@ -0,0 +1,80 @@
+"""
+Benchmark - Catching up after the Tk main loop stalls
+
+The monitor ticks every 0.5 s and 200 new apps are detected while the
+main loop is blocked for 5 s (modal dialog). Afterwards the UI catches up:
+  - per-event: one root.after per tick and per app, replayed in order
+    (what the GUI used to do)
+  - channel: UiUpdateChannel, latest snapshot only and new apps in
+    batches, drained every UI_UPDATE_INTERVAL within UI_UPDATE_BUDGET
+Redraws cost 8 ms and adding a dialog row 1 ms (simulated with sleep).
+Reports redraws done, the longest main-loop block, and time until all
+apps are shown.
+
+Usage:
+    python -m benchmarks.bench_ui_updates
+"""
+import time
+from config import UI_UPDATE_INTERVAL
+from ui_updates import UiUpdateChannel
+
+STALL = 5.0
+TICK = 0.5
+NEW_APPS = 200
+REDRAW_TIME = 0.008
+ROW_TIME = 0.001
+
+
+def redraw(*args):
+    time.sleep(REDRAW_TIME)
+
+
+def add_rows(app_paths):
+    time.sleep(ROW_TIME * len(app_paths))
+
+
+def per_event():
+    """Replay every queued callback back to back (one Tk after-queue run)."""
+    queue = [redraw] * int(STALL / TICK) + [lambda: add_rows([None])] * NEW_APPS
+    start = time.perf_counter()
+    for callback in queue:
+        callback()
+    elapsed = time.perf_counter() - start
+    return int(STALL / TICK), elapsed, elapsed
+
+
+def channel():
+    """Drain on the fixed cadence until nothing is pending."""
+    updates = UiUpdateChannel()
+    for tick in range(int(STALL / TICK)):
+        updates.set_latest('connections', tick)
+    for app in range(NEW_APPS):
+        updates.add('new_apps', f"C:\\Apps\\app{app}.exe")
+    
+    redraws = 0
+    longest = 0.0
+    
+    def count_redraw(snapshot):
+        nonlocal redraws
+        redraws += 1
+        redraw()
+    
+    start = time.perf_counter()
+    while updates.pending():
+        frame = time.perf_counter()
+        updates.dispatch({'connections': count_redraw, 'new_apps': add_rows})
+        longest = max(longest, time.perf_counter() - frame)
+        if updates.pending():
+            time.sleep(UI_UPDATE_INTERVAL / 1000)  # Main loop handles input in between
+    return redraws, longest, time.perf_counter() - start
+
+
+def main():
+    print(f"{'mode':<10} {'redraws':>8} {'longest block':>14} {'all shown after':>16}")
+    for label, run in (("per-event", per_event), ("channel", channel)):
+        redraws, longest, total = run()
+        print(f"{label:<10} {redraws:>8} {longest * 1000:>12.0f}ms {total * 1000:>14.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark - Cost of one connections-list frame while scrolling
+
+Measures VirtualListModel work per frame (scroll one row, find slots to
+redraw) for growing lists. Widget count is slot_count() regardless of
+list size; the old list rebuilt one frame + 4 widgets per connection.
+
+Usage:
+    python -m benchmarks.bench_virtual_list
+"""
+import time
+from monitor import Connection
+from virtual_list import VirtualListModel
+
+SIZES = (100, 10000, 100000)
+FRAMES = 1000
+VIEWPORT_HEIGHT = 800
+ROW_HEIGHT = 56
+
+
+def make_connections(count: int):
+    return [Connection(f"app{i % 50}.exe", f"C:\\Apps\\app{i % 50}.exe", 1000 + i % 500,
+                       '10.0.0.2', 1024 + i % 60000, f"93.184.{i // 256 % 256}.{i % 256}", 443,
+                       'ESTABLISHED', 'TCP')
+            for i in range(count)]
+
+
+def main():
+    blocked = {"C:\\Apps\\app7.exe"}
+    print(f"{'connections':>12} {'widgets':>8} {'per frame':>10} {'redrawn/frame':>14}")
+    for size in SIZES:
+        model = VirtualListModel(ROW_HEIGHT, lambda c: (c.process_name, c.process_path, c.remote_addr,
+                                                        c.remote_port, c.process_path in blocked))
+        model.resize(VIEWPORT_HEIGHT)
+        model.set_items(make_connections(size))
+        model.pending_updates()
+        
+        redrawn = 0
+        start = time.perf_counter()
+        for frame in range(FRAMES):
+            model.scroll_by(1 if frame % 200 < 100 else -1)
+            redrawn += len(model.pending_updates())
+        per_frame = (time.perf_counter() - start) / FRAMES
+        print(f"{size:>12} {model.slot_count():>8} {per_frame * 1e6:>8.1f}us {redrawn / FRAMES:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
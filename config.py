@@ -4,6 +4,7 @@
 APP_NAME = "WinNetGuard"
 APP_VERSION = "1.0.0"
 RULE_PREFIX = "[WinNetGuard]"
+LEGACY_RULE_PREFIXES = ("[SimpleWallAlternative]",)  # Rules from earlier versions, removed by reset
 
 # UI Colors (Windows 11 Dark Theme)
 COLORS = {
@@ -23,19 +24,39 @@ WINDOW_MIN_WIDTH = 800
 WINDOW_MIN_HEIGHT = 600
 WINDOW_DEFAULT_WIDTH = 1000
 WINDOW_DEFAULT_HEIGHT = 700
+UI_UPDATE_INTERVAL = 50  # ms between main-loop drains of background updates
+UI_UPDATE_BUDGET = 0.012  # seconds of queued UI work per drain (the rest waits for the next one)
+UI_BATCH_SIZE = 8  # queued items (e.g. new apps) handed to a handler per call
 
 # Default settings (can be overridden by user)
 DEFAULT_SETTINGS = {
     'ui_font_size': 12,  # Base font size for UI elements
     'process_font_size': 12,  # Font size for process names in connections
     'connection_update_interval': 2.0,  # seconds
-    'max_connections_display': 30,  # Max connections to show
+    'max_connections_display': 30,  # Unused since the connections list is virtualized; kept for old settings files
     'enable_notifications': True,  # Show new app notifications
 }
 
 # Monitoring settings
 CONNECTION_UPDATE_INTERVAL = 2000  # ms (increased to reduce flickering)
+MONITOR_MIN_INTERVAL = 0.5  # seconds, fastest scan rate during connection bursts
+MONITOR_MAX_INTERVAL = 6.0  # seconds, slowest scan rate while connections are stable
+MONITOR_HIDDEN_MAX_INTERVAL = 15.0  # seconds, slowest scan rate while hidden to tray
+MONITOR_CHURN_THRESHOLD = 5  # opened+closed connections per scan that count as a burst
+MONITOR_BACKOFF_FACTOR = 1.5  # interval growth per quiet scan
+EVENT_SETTLE_DELAY = 0.05  # seconds between a process start event and the triggered scan
+COLUMNAR_SNAPSHOT_THRESHOLD = 5000  # snapshots this large are stored as array-backed tables
+CONNECTION_QUEUE_SIZE = 8  # pending updates per subscriber before they are coalesced
+PROCESS_CACHE_SIZE = 4096  # Max processes kept in the monitor's metadata cache
+PROCESS_CACHE_TTL = 300  # seconds before process name/path is re-read
+PROCESS_CACHE_NEGATIVE_TTL = 30  # seconds to remember processes we can't inspect
+PROCESS_RESOLVE_WORKERS = 8  # threads reading process name/path
+PROCESS_RESOLVE_QUEUE = 256  # max lookups waiting for a worker (more are retried next scan)
+PROCESS_RESOLVE_BUDGET = 0.05  # seconds a scan waits for new lookups before moving on
+PROCESS_RESOLVE_TIMEOUT = 2.0  # seconds before a stuck lookup is reported as Unknown
+PROCESS_RESOLVE_MAX_THREADS = 32  # hard cap on worker threads, including ones abandoned on stuck lookups
 SEARCH_DEBOUNCE_DELAY = 300  # ms
+LIST_PAGE_SIZE = 200  # apps fetched per query by list tabs on registries that aren't in memory (SQLite)
 
 # Notification settings
 ENABLE_CONNECTION_NOTIFICATIONS = True
@@ -43,6 +64,20 @@ NOTIFICATION_SOUND = False
 
 # Persistence
 SETTINGS_FILE = "firewall_settings.json"
+SETTINGS_SAVE_DELAY = 0.5  # seconds, registry changes within this window share one write
+REGISTRY_BACKEND = "json"  # "json" (snapshot file), "journal" (append-only log + snapshot) or "sqlite"
+REGISTRY_DB_FILE = "firewall_registry.db"  # Used by the "sqlite" backend
+JOURNAL_SUFFIX = ".log"  # Journal file = SETTINGS_FILE + suffix
+JOURNAL_COMPACT_EVERY = 1000  # Journal events between snapshot compactions
+
+# Firewall rule index
+RULE_INDEX_MAX_AGE = 60  # seconds before a full re-enumeration of rules
+RECONCILE_INTERVAL = 30000  # ms between checks that block rules match the blacklist
+FIREWALL_QUEUE_SIZE = 1024  # pending firewall commands before submitters wait or are refused
+
+# Emergency reset
+RESET_BATCH_SIZE = 500  # rules removed/restored between progress updates
+RESET_BACKUP_DIR = "backups"  # rule backups written before each reset (see emergency_reset.py restore)
 
 # Animation timings
 FADE_IN_DURATION = 200  # ms
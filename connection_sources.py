@@ -0,0 +1,184 @@
+"""
+Connection Sources - Where NetworkMonitor gets sockets from and when it rescans
+"""
+import psutil
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Callable, List
+from config import EVENT_SETTLE_DELAY
+from proc_net import ProcNetReader
+
+# Linux proc connector (process exec notifications over netlink)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_EXEC = 0x00000002
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct('=IHHII')      # len, type, flags, seq, pid
+CN_MSG_HEADER = struct.Struct('=IIIIHH')    # idx, val, seq, ack, len, flags
+PROC_EVENT_OFFSET = NLMSG_HEADER.size + CN_MSG_HEADER.size
+
+class PollingConnectionSource:
+    """
+    Fixed-interval polling via psutil (works on every platform).
+    
+    fetch() returns psutil-style connection records (pid, type, laddr,
+    raddr, status) from reader (default psutil.net_connections); wait()
+    blocks until the next scan is due.
+    """
+    
+    event_driven = False
+    
+    def __init__(self, reader: Callable[[], List] = None):
+        self.reader = reader
+        self._wakeup = threading.Event()
+        self.wakeups = 0  # Scans triggered early by events
+    
+    def start(self):
+        """Start event listener (polling: just drop a stop() left over from a previous run)."""
+        self._wakeup.clear()
+    
+    def stop(self):
+        """Stop event listener and release a waiting monitor."""
+        self._wakeup.set()
+    
+    def fetch(self) -> List:
+        """Get current inet sockets."""
+        if self.reader:
+            return self.reader()
+        return psutil.net_connections(kind='inet')
+    
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait until the next scan.
+        
+        Returns:
+            True if woken early (event or wake()), False on timeout
+        """
+        woken = self._wakeup.wait(timeout)
+        if woken:
+            self._wakeup.clear()
+        return woken
+    
+    def wake(self):
+        """Trigger an immediate scan."""
+        self._wakeup.set()
+
+class ProcConnectorSource(PollingConnectionSource):
+    """
+    Polling source that also rescans as soon as a process is exec'd.
+    
+    Listens to the Linux proc connector (netlink, needs CAP_NET_ADMIN). A
+    newly started program usually connects within milliseconds, so each
+    exec triggers a scan after EVENT_SETTLE_DELAY; polling still runs as
+    the fallback for long-lived processes opening new sockets.
+    """
+    
+    event_driven = True
+    
+    def __init__(self, reader: Callable[[], List] = None, settle_delay: float = EVENT_SETTLE_DELAY):
+        super().__init__(reader)
+        self.settle_delay = settle_delay
+        self.exec_events = 0
+        self._sock = None
+        self._thread = None
+        self._running = False
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the proc connector can be used on this system."""
+        return sys.platform.startswith('linux') and hasattr(socket, 'AF_NETLINK')
+    
+    def start(self):
+        """Subscribe to process events and start listener thread."""
+        if self._running:
+            return
+        super().start()
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self._sock.bind((0, CN_IDX_PROC))
+            self._send_control(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self._sock.close()
+            self._sock = None
+            raise
+        self._sock.settimeout(0.5)
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Unsubscribe and stop listener thread."""
+        self._running = False
+        super().stop()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._sock:
+            try:
+                self._send_control(PROC_CN_MCAST_IGNORE)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait for the poll interval or an exec event (plus settle delay)."""
+        woken = self._wakeup.wait(timeout)
+        if woken and self._running:
+            # Let the new process open its sockets; fold bursts of execs into one scan
+            time.sleep(self.settle_delay)
+        if woken:
+            self._wakeup.clear()
+        return woken
+    
+    def _send_control(self, op: int):
+        """Send listen/ignore request to the proc connector."""
+        payload = struct.pack('=I', op)
+        cn_msg = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(cn_msg), NLMSG_DONE, 0, 0, 0)
+        self._sock.send(header + cn_msg)
+    
+    def _listen(self):
+        """Listener loop: wake the monitor on every exec event."""
+        while self._running:
+            try:
+                data = self._sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if len(data) < PROC_EVENT_OFFSET + 4:
+                continue
+            what, = struct.unpack_from('=I', data, PROC_EVENT_OFFSET)
+            if what == PROC_EVENT_EXEC:
+                self.exec_events += 1
+                if not self._wakeup.is_set():
+                    self.wakeups += 1
+                    self._wakeup.set()
+
+def create_connection_source(event_driven: bool = True, fast_reader: bool = True) -> PollingConnectionSource:
+    """
+    Create the best available connection source.
+    
+    Uses the /proc/net reader where available, and falls back to plain
+    polling if event sources aren't supported or can't be opened (e.g.
+    missing privileges).
+    """
+    reader = None
+    if fast_reader and ProcNetReader.is_supported():
+        reader = ProcNetReader()
+    
+    if event_driven and ProcConnectorSource.is_supported():
+        source = ProcConnectorSource(reader)
+        try:
+            source.start()
+            return source
+        except OSError as e:
+            print(f"Event-driven connection source unavailable, polling instead: {e}")
+    return PollingConnectionSource(reader)
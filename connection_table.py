@@ -0,0 +1,141 @@
+"""
+Connection Table - Columnar, array-backed storage for large connection snapshots
+"""
+from array import array
+from typing import Dict, Iterator, List
+
+FIELDS = ('process_name', 'process_path', 'pid', 'local_addr', 'local_port',
+          'remote_addr', 'remote_port', 'status', 'protocol')
+
+class StringPool:
+    """Store each distinct string once; rows hold its index."""
+    
+    __slots__ = ('strings', '_index')
+    
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+    
+    def add(self, value: str) -> int:
+        """Get index of value, adding it if new."""
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._index[value] = index
+            self.strings.append(value)
+        return index
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+
+class ConnectionView:
+    """
+    Attribute-style view of one table row (same fields as monitor.Connection).
+    
+    Views are created on access and hold no data of their own.
+    """
+    
+    __slots__ = ('_table', '_row')
+    
+    def __init__(self, table: 'ConnectionTable', row: int):
+        self._table = table
+        self._row = row
+    
+    process_name = property(lambda self: self._table._names.strings[self._table._name_ids[self._row]])
+    process_path = property(lambda self: self._table._paths.strings[self._table._path_ids[self._row]])
+    pid = property(lambda self: self._table._pids[self._row])
+    local_addr = property(lambda self: self._table._addrs.strings[self._table._local_addr_ids[self._row]])
+    local_port = property(lambda self: self._table._local_ports[self._row])
+    remote_addr = property(lambda self: self._table._addrs.strings[self._table._remote_addr_ids[self._row]])
+    remote_port = property(lambda self: self._table._remote_ports[self._row])
+    status = property(lambda self: self._table._labels.strings[self._table._status_ids[self._row]])
+    protocol = property(lambda self: self._table._labels.strings[self._table._protocol_ids[self._row]])
+    
+    def astuple(self) -> tuple:
+        """Get field values in Connection field order."""
+        return tuple(getattr(self, name) for name in FIELDS)
+    
+    def __eq__(self, other) -> bool:
+        try:
+            return self.astuple() == tuple(getattr(other, name) for name in FIELDS)
+        except AttributeError:
+            return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+    
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in FIELDS)
+        return f"ConnectionView({values})"
+
+class ConnectionTable:
+    """
+    Connection snapshot stored as parallel arrays.
+    
+    Numbers live in typed arrays; strings (process names/paths, addresses,
+    status/protocol) are pooled so every distinct value is stored once.
+    Behaves like a read-only list of Connection-like objects.
+    """
+    
+    def __init__(self):
+        self._names = StringPool()
+        self._paths = StringPool()
+        self._addrs = StringPool()
+        self._labels = StringPool()  # status and protocol
+        self._name_ids = array('I')
+        self._path_ids = array('I')
+        self._pids = array('I')
+        self._local_addr_ids = array('I')
+        self._local_ports = array('H')
+        self._remote_addr_ids = array('I')
+        self._remote_ports = array('H')
+        self._status_ids = array('B')
+        self._protocol_ids = array('B')
+    
+    @classmethod
+    def from_connections(cls, connections) -> 'ConnectionTable':
+        """Build a table from Connection-like objects."""
+        table = cls()
+        for conn in connections:
+            table.append(conn.process_name, conn.process_path, conn.pid, conn.local_addr, conn.local_port,
+                         conn.remote_addr, conn.remote_port, conn.status, conn.protocol)
+        return table
+    
+    def append(self, process_name: str, process_path: str, pid: int, local_addr: str, local_port: int,
+               remote_addr: str, remote_port: int, status: str, protocol: str):
+        """Add a row (arguments in Connection field order)."""
+        self._name_ids.append(self._names.add(process_name))
+        self._path_ids.append(self._paths.add(process_path))
+        self._pids.append(pid)
+        self._local_addr_ids.append(self._addrs.add(local_addr))
+        self._local_ports.append(local_port)
+        self._remote_addr_ids.append(self._addrs.add(remote_addr))
+        self._remote_ports.append(remote_port)
+        self._status_ids.append(self._labels.add(status))
+        self._protocol_ids.append(self._labels.add(protocol))
+    
+    def __len__(self) -> int:
+        return len(self._pids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ConnectionView(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("connection index out of range")
+        return ConnectionView(self, index)
+    
+    def __iter__(self) -> Iterator[ConnectionView]:
+        for row in range(len(self)):
+            yield ConnectionView(self, row)
+    
+    def copy(self) -> List[ConnectionView]:
+        """List of row views (mirrors list.copy() on plain snapshots)."""
+        return list(self)
+    
+    def nbytes(self) -> int:
+        """Approximate size of the column arrays in bytes (pooled strings excluded)."""
+        columns = (self._name_ids, self._path_ids, self._pids, self._local_addr_ids, self._local_ports,
+                   self._remote_addr_ids, self._remote_ports, self._status_ids, self._protocol_ids)
+        return sum(column.itemsize * len(column) for column in columns)
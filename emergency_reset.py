@@ -1,17 +1,18 @@
 """
-Emergency Reset Script - Remove all firewall rules created by SimpleWall Alternative
+Emergency Reset Script - Remove all firewall rules created by WinNetGuard
 Run this script if the main application has issues or you need to quickly reset all rules.
+A backup is written first, so the rules can be brought back with the restore command.
 
 Usage:
-    python emergency_reset.py
-    
+    python emergency_reset.py                        Back up and remove all app rules
+    python emergency_reset.py restore [backup_file]  Re-create rules from a backup (latest if omitted)
+
 Requires administrator privileges.
 """
 import sys
-import win32com.client
-
-RULE_PREFIX = "[SimpleWallAlternative]"
-STRICT_MODE_RULE = "[SimpleWallAlternative] STRICT MODE - Block All Outbound"
+from config import RULE_PREFIX, LEGACY_RULE_PREFIXES, RESET_BACKUP_DIR
+from app_registry import open_registry
+from reset_engine import ResetEngine, latest_backup
 
 def is_admin():
     """Check if running with administrator privileges."""
@@ -21,94 +22,92 @@ def is_admin():
     except:
         return False
 
+def print_progress(done: int, total: int):
+    """Print a one-line progress indicator."""
+    print(f"\r  {done}/{total} rules", end="" if done < total else "\n", flush=True)
+
+def print_result(result, action: str):
+    """Print counts, timings and errors of a reset/restore."""
+    print("\n" + "=" * 60)
+    print(f"✅ Successfully {action} {result.count} rules")
+    timings = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in result.timings.items())
+    if timings:
+        print(f"   ({timings})")
+    if result.errors:
+        print(f"\n❌ {len(result.errors)} errors")
+        print("\nErrors:")
+        for error in result.errors:
+            print(f"  - {error}")
+    print("=" * 60)
+
+def exit_with(code: int):
+    """Wait for Enter (window opened by the .bat file), then exit."""
+    input("\nPress Enter to exit...")
+    sys.exit(code)
+
 def remove_all_rules():
-    """Remove all firewall rules created by this application."""
-    if not is_admin():
-        print("ERROR: This script requires administrator privileges!")
-        print("Please run as administrator.")
-        input("\nPress Enter to exit...")
-        sys.exit(1)
-    
+    """Back up and remove all firewall rules created by this application."""
     print("=" * 60)
-    print("SimpleWall Alternative - Emergency Reset")
+    print("WinNetGuard - Emergency Reset")
     print("=" * 60)
     print()
-    print("This will remove ALL firewall rules created by the application,")
-    print("including STRICT MODE if enabled.")
-    print(f"Looking for rules with prefix: {RULE_PREFIX}")
+    print("This will remove ALL firewall rules created by the application")
+    print("and clear the whitelist and blacklist (both are backed up first).")
+    print(f"Looking for rules with prefix: {', '.join((RULE_PREFIX,) + LEGACY_RULE_PREFIXES)}")
     print()
     
-    response = input("Continue? (yes/no): ").strip().lower()
-    if response != "yes":
-        print("Cancelled.")
-        input("\nPress Enter to exit...")
-        sys.exit(0)
-    
-    print("\nConnecting to Windows Firewall...")
-    
+    print("Connecting to Windows Firewall...")
+    registry = open_registry()
     try:
-        # Connect to Windows Firewall
-        fw_policy = win32com.client.Dispatch("HNetCfg.FwPolicy2")
-        rules = fw_policy.Rules
-        
-        # Find all rules with our prefix
-        rules_to_remove = []
-        strict_mode_found = False
-        
-        for rule in rules:
-            if rule.Name.startswith(RULE_PREFIX):
-                rules_to_remove.append(rule.Name)
-                if rule.Name == STRICT_MODE_RULE:
-                    strict_mode_found = True
-        
-        if not rules_to_remove:
-            print("\n✅ No rules found. Nothing to remove.")
-            input("\nPress Enter to exit...")
-            sys.exit(0)
-        
-        print(f"\nFound {len(rules_to_remove)} rules to remove:")
-        for rule_name in rules_to_remove:
-            if rule_name == STRICT_MODE_RULE:
-                print(f"  - {rule_name} ⚠ STRICT MODE")
-            else:
-                print(f"  - {rule_name}")
-        
-        if strict_mode_found:
-            print("\n⚠ WARNING: Strict mode will be DISABLED!")
-            print("   All applications will be able to connect freely after reset.")
+        engine = ResetEngine(registry=registry)
+        rows = engine.collect()
+        count = len(rows)
+        print(f"\nFound {count} rules to remove.")
+        response = input("Continue? (yes/no): ").strip().lower()
+        if response != "yes":
+            print("Cancelled.")
+            exit_with(0)
         
         print("\nRemoving rules...")
-        removed_count = 0
-        errors = []
-        
-        for rule_name in rules_to_remove:
-            try:
-                rules.Remove(rule_name)
-                removed_count += 1
-                if rule_name == STRICT_MODE_RULE:
-                    print(f"  ✅ Removed: {rule_name} (STRICT MODE DISABLED)")
-                else:
-                    print(f"  ✅ Removed: {rule_name}")
-            except Exception as e:
-                error_msg = f"Failed to remove {rule_name}: {str(e)}"
-                errors.append(error_msg)
-                print(f"  ❌ {error_msg}")
-        
-        print("\n" + "=" * 60)
-        print(f"✅ Successfully removed {removed_count} rules")
-        
-        if strict_mode_found:
-            print("\n⚠ Strict mode has been DISABLED")
-            print("   All applications can now connect to the network.")
-        
-        if errors:
-            print(f"\n❌ Failed to remove {len(errors)} rules")
-            print("\nErrors:")
-            for error in errors:
-                print(f"  - {error}")
-        
-        print("=" * 60)
-        
+        result = engine.reset(progress=print_progress, rows=rows)
+    finally:
+        registry.close()
+    if result.backup_file:
+        print(f"\nBackup written to {result.backup_file}")
+        print("Undo with: python emergency_reset.py restore")
+    print_result(result, "removed")
+
+def restore_rules(backup_file: str = None):
+    """Re-create rules from a backup written by a reset."""
+    print("=" * 60)
+    print("WinNetGuard - Restore Rules")
+    print("=" * 60)
+    
+    backup_file = backup_file or latest_backup()
+    if not backup_file:
+        print(f"\n❌ No backup found in {RESET_BACKUP_DIR}")
+        exit_with(1)
+    
+    print(f"\nRestoring rules from {backup_file}...")
+    registry = open_registry()
+    try:
+        result = ResetEngine(registry=registry).restore(backup_file, progress=print_progress)
+    finally:
+        registry.close()
+    print_result(result, "restored")
+
+def main(args):
+    """Run reset (default) or restore."""
+    if not is_admin():
+        print("ERROR: This script requires administrator privileges!")
+        print("Please run as administrator.")
+        exit_with(1)
+    
+    try:
+        if args and args[0] == "restore":
+            restore_rules(args[1] if len(args) > 1 else None)
+        else:
+            remove_all_rules()
     except Exception as e:
         print(f"\n❌ ERROR: {str(e)}")
         print("\nMake sure:")
@@ -116,7 +115,7 @@ def remove_all_rules():
         print("  2. Windows Firewall service is running")
         print("  3. pywin32 is installed (pip install pywin32)")
     
-    input("\nPress Enter to exit...")
+    exit_with(0)
 
 if __name__ == "__main__":
-    remove_all_rules()
+    main(sys.argv[1:])
@@ -0,0 +1,6 @@
+@echo off
+REM Emergency Restore - Double-click to re-create the rules removed by the last emergency reset
+REM Automatically requests administrator privileges
+
+echo Requesting administrator privileges...
+powershell -Command "Start-Process python -ArgumentList 'emergency_reset.py restore' -Verb RunAs -WorkingDirectory '%CD%'"
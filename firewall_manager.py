@@ -2,11 +2,11 @@
 Firewall Manager - Core logic for managing Windows Firewall rules via COM API
 """
 import os
-import win32com.client
-import pythoncom
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from config import RULE_PREFIX
 from safety import is_safe_to_block
+from rule_index import RuleIndex, rule_name_for_path
+from paths import normalize_path
 
 class FirewallRule:
     """Represents a firewall rule."""
@@ -17,15 +17,38 @@ class FirewallRule:
         self.direction = direction
 
 class FirewallManager:
-    """Manages Windows Firewall rules using COM API."""
+    """
+    Manages Windows Firewall rules using COM API.
     
-    def __init__(self):
-        self.fw_policy = None
-        self._initialize()
+    Not thread-safe: use it only on the thread that created it (the app
+    runs it on a FirewallWorker, which owns that thread).
+    """
+    
+    def __init__(self, fw_policy=None, rule_factory: Callable = None):
+        """
+        Args:
+            fw_policy: Policy object to use instead of HNetCfg.FwPolicy2
+                (e.g. a fake stand-in for tests and benchmarks)
+            rule_factory: Callable creating new rule objects for fw_policy
+        """
+        self.fw_policy = fw_policy
+        self.rule_factory = rule_factory
+        self.rule_index = RuleIndex()
+        if self.fw_policy is None:
+            self._initialize()
+        
+        # Single enumeration at startup, kept current by add/remove
+        try:
+            self.refresh_rules()
+        except Exception as e:
+            print(f"Error loading rules: {e}")
     
     def _initialize(self):
         """Initialize COM connection to Windows Firewall."""
         try:
+            # pywin32 is only needed for the real policy (injected fakes run without it)
+            import pythoncom
+            import win32com.client
             # Initialize COM for this thread
             pythoncom.CoInitialize()
             self.fw_policy = win32com.client.Dispatch("HNetCfg.FwPolicy2")
@@ -78,13 +101,202 @@ class FirewallManager:
         Returns:
             (success, message)
         """
-        # Ensure COM is initialized for this thread
+        is_valid, reason = self._validate_block_path(app_path)
+        if not is_valid:
+            return False, reason
+        
         try:
-            pythoncom.CoInitialize()
-        except:
-            pass
+            self._ensure_index()
+        except Exception as e:
+            return False, f"Failed to create rule: {str(e)}"
         
-        # Validate path
+        return self._add_block_rule(app_path)
+    
+    def remove_rule(self, app_path: str) -> tuple[bool, str]:
+        """
+        Remove blocking rule for an application.
+        
+        Args:
+            app_path: Full path to the executable
+            
+        Returns:
+            (success, message)
+        """
+        try:
+            self._ensure_index()
+        except Exception as e:
+            return False, f"Failed to remove rule: {str(e)}"
+        
+        return self._remove_block_rule(app_path)
+    
+    def apply_batch(self, block: List[str] = None, unblock: List[str] = None) -> Dict[str, tuple[bool, str]]:
+        """
+        Add and remove block rules for many applications in one pass.
+        
+        All paths are validated up front, rules are enumerated at most once
+        and every change is applied against the rule index.
+        
+        Args:
+            block: Full paths of executables to block
+            unblock: Full paths of executables to unblock
+            
+        Returns:
+            Dict mapping each path to (success, message)
+        """
+        results: Dict[str, tuple[bool, str]] = {}
+        block = list(dict.fromkeys(block or []))
+        unblock = list(dict.fromkeys(unblock or []))
+        conflicting = set(block) & set(unblock)
+        
+        # Validate everything before touching the firewall
+        to_block = []
+        for app_path in block:
+            if app_path in conflicting:
+                results[app_path] = (False, "Cannot block and unblock in the same batch")
+                continue
+            is_valid, reason = self._validate_block_path(app_path)
+            if is_valid:
+                to_block.append(app_path)
+            else:
+                results[app_path] = (False, reason)
+        to_unblock = [app_path for app_path in unblock if app_path not in conflicting]
+        
+        try:
+            self._ensure_index()
+        except Exception as e:
+            for app_path in to_unblock + to_block:
+                results[app_path] = (False, f"Failed to read rules: {str(e)}")
+            return results
+        
+        for app_path in to_unblock:
+            results[app_path] = self._remove_block_rule(app_path)
+        for app_path in to_block:
+            results[app_path] = self._add_block_rule(app_path)
+        
+        return results
+    
+    def get_active_rules(self) -> List[FirewallRule]:
+        """
+        Get all rules created by this application.
+        
+        Returns:
+            List of FirewallRule objects
+        """
+        try:
+            self._ensure_index()
+        except Exception as e:
+            print(f"Error retrieving rules: {e}")
+        
+        return self.rule_index.records()
+    
+    def is_blocked(self, app_path: str) -> bool:
+        """Check if an application is currently blocked."""
+        try:
+            self._ensure_index()
+        except Exception:
+            return False
+        return self._find_rule(app_path) is not None
+    
+    def rule_fingerprint(self) -> int:
+        """
+        Order-independent hash of the current app rule set.
+        
+        Re-enumerates first if the policy changed outside the app, so
+        external edits show up as a different fingerprint.
+        """
+        self._ensure_index()
+        return self.rule_index.fingerprint
+    
+    def refresh_rules(self) -> int:
+        """
+        Force a full re-enumeration of firewall rules into the index.
+        
+        Rules still named after the old "[WinNetGuard] <basename>" scheme
+        are migrated to path-hash names on the way.
+        
+        Returns:
+            Number of app rules found
+        """
+        self.rule_index.rebuild(self.fw_policy.Rules, self._record_from_rule)
+        self._migrate_legacy_rules()
+        return len(self.rule_index)
+    
+    def invalidate_rules(self):
+        """Drop cached rule index (e.g. after rules were changed externally)."""
+        self.rule_index.invalidate()
+    
+    def _ensure_index(self):
+        """Rebuild rule index if it was never loaded or the policy changed."""
+        try:
+            policy_count = self.fw_policy.Rules.Count
+        except Exception:
+            policy_count = None
+        if self.rule_index.is_stale(policy_count):
+            self.refresh_rules()
+    
+    def _find_rule(self, app_path: str) -> Optional[FirewallRule]:
+        """
+        Find the block rule of a path (rule index must be current).
+        
+        The index only notices outside edits that change the rule count, so
+        the answer is confirmed with a keyed Rules.Item lookup of the
+        path-hash name and the index corrected when they disagree.
+        """
+        rule_name = rule_name_for_path(app_path)
+        record = self.rule_index.get(rule_name)
+        try:
+            rule = self.fw_policy.Rules.Item(rule_name)
+        except Exception:
+            rule = None  # No such rule
+        
+        if rule is None:
+            if record is not None:
+                self.rule_index.discard(rule_name)  # Removed outside the app
+            return self.rule_index.get_by_path(app_path)  # Rule not migrated yet
+        if record is None or normalize_path(record.app_path) != normalize_path(rule.ApplicationName or ""):
+            record = self._record_from_rule(rule)  # Added or changed outside the app
+            self.rule_index.add(record)
+        return record
+    
+    def _migrate_legacy_rules(self) -> int:
+        """
+        Rename indexed rules whose name isn't derived from their path.
+        
+        A replacement rule with the same settings is added under the
+        path-hash name and the old rule removed. If a rule for the path
+        already exists under the new name, the old one is just removed.
+        
+        Returns:
+            Number of rules migrated
+        """
+        migrated = 0
+        for record in self.rule_index.records():
+            if not record.app_path:
+                continue
+            rule_name = rule_name_for_path(record.app_path)
+            if record.name == rule_name:
+                continue
+            try:
+                if rule_name not in self.rule_index:
+                    old_rule = self.fw_policy.Rules.Item(record.name)
+                    rule = self._create_rule_object()
+                    rule.Name = rule_name
+                    rule.Description = old_rule.Description
+                    rule.ApplicationName = old_rule.ApplicationName
+                    rule.Action = old_rule.Action
+                    rule.Direction = old_rule.Direction
+                    rule.Enabled = old_rule.Enabled
+                    self.fw_policy.Rules.Add(rule)
+                    self.rule_index.add(self._record_from_rule(rule))
+                self.fw_policy.Rules.Remove(record.name)
+                self.rule_index.discard(record.name)
+                migrated += 1
+            except Exception as e:
+                print(f"Error migrating rule {record.name}: {e}")
+        return migrated
+    
+    def _validate_block_path(self, app_path: str) -> tuple[bool, str]:
+        """Check that an application path can be blocked."""
         if not os.path.exists(app_path):
             return False, f"Application not found: {app_path}"
         
@@ -96,95 +308,65 @@ class FirewallManager:
         if not is_safe:
             return False, reason
         
+        return True, ""
+    
+    def _add_block_rule(self, app_path: str) -> tuple[bool, str]:
+        """Create block rule for a validated path (rule index must be current)."""
         app_name = os.path.basename(app_path)
-        rule_name = f"{RULE_PREFIX} {app_name}"
+        rule_name = rule_name_for_path(app_path)
         
         try:
             # Check if rule already exists
-            existing_rule = self._find_rule(rule_name)
-            if existing_rule:
+            if self._find_rule(app_path) is not None:
                 return False, f"Rule already exists for {app_name}"
             
             # Create outbound block rule
-            rule = win32com.client.Dispatch("HNetCfg.FwRule")
+            rule = self._create_rule_object()
             rule.Name = rule_name
-            rule.Description = f"Block {app_name} - Created by {RULE_PREFIX}"
+            rule.Description = f"Block {app_path} - Created by {RULE_PREFIX}"
             rule.ApplicationName = app_path
             rule.Action = 0  # NET_FW_ACTION_BLOCK
             rule.Direction = 2  # NET_FW_RULE_DIR_OUT (outbound)
             rule.Enabled = True
             
             self.fw_policy.Rules.Add(rule)
+            self.rule_index.add(FirewallRule(rule_name, app_path, True, "OUT"))
             
             return True, f"Successfully blocked {app_name}"
         
         except Exception as e:
             return False, f"Failed to create rule: {str(e)}"
     
-    def remove_rule(self, app_path: str) -> tuple[bool, str]:
-        """
-        Remove blocking rule for an application.
-        
-        Args:
-            app_path: Full path to the executable
-            
-        Returns:
-            (success, message)
-        """
-        # Ensure COM is initialized for this thread
-        try:
-            pythoncom.CoInitialize()
-        except:
-            pass
-        
+    def _remove_block_rule(self, app_path: str) -> tuple[bool, str]:
+        """Remove block rule for a path (rule index must be current)."""
         app_name = os.path.basename(app_path)
-        rule_name = f"{RULE_PREFIX} {app_name}"
         
         try:
-            existing_rule = self._find_rule(rule_name)
-            if not existing_rule:
+            record = self._find_rule(app_path)
+            if record is None:
                 return False, f"No rule found for {app_name}"
             
-            self.fw_policy.Rules.Remove(rule_name)
+            self.fw_policy.Rules.Remove(record.name)
+            self.rule_index.discard(record.name)
             return True, f"Successfully unblocked {app_name}"
         
         except Exception as e:
+            self.rule_index.invalidate()
             return False, f"Failed to remove rule: {str(e)}"
     
-    def get_active_rules(self) -> List[FirewallRule]:
-        """
-        Get all rules created by this application.
-        
-        Returns:
-            List of FirewallRule objects
-        """
-        rules = []
-        try:
-            for rule in self.fw_policy.Rules:
-                if rule.Name.startswith(RULE_PREFIX):
-                    rules.append(FirewallRule(
-                        name=rule.Name,
-                        app_path=rule.ApplicationName or "",
-                        enabled=rule.Enabled,
-                        direction="OUT" if rule.Direction == 2 else "IN"
-                    ))
-        except Exception as e:
-            print(f"Error retrieving rules: {e}")
-        
-        return rules
-    
-    def is_blocked(self, app_path: str) -> bool:
-        """Check if an application is currently blocked."""
-        app_name = os.path.basename(app_path)
-        rule_name = f"{RULE_PREFIX} {app_name}"
-        return self._find_rule(rule_name) is not None
+    def _create_rule_object(self):
+        """Create a new, empty firewall rule object."""
+        if self.rule_factory:
+            return self.rule_factory()
+        import win32com.client
+        return win32com.client.Dispatch("HNetCfg.FwRule")
     
-    def _find_rule(self, rule_name: str):
-        """Find a rule by name."""
-        try:
-            for rule in self.fw_policy.Rules:
-                if rule.Name == rule_name:
-                    return rule
-        except:
-            pass
-        return None
+    @staticmethod
+    def _record_from_rule(rule) -> FirewallRule:
+        """Convert COM rule into FirewallRule."""
+        return FirewallRule(
+            name=rule.Name,
+            app_path=rule.ApplicationName or "",
+            enabled=rule.Enabled,
+            direction="OUT" if rule.Direction == 2 else "IN"
+        )
@@ -0,0 +1,266 @@
+"""
+Firewall Worker - Run all firewall (COM) operations on one owning thread
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Optional
+from config import FIREWALL_QUEUE_SIZE
+
+BLOCK = 'block'
+UNBLOCK = 'unblock'
+
+class FirewallWorker:
+    """
+    Owns the FirewallManager and runs every firewall operation on one thread.
+    
+    The manager is created (and COM initialized) on the worker thread, so
+    the UI and monitor threads only enqueue commands and get futures back.
+    
+    Block/unblock commands for the same app are coalesced while pending:
+    a repeat shares the pending future, the opposite command supersedes it
+    (the older future is cancelled). Everything pending is applied in one
+    FirewallManager.apply_batch(). Other calls (reconcile, reset, ...) run
+    in submission order after the path commands queued before them.
+    
+    At most `max_pending` commands wait at a time. Submitters wait up to
+    `timeout` seconds for room (0 = never wait); if there is none the
+    returned future fails with queue.Full. Pending futures can be
+    cancelled with Future.cancel().
+    """
+    
+    def __init__(self, factory: Callable, max_pending: int = FIREWALL_QUEUE_SIZE,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            factory: Creates the firewall manager (called on the worker thread)
+            max_pending: Command queue capacity (coalesced commands don't count)
+            clock: Time source for latency stats
+        """
+        self.factory = factory
+        self.max_pending = max(1, max_pending)
+        self.clock = clock
+        self.manager = None  # Set by start(); only touch it from the worker thread
+        
+        # Stats
+        self.max_depth = 0
+        self.completed = 0  # Commands run (including failed ones)
+        self.coalesced = 0  # Commands merged into a pending one
+        self.rejected = 0  # Commands refused because the queue was full
+        self.cancelled = 0  # Commands cancelled or superseded before running
+        self.last_latency = 0.0  # seconds from submit to done, last command
+        self.max_latency = 0.0
+        self._latency_total = 0.0
+        
+        self._ops: Dict[str, tuple] = {}  # app path -> (op, Future, submitted_at), insertion ordered
+        self._calls: deque = deque()  # (func, args, Future, submitted_at)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+    
+    def start(self):
+        """
+        Start the worker thread and create the manager on it.
+        
+        Raises:
+            Whatever the factory raised (e.g. RuntimeError if COM failed)
+        """
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._run, args=(ready, errors), daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            raise errors[0]
+    
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Cancel pending commands and stop the worker (running ones finish)."""
+        with self._cond:
+            self._stopping = True
+            for _, future, _ in self._ops.values():
+                future.cancel()
+            for _, _, future, _ in self._calls:
+                future.cancel()
+            self._ops.clear()
+            self._calls.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def block(self, app_path: str, timeout: float = 0) -> Future:
+        """Queue a block rule for one app; the future gives (success, message)."""
+        return self.apply(block=[app_path], timeout=timeout)[app_path]
+    
+    def unblock(self, app_path: str, timeout: float = 0) -> Future:
+        """Queue removal of one app's block rule; the future gives (success, message)."""
+        return self.apply(unblock=[app_path], timeout=timeout)[app_path]
+    
+    def apply(self, block: Iterable[str] = (), unblock: Iterable[str] = (),
+              timeout: float = 0) -> Dict[str, Future]:
+        """
+        Queue block/unblock commands (the async counterpart of apply_batch).
+        
+        Args:
+            block: Paths to block
+            unblock: Paths to unblock (wins if a path is in both)
+            timeout: Seconds to wait for queue room (0 = fail fast, None = forever)
+        
+        Returns:
+            Dict mapping each path to a Future of (success, message)
+        """
+        commands = {app_path: BLOCK for app_path in block}
+        commands.update((app_path, UNBLOCK) for app_path in unblock)
+        deadline = None if timeout is None else self.clock() + timeout
+        
+        futures = {}
+        with self._cond:
+            for app_path, op in commands.items():
+                pending = self._ops.get(app_path)
+                if pending is None:
+                    if not self._wait_for_room(deadline):
+                        futures[app_path] = self._rejected()
+                        continue
+                elif pending[1].cancelled():
+                    pass  # Cancelled by its caller: replace it
+                elif pending[0] == op:
+                    self.coalesced += 1
+                    futures[app_path] = pending[1]
+                    continue
+                else:
+                    pending[1].cancel()  # Superseded by the opposite command
+                    self.cancelled += 1
+                    self.coalesced += 1
+                future = Future()
+                self._ops.pop(app_path, None)  # Re-queue at the end
+                self._ops[app_path] = (op, future, self.clock())
+                futures[app_path] = future
+            self._note_depth()
+            self._cond.notify_all()
+        return futures
+    
+    def submit(self, func: Callable, *args, timeout: float = 0) -> Future:
+        """
+        Run func(*args) on the worker thread (after path commands queued so far).
+        
+        Args:
+            timeout: Seconds to wait for queue room (0 = fail fast, None = forever)
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            if not self._wait_for_room(deadline):
+                return self._rejected()
+            future = Future()
+            self._calls.append((func, args, future, self.clock()))
+            self._note_depth()
+            self._cond.notify_all()
+        return future
+    
+    def depth(self) -> int:
+        """Number of commands waiting to run."""
+        with self._cond:
+            return len(self._ops) + len(self._calls)
+    
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, counters and latency (seconds) for display/logging."""
+        with self._cond:
+            return {
+                'depth': len(self._ops) + len(self._calls),
+                'max_depth': self.max_depth,
+                'completed': self.completed,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'cancelled': self.cancelled,
+                'last_latency': self.last_latency,
+                'avg_latency': self._latency_total / self.completed if self.completed else 0.0,
+                'max_latency': self.max_latency,
+            }
+    
+    def _wait_for_room(self, deadline: Optional[float]) -> bool:
+        """Wait (lock held) until a command fits; False if the deadline passed."""
+        while len(self._ops) + len(self._calls) >= self.max_pending and not self._stopping:
+            remaining = None if deadline is None else deadline - self.clock()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._cond.wait(remaining)
+        return not self._stopping
+    
+    def _rejected(self) -> Future:
+        """Future for a command that didn't fit in the queue (lock held)."""
+        self.rejected += 1
+        future = Future()
+        future.set_exception(queue.Full(f"Firewall queue is full ({self.max_pending} pending)"))
+        return future
+    
+    def _note_depth(self):
+        """Track the deepest queue seen (lock held)."""
+        self.max_depth = max(self.max_depth, len(self._ops) + len(self._calls))
+    
+    def _finished(self, submitted_at: float):
+        """Record latency of a completed command."""
+        latency = self.clock() - submitted_at
+        with self._cond:
+            self.completed += 1
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self._latency_total += latency
+    
+    def _run(self, ready: threading.Event, errors: list):
+        """Worker loop: create the manager, then apply queued commands."""
+        try:
+            self.manager = self.factory()
+        except Exception as e:
+            errors.append(e)
+            return
+        finally:
+            ready.set()
+        
+        while True:
+            with self._cond:
+                while not (self._ops or self._calls or self._stopping):
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                ops, self._ops = self._ops, {}
+                call = self._calls.popleft() if self._calls else None
+                self._cond.notify_all()  # Room for waiting submitters
+            
+            if ops:
+                self._apply_ops(ops)
+            if call is not None:
+                self._run_call(*call)
+    
+    def _apply_ops(self, ops: Dict[str, tuple]):
+        """Apply pending path commands in one batch."""
+        block, unblock = [], []
+        for app_path, (op, future, _) in ops.items():
+            if not future.set_running_or_notify_cancel():
+                with self._cond:
+                    self.cancelled += 1
+                continue
+            (block if op == BLOCK else unblock).append(app_path)
+        if not block and not unblock:
+            return
+        
+        try:
+            results = self.manager.apply_batch(block=block, unblock=unblock)
+        except Exception as e:
+            results = {app_path: (False, f"Firewall error: {str(e)}") for app_path in block + unblock}
+        for app_path in block + unblock:
+            _, future, submitted_at = ops[app_path]
+            future.set_result(results.get(app_path, (False, "No result")))
+            self._finished(submitted_at)
+    
+    def _run_call(self, func: Callable, args: tuple, future: Future, submitted_at: float):
+        """Run one queued call."""
+        if not future.set_running_or_notify_cancel():
+            with self._cond:
+                self.cancelled += 1
+            return
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        self._finished(submitted_at)
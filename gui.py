@@ -6,26 +6,36 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox, Toplevel
 import os
 from typing import List
-from config import COLORS, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT, WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT, ENABLE_CONNECTION_NOTIFICATIONS
+from config import COLORS, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT, WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT, ENABLE_CONNECTION_NOTIFICATIONS, SEARCH_DEBOUNCE_DELAY, UI_UPDATE_INTERVAL, RECONCILE_INTERVAL, LIST_PAGE_SIZE
 from firewall_manager import FirewallManager
-from monitor import NetworkMonitor, Connection
-from safety import emergency_reset, get_app_rules_count, is_safe_to_block
-from app_registry import AppRegistry
+from firewall_worker import FirewallWorker
+from monitor import NetworkMonitor, Connection, ConnectionDelta, connection_key
+from safety import is_safe_to_block, triage_new_apps
+from reset_engine import ResetEngine
+from app_registry import open_registry
+from virtual_list import VirtualListModel, SortedKeyList, PagedSequence
+from search_index import SearchIndex
+from ui_updates import UiUpdateChannel
+from pending_apps import PendingQueue
+from reconciler import RuleReconciler
 import pystray
 from PIL import Image, ImageDraw
 import threading
+import queue
+from functools import partial
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 class PendingAppRow(ctk.CTkFrame):
-    """Single row for pending app decision."""
+    """Recyclable row for a pending app decision (shows whichever app it is given)."""
     
-    def __init__(self, parent, app_path: str, on_allow, on_block, on_copy, ui_font_size: int = 12):
-        super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=6)
+    def __init__(self, parent, on_allow, on_block, on_copy, ui_font_size: int = 12, height: int = 56):
+        super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=6, height=height)
+        self.pack_propagate(False)
         
-        self.app_path = app_path
-        self.app_name = os.path.basename(app_path)
+        self.app_path = ""
+        self.app_name = ""
         self.on_allow = on_allow
         self.on_block = on_block
         self.on_copy = on_copy
@@ -38,21 +48,23 @@ class PendingAppRow(ctk.CTkFrame):
         info_frame = ctk.CTkFrame(self, fg_color="transparent")
         info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=8)
         
-        ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             info_frame,
-            text=f"🌐 {self.app_name}",
+            text="",
             font=("Segoe UI", self.ui_font_size, "bold"),
             text_color=COLORS['text_primary'],
             anchor="w"
-        ).pack(fill="x")
+        )
+        self.name_label.pack(fill="x")
         
-        ctk.CTkLabel(
+        self.path_label = ctk.CTkLabel(
             info_frame,
-            text=self.app_path,
+            text="",
             font=("Segoe UI", 9),
             text_color=COLORS['text_secondary'],
             anchor="w"
-        ).pack(fill="x")
+        )
+        self.path_label.pack(fill="x")
         
         # Buttons
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -90,21 +102,97 @@ class PendingAppRow(ctk.CTkFrame):
             font=("Segoe UI", 10, "bold"),
             command=lambda: self.on_block(self.app_path)
         ).pack(side="left", padx=3)
+    
+    def show(self, app_path: str):
+        """Reuse this row for another app (buttons act on the current app)."""
+        self.app_path = app_path
+        self.app_name = os.path.basename(app_path)
+        self.name_label.configure(text=f"🌐 {self.app_name}")
+        self.path_label.configure(text=app_path)
 
+class PendingGroupRow(ctk.CTkFrame):
+    """Recyclable row for a folder/publisher group of pending apps."""
+    
+    def __init__(self, parent, on_allow_group, on_block_group, ui_font_size: int = 12, height: int = 56):
+        super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=6, height=height)
+        self.pack_propagate(False)
+        
+        self.group = ""
+        self.app_paths: List[str] = []
+        
+        info_frame = ctk.CTkFrame(self, fg_color="transparent")
+        info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=8)
+        
+        self.name_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", ui_font_size, "bold"),
+            text_color=COLORS['text_primary'],
+            anchor="w"
+        )
+        self.name_label.pack(fill="x")
+        
+        self.count_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", 9),
+            text_color=COLORS['text_secondary'],
+            anchor="w"
+        )
+        self.count_label.pack(fill="x")
+        
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(side="right", padx=10)
+        
+        ctk.CTkButton(
+            btn_frame,
+            text="✅ Allow group",
+            width=110,
+            height=30,
+            fg_color=COLORS['success'],
+            hover_color="#0d6b0d",
+            font=("Segoe UI", 10, "bold"),
+            command=lambda: on_allow_group(self.app_paths)
+        ).pack(side="left", padx=3)
+        
+        ctk.CTkButton(
+            btn_frame,
+            text="🚫 Block group",
+            width=110,
+            height=30,
+            fg_color=COLORS['danger'],
+            hover_color="#a82a2d",
+            font=("Segoe UI", 10, "bold"),
+            command=lambda: on_block_group(self.app_paths)
+        ).pack(side="left", padx=3)
+    
+    def show(self, group: str, app_paths: List[str], icon: str = "📁"):
+        """Reuse this row for another group."""
+        self.group = group
+        self.app_paths = app_paths
+        self.name_label.configure(text=f"{icon} {group}")
+        names = ", ".join(os.path.basename(app_path) for app_path in app_paths[:3])
+        more = f" +{len(app_paths) - 3} more" if len(app_paths) > 3 else ""
+        self.count_label.configure(text=f"{len(app_paths)} apps: {names}{more}")
 
 class NewAppsDialog(Toplevel):
     """Dialog showing queue of new applications requiring decisions."""
     
-    def __init__(self, parent, on_allow, on_block, on_copy, on_hidden, ui_font_size: int = 12):
+    GROUP_MODES = {"Apps": None, "By folder": 'directory', "By publisher": 'publisher'}
+    
+    def __init__(self, parent, on_allow, on_block, on_copy, on_hidden, ui_font_size: int = 12,
+                 on_allow_many=None, on_block_many=None):
         super().__init__(parent)
         
         self.on_allow = on_allow
         self.on_block = on_block
+        self.on_allow_many = on_allow_many  # Bulk callbacks (one registry/firewall pass)
+        self.on_block_many = on_block_many
         self.on_copy = on_copy
         self.on_hidden = on_hidden  # Callback when dialog is hidden
         self.ui_font_size = ui_font_size
-        self.pending_apps = []
-        self.app_rows = {}
+        self.pending_apps = PendingQueue()  # Ordered dict: O(1) add/remove, arrival order
+        self.group_by = None  # None, 'directory' or 'publisher'
         self.is_hidden = False  # Track if dialog is hidden
         self.was_minimized = False  # Track if dialog was intentionally minimized
         
@@ -149,17 +237,35 @@ class NewAppsDialog(Toplevel):
             text_color=COLORS['text_secondary']
         ).pack(pady=(0, 10))
         
-        # Scrollable list
-        self.apps_container = ctk.CTkScrollableFrame(
+        # Grouping for triaging large queues
+        group_selector = ctk.CTkSegmentedButton(
             main_frame,
-            fg_color=COLORS['bg_light'],
-            corner_radius=8
+            values=list(self.GROUP_MODES),
+            command=self._on_group_change
+        )
+        group_selector.set("Apps")
+        group_selector.pack(anchor="w", pady=(0, 10))
+        
+        # Virtualized lists (only visible rows exist as widgets)
+        self.app_list = VirtualPendingList(
+            main_frame,
+            self._handle_allow,
+            self._handle_block,
+            self.on_copy,
+            self.ui_font_size
+        )
+        self.group_list = VirtualGroupList(
+            main_frame,
+            self._allow_group,
+            self._block_group,
+            self.ui_font_size
         )
-        self.apps_container.pack(fill="both", expand=True, pady=(0, 10))
+        self.app_list.pack(fill="both", expand=True, pady=(0, 10))
         
         # Footer with bulk actions
-        footer = ctk.CTkFrame(main_frame, fg_color="transparent")
-        footer.pack(fill="x")
+        self.footer = ctk.CTkFrame(main_frame, fg_color="transparent")
+        self.footer.pack(fill="x")
+        footer = self.footer
         
         ctk.CTkButton(
             footer,
@@ -196,53 +302,83 @@ class NewAppsDialog(Toplevel):
         )
         self.count_label.pack(side="right", padx=10)
     
+    def add_apps(self, app_paths: List[str]):
+        """Add several apps, redrawing once."""
+        if self.pending_apps.add_many(app_paths):
+            self._refresh()
+    
     def add_app(self, app_path: str):
         """Add app to pending list."""
-        if app_path not in self.app_rows:
-            self.pending_apps.append(app_path)
-            
-            row = PendingAppRow(
-                self.apps_container,
-                app_path,
-                self._handle_allow,
-                self._handle_block,
-                self.on_copy,
-                self.ui_font_size
-            )
-            row.pack(fill="x", pady=3, padx=5)
-            self.app_rows[app_path] = row
-            
-            self._update_count()
+        self.add_apps([app_path])
+    
+    def _refresh(self):
+        """Show the current queue in the active list and update the count."""
+        if self.group_by:
+            self.group_list.set_items(self.pending_apps.groups(self.group_by))
+        else:
+            self.app_list.set_items(self.pending_apps.items())
+        self._update_count()
+    
+    def _on_group_change(self, mode: str):
+        """Switch between the app list and folder/publisher groups."""
+        self.group_by = self.GROUP_MODES[mode]
+        self.group_list.icon = "🏢" if self.group_by == 'publisher' else "📁"
+        shown, hidden = (self.group_list, self.app_list) if self.group_by else (self.app_list, self.group_list)
+        hidden.pack_forget()
+        shown.pack(fill="both", expand=True, pady=(0, 10), before=self.footer)
+        self._refresh()
     
     def _handle_allow(self, app_path: str):
         """Handle allow for single app."""
         self.on_allow(app_path)
-        self._remove_app(app_path)
+        self._remove_apps([app_path])
     
     def _handle_block(self, app_path: str):
         """Handle block for single app."""
         self.on_block(app_path)
-        self._remove_app(app_path)
-    
-    def _remove_app(self, app_path: str):
-        """Remove app from pending list."""
-        if app_path in self.app_rows:
-            self.app_rows[app_path].destroy()
-            del self.app_rows[app_path]
-            self.pending_apps.remove(app_path)
-            self._update_count()
-            
-            # Close dialog if no more apps
-            if not self.pending_apps:
-                self.is_hidden = True
-                if self.on_hidden:
-                    self.on_hidden()
-                self.destroy()
+        self._remove_apps([app_path])
+    
+    def _allow_group(self, app_paths: List[str]):
+        """Allow every app of a folder/publisher group."""
+        app_paths = list(app_paths)
+        if self.on_allow_many:
+            self.on_allow_many(app_paths)
+        else:
+            for app_path in app_paths:
+                self.on_allow(app_path)
+        self._remove_apps(app_paths)
+    
+    def _block_group(self, app_paths: List[str]):
+        """Confirm block for every app of a folder/publisher group."""
+        app_paths = list(app_paths)
+        if self.on_block_many:
+            self.on_block_many(app_paths)
+        else:
+            for app_path in app_paths:
+                self.on_block(app_path)
+        self._remove_apps(app_paths)
+    
+    def _remove_apps(self, app_paths: List[str]):
+        """Remove decided apps from the pending list."""
+        if not self.pending_apps.discard_many(app_paths):
+            return
+        
+        # Close dialog if no more apps
+        if not self.pending_apps:
+            self.is_hidden = True
+            if self.on_hidden:
+                self.on_hidden()
+            self.destroy()
+        else:
+            self._refresh()
     
     def _allow_all(self):
         """Allow all pending apps."""
-        for app_path in self.pending_apps.copy():
-            self.on_allow(app_path)
+        if self.on_allow_many:
+            self.on_allow_many(list(self.pending_apps))
+        else:
+            for app_path in list(self.pending_apps):
+                self.on_allow(app_path)
         self.is_hidden = True
         if self.on_hidden:
             self.on_hidden()
@@ -250,8 +386,11 @@ class NewAppsDialog(Toplevel):
     
     def _block_all(self):
         """Block all pending apps."""
-        for app_path in self.pending_apps.copy():
-            self.on_block(app_path)
+        if self.on_block_many:
+            self.on_block_many(list(self.pending_apps))
+        else:
+            for app_path in list(self.pending_apps):
+                self.on_block(app_path)
         self.is_hidden = True
         if self.on_hidden:
             self.on_hidden()
@@ -288,8 +427,14 @@ class NewAppsDialog(Toplevel):
 class ListCard(ctk.CTkFrame):
     """Card widget for whitelist/blacklist items."""
     
-    def __init__(self, parent, app_path: str, list_type: str, on_action, on_copy, ui_font_size: int = 12):
-        super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=8)
+    def __init__(self, parent, app_path: str, list_type: str, on_action, on_copy, ui_font_size: int = 12,
+                 height: int = None):
+        if height:
+            # Fixed-height card for virtualized lists
+            super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=8, height=height)
+            self.pack_propagate(False)
+        else:
+            super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=8)
         
         self.app_path = app_path
         self.app_name = os.path.basename(app_path)
@@ -310,21 +455,23 @@ class ListCard(ctk.CTkFrame):
         left_frame.pack(side="left", fill="both", expand=True)
         
         icon = "🟢" if self.list_type == "whitelist" else "🔴"
-        ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             left_frame,
             text=f"{icon} {self.app_name}",
             font=("Segoe UI", self.ui_font_size, "bold"),
             text_color=COLORS['text_primary'],
             anchor="w"
-        ).pack(fill="x")
+        )
+        self.name_label.pack(fill="x")
         
-        ctk.CTkLabel(
+        self.path_label = ctk.CTkLabel(
             left_frame,
             text=self.app_path,
             font=("Segoe UI", 9),
             text_color=COLORS['text_secondary'],
             anchor="w"
-        ).pack(fill="x")
+        )
+        self.path_label.pack(fill="x")
         
         # Right side - buttons
         btn_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
@@ -372,6 +519,386 @@ class ListCard(ctk.CTkFrame):
             font=("Segoe UI", 9),
             command=lambda: self.on_action("forget", self.app_path)
         ).pack(side="right", padx=2)
+    
+    def show(self, app_path: str):
+        """Reuse this card for another app (buttons act on the current app)."""
+        self.app_path = app_path
+        self.app_name = os.path.basename(app_path)
+        icon = "🟢" if self.list_type == "whitelist" else "🔴"
+        self.name_label.configure(text=f"{icon} {self.app_name}")
+        self.path_label.configure(text=app_path)
+    
+    def set_font_size(self, font_size: int):
+        """Change app name font size."""
+        self.ui_font_size = font_size
+        self.name_label.configure(font=("Segoe UI", font_size, "bold"))
+
+class ConnectionRow(ctk.CTkFrame):
+    """Recyclable row of the connections list (updated in place, never rebuilt)."""
+    
+    def __init__(self, parent, on_copy, font_size: int = 12, height: int = 52):
+        # CTk widgets take their size in the constructor, not in place()
+        super().__init__(parent, fg_color=COLORS['bg_medium'], corner_radius=4, height=height)
+        self.pack_propagate(False)
+        self.connection = None
+        
+        left_frame = ctk.CTkFrame(self, fg_color="transparent")
+        left_frame.pack(side="left", fill="both", expand=True, padx=10, pady=5)
+        
+        self.info_label = ctk.CTkLabel(
+            left_frame,
+            text="",
+            font=("Segoe UI", font_size, "bold"),
+            text_color=COLORS['text_primary'],
+            anchor="w"
+        )
+        self.info_label.pack(fill="x")
+        
+        self.path_label = ctk.CTkLabel(
+            left_frame,
+            text="",
+            font=("Segoe UI", 9),
+            text_color=COLORS['text_secondary'],
+            anchor="w"
+        )
+        self.path_label.pack(fill="x")
+        
+        right_frame = ctk.CTkFrame(self, fg_color="transparent")
+        right_frame.pack(side="right", padx=10, pady=5)
+        
+        # Copy button
+        ctk.CTkButton(
+            right_frame,
+            text="📋",
+            width=30,
+            height=25,
+            fg_color=COLORS['bg_light'],
+            hover_color=COLORS['accent_blue'],
+            font=("Segoe UI", 12),
+            command=lambda: self.connection and on_copy(self.connection)
+        ).pack(side="left", padx=3)
+        
+        self.status_label = ctk.CTkLabel(
+            right_frame,
+            text="",
+            font=("Segoe UI", 9, "bold")
+        )
+        self.status_label.pack(side="left", padx=5)
+    
+    def show(self, conn: Connection, is_blocked: bool):
+        """Display a connection in this row."""
+        self.connection = conn
+        status_icon = "🔴" if is_blocked else "🟢"
+        self.info_label.configure(text=f"{status_icon} {conn.process_name} → {conn.remote_addr}:{conn.remote_port}")
+        self.path_label.configure(text=conn.process_path)
+        self.status_label.configure(
+            text="BLOCKED" if is_blocked else "ALLOWED",
+            text_color=COLORS['danger'] if is_blocked else COLORS['success']
+        )
+    
+    def set_font_size(self, font_size: int):
+        """Change process name font size."""
+        self.info_label.configure(font=("Segoe UI", font_size, "bold"))
+
+class SearchEntry(ctk.CTkEntry):
+    """Search box that reports its text once typing pauses for SEARCH_DEBOUNCE_DELAY."""
+    
+    def __init__(self, parent, on_search, placeholder: str = "Search..."):
+        super().__init__(parent, placeholder_text=f"🔍 {placeholder}", width=260)
+        self.on_search = on_search
+        self._pending = None  # after() id of the scheduled search
+        self._last = ""
+        self.bind("<KeyRelease>", self._schedule)
+        self.bind("<Escape>", self._clear)
+    
+    def _schedule(self, event=None):
+        """Restart the debounce timer."""
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(SEARCH_DEBOUNCE_DELAY, self._fire)
+    
+    def _fire(self):
+        """Report the query if it changed."""
+        self._pending = None
+        query = self.get().strip()
+        if query != self._last:
+            self._last = query
+            self.on_search(query)
+    
+    def _clear(self, event=None):
+        """Escape clears the search."""
+        self.delete(0, "end")
+        self._schedule()
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list that only creates the rows that fit on screen.
+    
+    Rows are recycled on scroll and updated in place when data changes, so
+    the widget count stays constant however many items there are.
+    Subclasses provide _create_row(), _show_row() and _render_key().
+    """
+    
+    ROW_HEIGHT = 56  # px, including spacing
+    
+    def __init__(self, parent):
+        super().__init__(parent, fg_color=COLORS['bg_dark'])
+        self.model = VirtualListModel(self.ROW_HEIGHT, self._render_key)
+        self.rows = []
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = ctk.CTkFrame(self, fg_color=COLORS['bg_dark'])
+        self.viewport.pack(side="left", fill="both", expand=True)
+        
+        self.viewport.bind("<Configure>", self._on_resize)
+        self.bind("<Enter>", lambda e: self.bind_all("<MouseWheel>", self._on_mousewheel))
+        self.bind("<Leave>", lambda e: self.unbind_all("<MouseWheel>"))
+    
+    def set_items(self, items):
+        """Show a new sequence of items (keeps scroll position)."""
+        self.model.set_items(items)
+        self._redraw()
+    
+    def refresh(self):
+        """Redraw visible rows whose render key changed."""
+        self._redraw()
+    
+    def _create_row(self):
+        raise NotImplementedError
+    
+    def _show_row(self, row, item):
+        raise NotImplementedError
+    
+    def _render_key(self, item):
+        """What a row displays for an item (unchanged key = no redraw)."""
+        return item
+    
+    def _on_resize(self, event):
+        """Create/destroy row widgets to match the viewport height."""
+        if not self.model.resize(event.height):
+            return
+        slots = self.model.slot_count()
+        while len(self.rows) < slots:
+            self.rows.append(self._create_row())
+        while len(self.rows) > slots:
+            self.rows.pop().destroy()
+        self._redraw()
+    
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel notch."""
+        self.model.scroll_by(-3 if event.delta > 0 else 3)
+        self._redraw()
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        """Handle scrollbar drag ('moveto') and arrow/page clicks ('scroll')."""
+        if action == "moveto":
+            self.model.scroll_to_fraction(float(value))
+        elif action == "scroll":
+            step = self.model.viewport_rows if unit == "pages" else 1
+            self.model.scroll_by(int(value) * step)
+        self._redraw()
+    
+    def _redraw(self):
+        """Update only the rows whose content changed."""
+        for slot, item in self.model.pending_updates():
+            row = self.rows[slot]
+            if item is None:
+                row.place_forget()
+            else:
+                self._show_row(row, item)
+                row.place(x=0, y=slot * self.ROW_HEIGHT, relwidth=1)
+        self.scrollbar.set(*self.model.scrollbar_span())
+
+class VirtualConnectionList(VirtualList):
+    """Connections tab list."""
+    
+    def __init__(self, parent, is_blocked, on_copy, font_size: int = 12):
+        self.is_blocked = is_blocked
+        self.on_copy = on_copy
+        self.font_size = font_size
+        super().__init__(parent)
+    
+    def set_connections(self, connections):
+        """Show a new list of connections (keeps scroll position)."""
+        self.set_items(connections)
+    
+    def set_font_size(self, font_size: int):
+        """Change process name font size for all rows."""
+        self.font_size = font_size
+        for row in self.rows:
+            row.set_font_size(font_size)
+    
+    def _create_row(self):
+        return ConnectionRow(self.viewport, self.on_copy, self.font_size, self.ROW_HEIGHT - 4)
+    
+    def _show_row(self, row, conn):
+        row.show(conn, self.is_blocked(conn.process_path))
+    
+    def _render_key(self, conn) -> tuple:
+        return (conn.process_name, conn.process_path, conn.remote_addr, conn.remote_port,
+                self.is_blocked(conn.process_path))
+
+class VirtualAppList(VirtualList):
+    """
+    Allowed/Blocked tab list, keyed by app path.
+    
+    Changes are reconciled into a SortedKeyList (insert/remove only what
+    changed) and only the visible cards whose app moved are redrawn.
+    A search query narrows the shown keys through the same list; the
+    SearchIndex is updated with every add/remove, never rebuilt.
+    
+    Given a `registry` (one that isn't in memory, e.g. SQLite) the list
+    instead pages through registry.query_apps: only the visible page is
+    loaded, and every change or query reloads from the registry.
+    """
+    
+    ROW_HEIGHT = 72
+    
+    def __init__(self, parent, list_type: str, on_action, on_copy, font_size: int = 12, registry=None):
+        self.list_type = list_type  # 'whitelist' or 'blacklist'
+        self.on_action = on_action
+        self.on_copy = on_copy
+        self.font_size = font_size
+        self.registry = registry  # Paged source, or None to keep keys in memory
+        self.keys = SortedKeyList()
+        self.index = SearchIndex()
+        self.query = ""
+        self.shown = self.keys  # keys, or the ones matching query
+        super().__init__(parent)
+        self.model.set_items(self.shown)
+    
+    def set_apps(self, app_paths):
+        """Reconcile with the full list of apps."""
+        if self.registry is not None:
+            return self.reload()
+        return self._keeping_anchor(lambda: self._sync(set(app_paths)))
+    
+    def update_apps(self, add=(), remove=()):
+        """Insert/remove app cards, redrawing once for the whole batch."""
+        if self.registry is not None:
+            return self.reload()
+        def change():
+            for app_path in remove:
+                self._remove(app_path)
+            for app_path in add:
+                self._add(app_path)
+        self._keeping_anchor(change)
+    
+    def set_query(self, query: str):
+        """Show only apps matching query ('' shows all), from the top."""
+        self.query = query
+        self.model.scroll_to(0)
+        if self.registry is not None:
+            return self.reload()
+        self._filter()
+        self.set_items(self.shown)
+    
+    def reload(self):
+        """Show a fresh snapshot of the list from the paged registry."""
+        registry, list_type, search = self.registry, self.list_type, self.query or None
+        self.shown = PagedSequence(
+            lambda: registry.count_apps(list_type, search),
+            lambda offset, limit: registry.query_apps(list_type, search, offset, limit),
+            LIST_PAGE_SIZE
+        )
+        self.set_items(self.shown)
+    
+    def set_font_size(self, font_size: int):
+        """Change app name font size for all cards."""
+        if font_size != self.font_size:
+            self.font_size = font_size
+            for row in self.rows:
+                row.set_font_size(font_size)
+    
+    def _sync(self, app_paths: set):
+        """Reconcile keys and index with the full set of apps."""
+        for app_path in [path for path in self.keys if path not in app_paths]:
+            self.index.discard(app_path)
+        counts = self.keys.sync(app_paths)
+        for app_path in app_paths:
+            self.index.add(app_path, app_path)
+        if self.query:
+            self._filter()
+        return counts
+    
+    def _add(self, app_path: str) -> bool:
+        """Insert one app into keys, index and the filtered view."""
+        self.index.add(app_path, app_path)
+        if self.shown is not self.keys and self.index.matches(app_path, self.query):
+            self.shown.add(app_path)
+        return self.keys.add(app_path)
+    
+    def _remove(self, app_path: str) -> bool:
+        """Remove one app from keys, index and the filtered view."""
+        self.index.discard(app_path)
+        if self.shown is not self.keys:
+            self.shown.discard(app_path)
+        return self.keys.discard(app_path)
+    
+    def _filter(self):
+        """Recompute the shown keys from the index."""
+        matches = self.index.search(self.query)
+        self.shown = self.keys if matches is None else SortedKeyList(matches)
+    
+    def _keeping_anchor(self, change):
+        """Apply a change without shifting the app shown at the top."""
+        top = self.shown[self.model.first] if self.model.first < len(self.shown) else None
+        result = change()
+        if top is not None and self.model.first:
+            index = self.shown.index(top)
+            if index >= 0:
+                self.model.scroll_to(index)
+        self.set_items(self.shown)
+        return result
+    
+    def _create_row(self):
+        return ListCard(self.viewport, "", self.list_type, self.on_action, self.on_copy,
+                        self.font_size, height=self.ROW_HEIGHT - 6)
+    
+    def _show_row(self, row, app_path):
+        row.show(app_path)
+
+class VirtualPendingList(VirtualList):
+    """New apps dialog list of pending apps."""
+    
+    ROW_HEIGHT = 60
+    
+    def __init__(self, parent, on_allow, on_block, on_copy, font_size: int = 12):
+        self.on_allow = on_allow
+        self.on_block = on_block
+        self.on_copy = on_copy
+        self.font_size = font_size
+        super().__init__(parent)
+    
+    def _create_row(self):
+        return PendingAppRow(self.viewport, self.on_allow, self.on_block, self.on_copy,
+                             self.font_size, height=self.ROW_HEIGHT - 4)
+    
+    def _show_row(self, row, app_path):
+        row.show(app_path)
+
+class VirtualGroupList(VirtualList):
+    """New apps dialog list of (group, app paths) pairs."""
+    
+    ROW_HEIGHT = 60
+    
+    def __init__(self, parent, on_allow_group, on_block_group, font_size: int = 12):
+        self.icon = "📁"  # Folder or publisher groups
+        self.on_allow_group = on_allow_group
+        self.on_block_group = on_block_group
+        self.font_size = font_size
+        super().__init__(parent)
+    
+    def _create_row(self):
+        return PendingGroupRow(self.viewport, self.on_allow_group, self.on_block_group,
+                               self.font_size, height=self.ROW_HEIGHT - 4)
+    
+    def _show_row(self, row, group):
+        row.show(*group, icon=self.icon)
+    
+    def _render_key(self, group) -> tuple:
+        return (self.icon, group[0], tuple(group[1]))
 
 class FirewallGUI:
     """Main application GUI."""
@@ -382,17 +909,26 @@ class FirewallGUI:
         self.root.geometry(f"{WINDOW_DEFAULT_WIDTH}x{WINDOW_DEFAULT_HEIGHT}")
         self.root.minsize(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
         
-        self.fw_manager = FirewallManager()
-        self.app_registry = AppRegistry()
+        # All firewall (COM) work runs on the worker thread; callers get futures
+        self.firewall = FirewallWorker(FirewallManager)
+        self.firewall.start()
+        self.app_registry = open_registry()
+        # Block rules follow the blacklist (startup and every RECONCILE_INTERVAL, on the worker)
+        self.reconciler = RuleReconciler(self.firewall.manager, self.app_registry)
+        self.reconcile_future = None
+        # Background threads -> main loop (drained every UI_UPDATE_INTERVAL); keyed list updates are cheap
+        self.ui_updates = UiUpdateChannel(batch_sizes={'app_lists': 1000})
         self.monitor = NetworkMonitor(
-            update_callback=self._on_connections_update,
-            new_app_callback=self._on_new_app_detected,
+            new_apps_callback=self._on_new_apps_detected,
             update_interval=self.app_registry.get_setting('connection_update_interval')
         )
+        # Forwarded to ui_updates, which keeps only the latest snapshot (deltas merged)
+        self.connection_updates = self.monitor.subscribe(maxsize=1, notify=self._on_connections_changed)
         
-        self.connection_rows = []
+        self.connection_table = {}  # connection_key -> Connection, updated from deltas
+        self.connection_index = SearchIndex()  # Same keys, searchable fields
+        self.connection_query = ""
         self.new_apps_dialog = None  # Single dialog for all new apps
-        self.last_connections_snapshot = []  # Track last displayed connections
         self.tray_icon = None  # System tray icon
         self.start_minimized = start_minimized
         self.dialog_minimized = False  # Track if dialog is hidden
@@ -401,7 +937,9 @@ class FirewallGUI:
         self._create_ui()
         self._setup_tray()
         self._load_lists()
+        self._reconcile_rules()
         self.monitor.start()
+        self.root.after(UI_UPDATE_INTERVAL, self._pump_ui_updates)
         
         # Check for unknown apps with active connections on startup
         self.root.after(2000, self._check_unknown_apps_on_startup)
@@ -471,7 +1009,7 @@ class FirewallGUI:
         content.bind("<Button-1>", self._on_main_window_click)
         
         # Tab view
-        self.tabview = ctk.CTkTabview(content, fg_color=COLORS['bg_light'])
+        self.tabview = ctk.CTkTabview(content, fg_color=COLORS['bg_light'], command=self._on_tab_changed)
         self.tabview.pack(fill="both", expand=True)
         
         # Create tabs
@@ -520,11 +1058,21 @@ class FirewallGUI:
             command=self._browse_application_to_allow
         ).pack(side="left")
         
-        self.whitelist_container = ctk.CTkScrollableFrame(
+        SearchEntry(
+            btn_frame,
+            on_search=lambda query: self.whitelist_view.set_query(query),
+            placeholder="Search allowed apps"
+        ).pack(side="right")
+        
+        self.whitelist_view = VirtualAppList(
             parent,
-            fg_color=COLORS['bg_dark']
+            "whitelist",
+            self._handle_list_action,
+            self._copy_app_info,
+            self.app_registry.get_setting('ui_font_size'),
+            registry=None if self.app_registry.in_memory else self.app_registry
         )
-        self.whitelist_container.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.whitelist_view.pack(fill="both", expand=True, padx=10, pady=(0, 10))
     
     def _create_blacklist_tab(self, parent):
         """Create blocked apps tab."""
@@ -538,19 +1086,40 @@ class FirewallGUI:
             command=self._browse_application
         ).pack(side="left")
         
-        self.blacklist_container = ctk.CTkScrollableFrame(
+        SearchEntry(
+            btn_frame,
+            on_search=lambda query: self.blacklist_view.set_query(query),
+            placeholder="Search blocked apps"
+        ).pack(side="right")
+        
+        self.blacklist_view = VirtualAppList(
             parent,
-            fg_color=COLORS['bg_dark']
+            "blacklist",
+            self._handle_list_action,
+            self._copy_app_info,
+            self.app_registry.get_setting('ui_font_size'),
+            registry=None if self.app_registry.in_memory else self.app_registry
         )
-        self.blacklist_container.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.blacklist_view.pack(fill="both", expand=True, padx=10, pady=(0, 10))
     
     def _create_connections_tab(self, parent):
         """Create connections monitoring tab."""
-        self.connections_container = ctk.CTkScrollableFrame(
+        search_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        search_frame.pack(fill="x", padx=10, pady=(10, 0))
+        
+        SearchEntry(
+            search_frame,
+            on_search=self._on_connection_search,
+            placeholder="Search process, path, address, port"
+        ).pack(side="right")
+        
+        self.connection_list = VirtualConnectionList(
             parent,
-            fg_color=COLORS['bg_dark']
+            is_blocked=self.app_registry.is_blacklisted,
+            on_copy=self._copy_process_info,
+            font_size=self.app_registry.get_setting('process_font_size')
         )
-        self.connections_container.pack(fill="both", expand=True, padx=10, pady=10)
+        self.connection_list.pack(fill="both", expand=True, padx=10, pady=10)
     
     def _create_settings_tab(self, parent):
         """Create settings tab."""
@@ -592,16 +1161,6 @@ class FirewallGUI:
             ui_font_size
         )
         
-        # Max Connections
-        self._create_setting_row(
-            settings_container,
-            "Max Connections to Display",
-            "Maximum number of connections shown (lower = less memory)",
-            "max_connections_display",
-            10, 100, 10,
-            ui_font_size
-        )
-        
         # Enable Notifications
         notif_frame = ctk.CTkFrame(settings_container, fg_color=COLORS['bg_medium'], corner_radius=8)
         notif_frame.pack(fill="x", pady=5, padx=5)
@@ -726,6 +1285,8 @@ class FirewallGUI:
         # Apply connection interval immediately
         if setting_key == 'connection_update_interval':
             self.monitor.update_interval = value
+        elif setting_key == 'process_font_size':
+            self.connection_list.set_font_size(value)
     
     def _update_setting(self, key: str, value):
         """Update a boolean setting."""
@@ -822,6 +1383,7 @@ for i in range(10):
         if self.new_apps_dialog and not self.dialog_minimized:
             self.new_apps_dialog._hide_dialog()
         self.root.withdraw()
+        self.monitor.set_visible(False)
     
     def _on_main_window_click(self, event):
         """Hide dialog when main window is clicked."""
@@ -831,10 +1393,12 @@ for i in range(10):
     def _hide_window(self):
         """Hide window on startup (for --minimized mode)."""
         self.root.withdraw()
+        self.monitor.set_visible(False)
     
     def _restore_window(self):
         """Restore window from minimized/hidden state and bring to front."""
         self.root.deiconify()
+        self.monitor.set_visible(True)
         self.root.state('zoomed')  # Maximize window
         self.root.lift()
         self.root.focus_force()
@@ -850,50 +1414,34 @@ for i in range(10):
         if self.tray_icon:
             self.tray_icon.stop()
         self.monitor.stop()
+        self.firewall.stop()
+        self.app_registry.close()
         self.root.quit()
     
     def _load_lists(self):
-        """Load whitelist and blacklist."""
+        """Load whitelist and blacklist (reconciles with what is shown, no rebuild)."""
         ui_font_size = self.app_registry.get_setting('ui_font_size')
+        self.whitelist_view.set_font_size(ui_font_size)
+        self.blacklist_view.set_font_size(ui_font_size)
         
-        # Clear whitelist - check if widgets still exist
-        for widget in self.whitelist_container.winfo_children():
-            try:
-                widget.after_idle(widget.destroy)
-            except:
-                pass
-        
-        # Clear blacklist - check if widgets still exist
-        for widget in self.blacklist_container.winfo_children():
-            try:
-                widget.after_idle(widget.destroy)
-            except:
-                pass
-        
-        # Load whitelist
-        for app_path in self.app_registry.get_whitelist():
-            card = ListCard(
-                self.whitelist_container,
-                app_path,
-                "whitelist",
-                self._handle_list_action,
-                self._copy_app_info,
-                ui_font_size
-            )
-            card.pack(fill="x", pady=3, padx=5)
-        
-        # Load blacklist
-        for app_path in self.app_registry.get_blacklist():
-            card = ListCard(
-                self.blacklist_container,
-                app_path,
-                "blacklist",
-                self._handle_list_action,
-                self._copy_app_info,
-                ui_font_size
-            )
-            card.pack(fill="x", pady=3, padx=5)
+        if self.app_registry.in_memory:
+            self.whitelist_view.set_apps(self.app_registry.get_whitelist())
+            self.blacklist_view.set_apps(self.app_registry.get_blacklist())
+        else:
+            self.whitelist_view.reload()  # Pages through query_apps
+            self.blacklist_view.reload()
         
+        self.connection_list.refresh()
+        self._update_status()
+    
+    def _update_app_lists(self, app_paths: List[str]):
+        """Move the given apps' cards to the tabs matching their registry state."""
+        for view, is_member in ((self.whitelist_view, self.app_registry.is_whitelisted),
+                                (self.blacklist_view, self.app_registry.is_blacklisted)):
+            members = [app_path for app_path in app_paths if is_member(app_path)]
+            view.update_apps(add=members, remove=[app_path for app_path in app_paths if not is_member(app_path)])
+        
+        self.connection_list.refresh()
         self._update_status()
     
     def _handle_list_action(self, action: str, app_path: str):
@@ -901,25 +1449,21 @@ for i in range(10):
         if action == "move_to_whitelist":
             self.app_registry.add_to_whitelist(app_path)
             # Remove block rule
-            self.fw_manager.remove_rule(app_path)
-            self._load_lists()
+            self.firewall.unblock(app_path)
         
         elif action == "move_to_blacklist":
             self.app_registry.add_to_blacklist(app_path)
-            # Add block rule
-            success, msg = self.fw_manager.add_block_rule(app_path)
-            if not success:
-                messagebox.showerror("Error", msg)
-            self._load_lists()
+            # Add block rule (errors are shown once the worker is done)
+            self.firewall.block(app_path).add_done_callback(self._on_firewall_result)
         
         elif action == "forget":
             self.app_registry.forget_app(app_path)
             # Remove block rule
-            self.fw_manager.remove_rule(app_path)
+            self.firewall.unblock(app_path)
             # Clear from monitor's seen apps so it can be detected again
-            if app_path in self.monitor.seen_apps:
-                self.monitor.seen_apps.remove(app_path)
-            self._load_lists()
+            self.monitor.forget_app(app_path)
+        
+        self._update_app_lists([app_path])
     
     def _browse_application(self):
         """Browse for executable to block."""
@@ -946,9 +1490,15 @@ for i in range(10):
         self.app_registry.add_to_whitelist(app_path)
         
         # Remove block rule if exists
-        self.fw_manager.remove_rule(app_path)
+        self.firewall.unblock(app_path)
         
-        self._load_lists()
+        self._update_app_lists([app_path])
+    
+    def _allow_apps(self, app_paths: List[str]):
+        """Allow several applications with one registry save and firewall pass."""
+        self.app_registry.add_many_to_whitelist(app_paths)
+        self.firewall.apply(unblock=app_paths)
+        self._update_app_lists(app_paths)
     
     def _block_app(self, app_path: str):
         """Block an application (with user feedback)."""
@@ -959,87 +1509,79 @@ for i in range(10):
             return
         
         self.app_registry.add_to_blacklist(app_path)
-        success, message = self.fw_manager.add_block_rule(app_path)
-        
-        if not success:
-            messagebox.showerror("Error", message)
-        else:
-            messagebox.showinfo("Success", f"{os.path.basename(app_path)} blocked")
+        self.firewall.block(app_path).add_done_callback(
+            partial(self._on_firewall_result, success_message=f"{os.path.basename(app_path)} blocked"))
         
-        self._load_lists()
+        self._update_app_lists([app_path])
     
-    def _block_app_silent(self, app_path: str):
-        """Block an application silently (no messagebox, for auto-blocking)."""
-        # Safety check
-        is_safe, reason = is_safe_to_block(app_path=app_path)
-        if not is_safe:
+    def _block_apps_silent(self, app_paths: List[str]):
+        """Block several applications silently with one registry save and firewall pass."""
+        safe_paths = [p for p in app_paths if is_safe_to_block(app_path=p)[0]]
+        if not safe_paths:
             return
         
-        self.app_registry.add_to_blacklist(app_path)
-        self.fw_manager.add_block_rule(app_path)
-        self._load_lists()
+        self.app_registry.add_many_to_blacklist(safe_paths)
+        self.firewall.apply(block=safe_paths)
+        self._update_app_lists(safe_paths)
     
     def _confirm_block_app(self, app_path: str):
         """Confirm block for already-blocked app (just marks as known, no new rule)."""
         # App is already blocked, just ensure it's in blacklist
         if not self.app_registry.is_blacklisted(app_path):
             self.app_registry.add_to_blacklist(app_path)
-            self._load_lists()
+            self._update_app_lists([app_path])
     
-    def _on_new_app_detected(self, app_path: str):
-        """Handle new application detection."""
-        # Don't notify if already known
-        if self.app_registry.is_known(app_path):
-            return
-        
-        # Safety check - don't notify for system apps
-        is_safe, _ = is_safe_to_block(app_path=app_path)
-        if not is_safe:
+    def _confirm_block_apps(self, app_paths: List[str]):
+        """Confirm block for several already-blocked apps."""
+        missing = [p for p in app_paths if not self.app_registry.is_blacklisted(p)]
+        if missing:
+            self.app_registry.add_many_to_blacklist(missing)
+            self._update_app_lists(missing)
+    
+    def _on_new_apps_detected(self, app_paths: List[str]):
+        """Auto-block a batch of newly detected apps (monitor thread): one registry write, one firewall pass."""
+        mark_seen = getattr(self.app_registry, 'mark_seen_many', None)
+        if mark_seen:
+            mark_seen(app_paths)  # First-seen times (backends that keep them)
+        app_paths = triage_new_apps(app_paths, self.app_registry.is_known)
+        if not app_paths:
             return
         
-        # Block immediately by default (silently, no messagebox)
-        self._block_app_silent(app_path)
+        self.app_registry.add_many_to_blacklist(app_paths)
+        # Never waits for queue room (may run on any thread); the reconciler catches up on refusals
+        self.firewall.apply(block=app_paths)
         
-        # Show notification if enabled
-        if self.app_registry.get_setting('enable_notifications'):
-            # Show in main thread
-            self.root.after(0, lambda: self._add_to_new_apps_dialog(app_path))
+        # Tabs and dialog are updated by the main loop
+        notify = self.app_registry.get_setting('enable_notifications')
+        for app_path in app_paths:
+            self.ui_updates.add('app_lists', app_path)
+            if notify:
+                self.ui_updates.add('new_apps', app_path)
+    
+    def _show_new_apps(self, app_paths: List[str]):
+        """Add queued new apps to the dialog, skipping ones decided meanwhile (main thread)."""
+        app_paths = [app_path for app_path in app_paths
+                     if self.app_registry.is_blacklisted(app_path)]  # Allowed/forgotten since = stale
+        if app_paths:
+            self._add_to_new_apps_dialog(app_paths)
     
     def _check_unknown_apps_on_startup(self):
         """Check for unknown apps with active connections on startup."""
         if not self.app_registry.get_setting('enable_notifications'):
             return
         
-        # Get current connections
-        connections = self.monitor.get_current_connections()
-        unknown_apps = set()
-        
-        for conn in connections:
-            # Skip if already known
-            if self.app_registry.is_known(conn.process_path):
-                continue
-            
-            # Skip if not safe to block (system apps)
-            is_safe, _ = is_safe_to_block(app_path=conn.process_path)
-            if not is_safe:
-                continue
-            
-            # Skip if already blocked
-            if self.app_registry.is_blacklisted(conn.process_path):
-                continue
-            
-            unknown_apps.add(conn.process_path)
+        # Unknown, safe-to-block apps with current connections (last scan; no fetch on the Tk thread)
+        connections = self.monitor.get_snapshot().connections
+        unknown_apps = triage_new_apps((conn.process_path for conn in connections), self.app_registry.is_known)
         
         # Show dialog for unknown apps
         if unknown_apps:
-            for app_path in unknown_apps:
-                # Block immediately (silently)
-                self._block_app_silent(app_path)
-                # Add to dialog
-                self._add_to_new_apps_dialog(app_path)
-    
-    def _add_to_new_apps_dialog(self, app_path: str):
-        """Add app to new apps dialog (or create dialog if needed)."""
+            # Block immediately (silently) in one batch
+            self._block_apps_silent(unknown_apps)
+            self._add_to_new_apps_dialog(unknown_apps)
+    
+    def _add_to_new_apps_dialog(self, app_paths: List[str]):
+        """Add apps to new apps dialog (or create dialog if needed)."""
         ui_font_size = self.app_registry.get_setting('ui_font_size')
         
         # Create dialog if doesn't exist or was destroyed
@@ -1050,12 +1592,14 @@ for i in range(10):
                 self._confirm_block_app,  # Use confirm instead of block (app already blocked)
                 self._copy_app_info,
                 self._on_dialog_hidden,  # Callback when dialog is hidden
-                ui_font_size
+                ui_font_size,
+                on_allow_many=self._allow_apps,
+                on_block_many=self._confirm_block_apps
             )
             self.dialog_minimized = False
         
-        # Add app to dialog
-        self.new_apps_dialog.add_app(app_path)
+        # Add apps to dialog (one count/layout update)
+        self.new_apps_dialog.add_apps(app_paths)
         
         # Only show/bring to front if dialog isn't minimized
         if not self.dialog_minimized:
@@ -1078,114 +1622,139 @@ for i in range(10):
             "Emergency Reset",
             "This will:\n"
             "• Remove ALL firewall rules created by this app\n"
-            "• Clear whitelist and blacklist\n\n"
+            "• Clear whitelist and blacklist\n"
+            "  (both are backed up - undo with 'emergency_reset.py restore')\n\n"
             "Are you sure?"
         )
         
         if result:
-            count, errors = emergency_reset()
-            
-            # Clear lists
-            self.app_registry.whitelist.clear()
-            self.app_registry.blacklist.clear()
-            self.app_registry._save_settings()
-            
-            if errors:
-                messagebox.showerror("Reset Completed with Errors", 
-                                   f"Removed {count} rules.\n\nErrors:\n" + "\n".join(errors))
-            else:
-                messagebox.showinfo("Reset Complete", f"Successfully removed {count} rules and cleared all lists.")
-            
-            self._load_lists()
+            # Back up and clear lists and rules on the firewall thread; the result is shown by the main loop
+            self.firewall.submit(self._reset_rules).add_done_callback(
+                lambda future: self.ui_updates.set_latest('reset', future))
+    
+    def _reset_rules(self):
+        """Back up and remove all app rules, then anything the reset missed (firewall thread)."""
+        engine = ResetEngine(self.firewall.manager.fw_policy, registry=self.app_registry)
+        result = engine.reset(progress=lambda done, total: self.ui_updates.set_latest('reset_progress', (done, total)))
+        self.reconciler.reconcile(force=True)
+        return result
+    
+    def _on_reset_progress(self, progress: tuple):
+        """Show emergency reset progress in the status bar (main thread)."""
+        done, total = progress
+        self.status_label.configure(text=f"Status: Removing rules... {done}/{total}")
+    
+    def _on_reset_done(self, future):
+        """Report the emergency reset result (main thread)."""
+        self._load_lists()
+        self._update_status()
+        try:
+            result = future.result()
+            count, errors, backup_file = result.count, result.errors, result.backup_file
+        except Exception as e:
+            count, errors, backup_file = 0, [f"Emergency reset failed: {str(e) or type(e).__name__}"], None
+        
+        backup_note = f"\n\nBackup: {backup_file}" if backup_file else ""
+        if errors:
+            messagebox.showerror("Reset Completed with Errors", 
+                               f"Removed {count} rules.{backup_note}\n\nErrors:\n" + "\n".join(errors))
+        else:
+            messagebox.showinfo("Reset Complete", f"Successfully removed {count} rules and cleared all lists.{backup_note}")
+    
+    def _on_firewall_result(self, future, success_message: str = None):
+        """Queue the outcome of a rule change for the main loop (firewall thread)."""
+        if future.cancelled():
+            return  # Superseded by a later decision for the same app
+        try:
+            success, message = future.result()
+        except queue.Full:
+            success, message = False, "Firewall is busy - the rule will be applied by the next rule check"
+        if not success:
+            self.ui_updates.add('firewall_results', ("Error", message))
+        elif success_message:
+            self.ui_updates.add('firewall_results', ("Success", success_message))
+    
+    def _show_firewall_results(self, results: List[tuple]):
+        """Show errors/confirmations of finished rule changes (main thread)."""
+        for title, show in (("Error", messagebox.showerror), ("Success", messagebox.showinfo)):
+            messages = [message for kind, message in results if kind == title]
+            if messages:
+                show(title, "\n".join(messages))
+    
+    def _reconcile_rules(self):
+        """Queue a rule check on the firewall thread (unless one is pending), then re-arm."""
+        try:
+            if self.reconcile_future is None or self.reconcile_future.done():
+                self.reconcile_future = self.firewall.submit(self.reconciler.reconcile)
+        finally:
+            self.root.after(RECONCILE_INTERVAL, self._reconcile_rules)
+    
+    def _pump_ui_updates(self):
+        """Apply queued background updates within the frame budget, then re-arm (main thread)."""
+        try:
+            self.ui_updates.dispatch({
+                'connections': self._on_connection_snapshot,
+                'app_lists': self._update_app_lists,
+                'new_apps': self._show_new_apps,
+                'firewall_results': self._show_firewall_results,
+                'reset_progress': self._on_reset_progress,
+                'reset': self._on_reset_done,
+            })
+        finally:
+            self.root.after(UI_UPDATE_INTERVAL, self._pump_ui_updates)
+    
+    def _on_connections_changed(self):
+        """Callback when a connection update is queued (monitor thread)."""
+        for snapshot in self.connection_updates.drain():
+            self.ui_updates.set_latest('connections', snapshot, merge=lambda pending, new: new.merged_after(pending))
+    
+    def _on_connection_snapshot(self, snapshot):
+        """Apply the latest (merged) connection update, then redraw once (must run in main thread)."""
+        self._apply_connections_delta(snapshot.delta)
+        self._refresh_connections_display()
     
-    def _on_connections_update(self, connections: List[Connection]):
-        """Callback when connections are updated."""
-        self.root.after(0, lambda: self._update_connections_display(connections))
+    def _apply_connections_delta(self, delta: ConnectionDelta):
+        """Apply connection changes to the local table (must run in main thread)."""
+        for conn in delta.closed:
+            key = connection_key(conn)
+            self.connection_table.pop(key, None)
+            self.connection_index.discard(key)
+        for conn in delta.opened + delta.changed:
+            key = connection_key(conn)
+            self.connection_table[key] = conn
+            self.connection_index.add(key, conn.process_name, conn.process_path, conn.remote_addr, conn.remote_port)
     
-    def _update_connections_display(self, connections: List[Connection]):
+    def _on_connection_search(self, query: str):
+        """Filter the connections list (debounced search box)."""
+        self.connection_query = query
+        self.connection_list.model.scroll_to(0)
+        self._refresh_connections_display()
+    
+    def _refresh_connections_display(self):
+        """Show the local connection table (only matching rows while searching)."""
+        matches = self.connection_index.search(self.connection_query)
+        if matches is None:
+            connections = list(self.connection_table.values())
+        else:
+            connections = [conn for key, conn in self.connection_table.items() if key in matches]
+        self._update_connections_display(connections, len(self.connection_table))
+    
+    def _on_tab_changed(self):
+        """Refresh connections when their tab becomes visible."""
+        if self.tabview.get() == "Connections":
+            self._refresh_connections_display()
+    
+    def _update_connections_display(self, connections: List[Connection], total: int = None):
         """Update connections display (must run in main thread)."""
         # Always update status
-        self._update_status(len(connections))
+        self._update_status(len(connections) if total is None else total)
         
-        # Only update display if connections tab is active (reduces flickering)
+        # Only update display if connections tab is active
         if self.tabview.get() != "Connections":
             return
         
-        # Create snapshot for comparison
-        max_display = self.app_registry.get_setting('max_connections_display')
-        current_snapshot = [(c.pid, c.remote_addr, c.remote_port) for c in connections[:max_display]]
-        
-        # Only rebuild if connections changed
-        if current_snapshot != self.last_connections_snapshot:
-            self.last_connections_snapshot = current_snapshot
-            
-            for widget in self.connections_container.winfo_children():
-                try:
-                    widget.after_idle(widget.destroy)
-                except:
-                    pass
-            self.connection_rows.clear()
-            
-            # Show connections based on settings
-            max_display = self.app_registry.get_setting('max_connections_display')
-            process_font_size = self.app_registry.get_setting('process_font_size')
-            
-            for conn in connections[:max_display]:
-                is_blocked = self.app_registry.is_blacklisted(conn.process_path)
-                
-                # Create connection card
-                card = ctk.CTkFrame(self.connections_container, fg_color=COLORS['bg_medium'], corner_radius=4)
-                card.pack(fill="x", pady=2, padx=5)
-                
-                # Left side - connection info
-                left_frame = ctk.CTkFrame(card, fg_color="transparent")
-                left_frame.pack(side="left", fill="both", expand=True, padx=10, pady=5)
-                
-                status_icon = "🔴" if is_blocked else "🟢"
-                info_text = f"{status_icon} {conn.process_name} → {conn.remote_addr}:{conn.remote_port}"
-                
-                ctk.CTkLabel(
-                    left_frame,
-                    text=info_text,
-                    font=("Segoe UI", process_font_size, "bold"),
-                    text_color=COLORS['text_primary'],
-                    anchor="w"
-                ).pack(fill="x")
-                
-                ctk.CTkLabel(
-                    left_frame,
-                    text=conn.process_path,
-                    font=("Segoe UI", 9),
-                    text_color=COLORS['text_secondary'],
-                    anchor="w"
-                ).pack(fill="x")
-                
-                # Right side - buttons and status
-                right_frame = ctk.CTkFrame(card, fg_color="transparent")
-                right_frame.pack(side="right", padx=10, pady=5)
-                
-                # Copy button
-                ctk.CTkButton(
-                    right_frame,
-                    text="📋",
-                    width=30,
-                    height=25,
-                    fg_color=COLORS['bg_light'],
-                    hover_color=COLORS['accent_blue'],
-                    font=("Segoe UI", 12),
-                    command=lambda c=conn: self._copy_process_info(c)
-                ).pack(side="left", padx=3)
-                
-                # Status label
-                status_text = "BLOCKED" if is_blocked else "ALLOWED"
-                ctk.CTkLabel(
-                    right_frame,
-                    text=status_text,
-                    font=("Segoe UI", 9, "bold"),
-                    text_color=COLORS['danger'] if is_blocked else COLORS['success']
-                ).pack(side="left", padx=5)
-                
-                self.connection_rows.append(card)
+        # Virtualized: only rows in view are redrawn, and only if their content changed
+        self.connection_list.set_connections(connections)
     
     def _copy_process_info(self, conn: Connection):
         """Copy process info to clipboard."""
@@ -1232,12 +1801,16 @@ for i in range(10):
         else:
             self.pending_btn.pack_forget()
     
-    def _update_status(self, conn_count: int = 0):
+    def _update_status(self, conn_count: int = None):
         """Update status bar."""
-        allowed_count = len(self.app_registry.whitelist)
-        blocked_count = len(self.app_registry.blacklist)
+        if conn_count is None:
+            conn_count = len(self.connection_table)
+        allowed_count = self.app_registry.count_apps('whitelist')
+        blocked_count = self.app_registry.count_apps('blacklist')
+        pending = self.firewall.depth()
+        firewall_status = f" | Firewall queue: {pending}" if pending else ""
         self.status_label.configure(
-            text=f"Status: ✅ Protected | Allowed: {allowed_count} | Blocked: {blocked_count} | Connections: {conn_count}"
+            text=f"Status: ✅ Protected | Allowed: {allowed_count} | Blocked: {blocked_count} | Connections: {conn_count}{firewall_status}"
         )
     
     def run(self):
@@ -1247,3 +1820,5 @@ for i in range(10):
         if self.tray_icon:
             self.tray_icon.stop()
         self.monitor.stop()
+        self.firewall.stop()
+        self.app_registry.close()
@@ -4,12 +4,22 @@ Network Monitor - Track active connections and map to processes
 import psutil
 import threading
 import time
-from typing import List, Dict, Callable
-from dataclasses import dataclass
+from collections import deque
+from typing import List, Dict, Callable, Iterable, Optional, Sequence
+from dataclasses import dataclass, field
+from process_cache import ProcessInfoCache
+from process_resolver import ProcessResolver
+from connection_sources import PollingConnectionSource, create_connection_source
+from poll_scheduler import AdaptiveScheduler
+from connection_table import ConnectionTable, ConnectionView
+from config import COLUMNAR_SNAPSHOT_THRESHOLD, CONNECTION_QUEUE_SIZE
 
 @dataclass
 class Connection:
     """Represents an active network connection."""
+    __slots__ = ('process_name', 'process_path', 'pid', 'local_addr', 'local_port',
+                 'remote_addr', 'remote_port', 'status', 'protocol')
+    
     process_name: str
     process_path: str
     pid: int
@@ -20,25 +30,253 @@ class Connection:
     status: str
     protocol: str
 
+@dataclass
+class ConnectionDelta:
+    """Changes between two consecutive connection snapshots."""
+    opened: List[Connection] = field(default_factory=list)
+    closed: List[Connection] = field(default_factory=list)
+    changed: List[Connection] = field(default_factory=list)  # Same key, new state/process info
+    total: int = 0  # Connections in the new snapshot
+    
+    @property
+    def empty(self) -> bool:
+        """True if nothing changed."""
+        return not (self.opened or self.closed or self.changed)
+
+def as_connection(conn) -> Connection:
+    """Copy a table row view into a standalone Connection (no-op for Connections)."""
+    if isinstance(conn, ConnectionView):
+        return Connection(*conn.astuple())
+    return conn
+
+def connection_key(conn: Connection) -> tuple:
+    """Identity of a connection across snapshots."""
+    return (conn.pid, conn.protocol, conn.local_addr, conn.local_port, conn.remote_addr, conn.remote_port)
+
+def diff_connections(previous: Dict[tuple, Connection], connections: List[Connection]) -> tuple[Dict[tuple, Connection], ConnectionDelta]:
+    """
+    Compare a new snapshot against the previous keyed connection table.
+    
+    Args:
+        previous: Table from the last call (connection_key -> Connection)
+        connections: New snapshot
+        
+    Returns:
+        (new table, delta)
+    """
+    current = {}
+    delta = ConnectionDelta()
+    
+    for conn in connections:
+        key = connection_key(conn)
+        current[key] = conn
+        old = previous.get(key)
+        if old is None:
+            delta.opened.append(conn)
+        elif old != conn:
+            delta.changed.append(conn)
+    
+    if len(previous) > len(current) - len(delta.opened):
+        delta.closed = [conn for key, conn in previous.items() if key not in current]
+    delta.total = len(current)
+    
+    return current, delta
+
+def merge_deltas(older: ConnectionDelta, newer: ConnectionDelta) -> ConnectionDelta:
+    """
+    Combine two consecutive deltas into one (older applied first).
+    
+    A connection opened and closed in between disappears; closed and
+    reopened becomes changed; opened then changed stays opened.
+    """
+    state = {}  # connection_key -> (kind, Connection)
+    for kind, conns in (('opened', older.opened), ('closed', older.closed), ('changed', older.changed)):
+        for conn in conns:
+            state[connection_key(conn)] = (kind, conn)
+    
+    for conn in newer.opened:
+        key = connection_key(conn)
+        previous = state.get(key)
+        state[key] = ('changed' if previous and previous[0] == 'closed' else 'opened', conn)
+    for conn in newer.changed:
+        key = connection_key(conn)
+        previous = state.get(key)
+        state[key] = ('opened' if previous and previous[0] == 'opened' else 'changed', conn)
+    for conn in newer.closed:
+        key = connection_key(conn)
+        previous = state.get(key)
+        if previous and previous[0] == 'opened':
+            del state[key]
+        else:
+            state[key] = ('closed', conn)
+    
+    merged = ConnectionDelta(total=newer.total)
+    for kind, conn in state.values():
+        getattr(merged, kind).append(conn)
+    return merged
+
+@dataclass(frozen=True)
+class ConnectionSnapshot:
+    """
+    One published monitor tick. Never modified after publication.
+    
+    connections is a tuple or ConnectionTable; delta holds the changes
+    since the previous published version (merged if updates were coalesced).
+    """
+    version: int
+    connections: Sequence
+    delta: ConnectionDelta
+    timestamp: float
+    
+    def merged_after(self, older: 'ConnectionSnapshot') -> 'ConnectionSnapshot':
+        """This snapshot with its delta extended back to cover older's."""
+        return ConnectionSnapshot(self.version, self.connections, merge_deltas(older.delta, self.delta), self.timestamp)
+
+EMPTY_SNAPSHOT = ConnectionSnapshot(0, (), ConnectionDelta(), 0.0)
+
+class Subscription:
+    """
+    Bounded queue of snapshots for one consumer.
+    
+    When the queue is full, the newest queued snapshot is replaced by the
+    incoming one with the deltas merged, so a slow consumer gets fewer,
+    larger updates instead of a growing backlog. notify() is called only
+    when the queue goes from empty to non-empty, so consumers can schedule
+    a single drain (e.g. one root.after) per batch.
+    """
+    
+    def __init__(self, maxsize: int = CONNECTION_QUEUE_SIZE, notify: Callable[[], None] = None,
+                 changes_only: bool = True):
+        self.maxsize = max(1, maxsize)
+        self.notify = notify
+        self.changes_only = changes_only  # Skip ticks where nothing changed
+        self.coalesced = 0  # Updates merged into a queued one
+        self.closed = False
+        self._items: deque = deque()
+        self._ready = threading.Condition(threading.Lock())
+    
+    def put(self, snapshot: ConnectionSnapshot):
+        """Queue a snapshot (monitor thread)."""
+        if self.changes_only and snapshot.delta.empty:
+            return
+        with self._ready:
+            if self.closed:
+                return
+            was_empty = not self._items
+            if len(self._items) >= self.maxsize:
+                snapshot = snapshot.merged_after(self._items.pop())
+                self.coalesced += 1
+            self._items.append(snapshot)
+            self._ready.notify()
+        if was_empty and self.notify:
+            self.notify()
+    
+    def get(self, timeout: float = None) -> Optional[ConnectionSnapshot]:
+        """Get the next snapshot, waiting up to timeout (None if none/closed)."""
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            return self._items.popleft() if self._items else None
+    
+    def drain(self) -> List[ConnectionSnapshot]:
+        """Get all queued snapshots without waiting."""
+        with self._ready:
+            items = list(self._items)
+            self._items.clear()
+            return items
+    
+    def close(self):
+        """Stop receiving snapshots and release waiting consumers."""
+        with self._ready:
+            self.closed = True
+            self._items.clear()
+            self._ready.notify_all()
+    
+    def __len__(self) -> int:
+        with self._ready:
+            return len(self._items)
+
 class NetworkMonitor:
-    """Monitor network connections in background thread."""
+    """
+    Monitor network connections in background thread.
+    
+    Each tick is published as an immutable ConnectionSnapshot by swapping a
+    single reference, so other threads can read get_snapshot() without
+    locking; subscribe() gives consumers their own bounded update queue.
+    """
     
     def __init__(self, update_callback: Callable[[List[Connection]], None] = None, 
                  new_app_callback: Callable[[str], None] = None,
-                 update_interval: float = 2.0):
+                 update_interval: float = 2.0,
+                 delta_callback: Callable[[ConnectionDelta], None] = None,
+                 source: PollingConnectionSource = None,
+                 columnar_threshold: int = COLUMNAR_SNAPSHOT_THRESHOLD,
+                 new_apps_callback: Callable[[List[str]], None] = None):
         self.update_callback = update_callback
-        self.new_app_callback = new_app_callback
+        self.new_app_callback = new_app_callback  # Called per app
+        self.new_apps_callback = new_apps_callback  # Called once per tick with all new apps (sorted)
+        self.delta_callback = delta_callback  # Called only when something changed
         self.running = False
         self.thread = None
-        self.connections = []
-        self.update_interval = update_interval  # seconds
-        self.seen_apps: set = set()  # Track apps we've seen
+        self.connection_table: Dict[tuple, Connection] = {}  # connection_key -> Connection (monitor thread only)
+        self._snapshot = EMPTY_SNAPSHOT
+        self._subscribers: tuple = ()  # Replaced, never mutated (copy-on-write)
+        self._subscribers_lock = threading.Lock()
+        self.scheduler = AdaptiveScheduler(update_interval)
+        self._seen_apps: set = set()  # Track apps we've seen
+        self._seen_lock = threading.Lock()
+        self._new_apps_seen = 0  # Running count, for the scheduler
+        self.process_cache = ProcessInfoCache()  # Survives across ticks
+        self.resolver = ProcessResolver(self.process_cache)  # Misses resolved on worker threads
+        self.source = source  # None = pick best available on start()
+        self._fetch_lock = threading.Lock()  # Sources and their socket indexes aren't thread-safe
+        self.columnar_threshold = columnar_threshold  # Snapshot size stored as ConnectionTable (0 = never)
+    
+    @property
+    def connections(self) -> Sequence:
+        """Connections of the latest published snapshot."""
+        return self._snapshot.connections
+    
+    @property
+    def seen_apps(self) -> set:
+        """Copy of the apps seen so far."""
+        with self._seen_lock:
+            return set(self._seen_apps)
+    
+    def forget_app(self, app_path: str):
+        """Forget an app so its next connection is reported as new again."""
+        with self._seen_lock:
+            self._seen_apps.discard(app_path)
+    
+    def _mark_seen(self, app_paths: Iterable[str]) -> set:
+        """Record apps as seen; returns the ones that weren't seen before."""
+        with self._seen_lock:
+            new_apps = set(app_paths) - self._seen_apps
+            self._seen_apps |= new_apps
+            self._new_apps_seen += len(new_apps)
+            return new_apps
+    
+    @property
+    def update_interval(self) -> float:
+        """Base scan interval in seconds (the scheduler adapts around it)."""
+        return self.scheduler.base_interval
+    
+    @update_interval.setter
+    def update_interval(self, value: float):
+        self.scheduler.set_base_interval(value)
     
     def start(self):
         """Start monitoring in background thread."""
         if self.running:
             return
         
+        if self.source is None:
+            self.source = create_connection_source()
+        else:
+            self.source.start()
+        if self.resolver.closed:
+            self.resolver = ProcessResolver(self.process_cache)  # Shut down by stop()
+        
         self.running = True
         self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.thread.start()
@@ -46,88 +284,184 @@ class NetworkMonitor:
     def stop(self):
         """Stop monitoring."""
         self.running = False
+        if self.source:
+            self.source.stop()  # Also releases a loop waiting for the next scan
         if self.thread:
             self.thread.join(timeout=2)
+        self.resolver.shutdown()
     
     def get_connections(self) -> List[Connection]:
         """Get current list of connections."""
-        return self.connections.copy()
+        return list(self._snapshot.connections)
+    
+    def get_snapshot(self) -> ConnectionSnapshot:
+        """Get the latest published snapshot."""
+        return self._snapshot
+    
+    def subscribe(self, maxsize: int = CONNECTION_QUEUE_SIZE, notify: Callable[[], None] = None,
+                  changes_only: bool = True) -> Subscription:
+        """
+        Register a consumer of snapshots.
+        
+        Args:
+            maxsize: Queued updates before new ones are coalesced
+            notify: Called (monitor thread) when the queue becomes non-empty
+            changes_only: Only queue ticks where something changed
+        """
+        subscription = Subscription(maxsize, notify, changes_only)
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a consumer and release anyone waiting on it."""
+        subscription.close()
+        with self._subscribers_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+    
+    def _publish(self, connections: Sequence, delta: ConnectionDelta) -> ConnectionSnapshot:
+        """Publish a tick to readers and subscribers (monitor thread)."""
+        if isinstance(connections, list):
+            connections = tuple(connections)
+        snapshot = ConnectionSnapshot(self._snapshot.version + 1, connections, delta, time.time())
+        self._snapshot = snapshot  # Single reference swap: readers see old or new, never partial
+        for subscription in self._subscribers:
+            subscription.put(snapshot)
+        return snapshot
+    
+    def set_visible(self, visible: bool):
+        """Tell the monitor whether the UI is visible (hidden = slower scans)."""
+        self.scheduler.set_visible(visible)
+        if visible and self.source:
+            self.source.wake()  # Fresh data for the window being shown
+    
+    def get_metrics(self) -> dict:
+        """Get scan timing metrics."""
+        return self.scheduler.metrics()
     
     def get_current_connections(self) -> List[Connection]:
-        """Fetch current connections immediately (not from cache)."""
+        """
+        Fetch current connections immediately (not from cache).
+        
+        Waits for a scan in progress on the monitor thread, and new app
+        callbacks run on the calling thread. Readers that can use the last
+        scan should call get_snapshot() instead.
+        """
         return self._fetch_connections()
     
     def _monitor_loop(self):
         """Main monitoring loop."""
+        deadline = time.monotonic()
         while self.running:
+            started = time.monotonic()
+            churn = 0
+            new_apps_before = self._new_apps_seen
             try:
-                self.connections = self._fetch_connections()
+                connections = self._fetch_connections()
+                self.connection_table, delta = diff_connections(self.connection_table, connections)
+                churn = len(delta.opened) + len(delta.closed)
+                if isinstance(connections, ConnectionTable):
+                    # Deltas outlive this snapshot; don't let them pin its arrays
+                    delta.opened = [as_connection(c) for c in delta.opened]
+                    delta.closed = [as_connection(c) for c in delta.closed]
+                    delta.changed = [as_connection(c) for c in delta.changed]
+                self._publish(connections, delta)
                 
                 if self.update_callback:
-                    self.update_callback(self.connections)
+                    self.update_callback(connections)
+                
+                if self.delta_callback and not delta.empty:
+                    self.delta_callback(delta)
                 
             except Exception as e:
                 print(f"Monitor error: {e}")
             
-            time.sleep(self.update_interval)
+            now = time.monotonic()
+            self.scheduler.record_scan(churn, self._new_apps_seen - new_apps_before, now - started)
+            deadline = self.scheduler.next_deadline(deadline, now)
+            
+            # Wait until the deadline (not a fixed sleep after work, so scans don't drift)
+            timeout = max(0.0, deadline - now)
+            if self.source:
+                woken = self.source.wait(timeout)
+            else:
+                time.sleep(timeout)
+                woken = False
+            
+            now = time.monotonic()
+            self.scheduler.record_wait(deadline, now, woken)
+            if woken and now < deadline:
+                deadline = now  # Event-triggered scan; schedule from here
     
     def _fetch_connections(self) -> List[Connection]:
-        """Fetch current network connections."""
+        """
+        Fetch current network connections.
+        
+        Returns a list of Connection, or a ConnectionTable (same read API)
+        for snapshots of columnar_threshold sockets or more.
+        """
+        with self._fetch_lock:
+            return self._fetch_connections_locked()
+    
+    def _fetch_connections_locked(self) -> List[Connection]:
+        """Fetch current network connections (fetch lock held)."""
         connections = []
-        new_apps = set()
         
         try:
             # Get all network connections
-            net_connections = psutil.net_connections(kind='inet')
+            if self.source:
+                net_connections = self.source.fetch()
+            else:
+                net_connections = psutil.net_connections(kind='inet')
+            
+            net_connections = [conn for conn in net_connections
+                               if conn.status != 'NONE' and conn.raddr and conn.pid]
             
-            # Map PIDs to process info
-            process_cache = {}
+            columnar = 0 < self.columnar_threshold <= len(net_connections)
+            if columnar:
+                connections = ConnectionTable()
+            
+            # Map PIDs to process info (cache hits, plus new PIDs resolved within the time budget;
+            # the rest show as pending and are filled in by a later delta)
+            process_info = self.resolver.resolve_many({conn.pid for conn in net_connections})
+            app_paths = {info['path'] for info in process_info.values() if info['path']}
             
             for conn in net_connections:
-                if conn.status == 'NONE' or not conn.raddr:
-                    continue
-                
                 pid = conn.pid
-                if not pid:
-                    continue
+                proc_info = process_info[pid]
                 
-                # Get process info (cached)
-                if pid not in process_cache:
-                    try:
-                        proc = psutil.Process(pid)
-                        process_cache[pid] = {
-                            'name': proc.name(),
-                            'path': proc.exe()
-                        }
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        process_cache[pid] = {
-                            'name': 'Unknown',
-                            'path': ''
-                        }
+                local_addr = conn.laddr.ip if conn.laddr else ''
+                local_port = conn.laddr.port if conn.laddr else 0
+                remote_addr = conn.raddr.ip if conn.raddr else ''
+                remote_port = conn.raddr.port if conn.raddr else 0
+                protocol = 'TCP' if conn.type == 1 else 'UDP'
                 
-                proc_info = process_cache[pid]
-                
-                # Track new apps
-                if proc_info['path'] and proc_info['path'] not in self.seen_apps:
-                    new_apps.add(proc_info['path'])
-                    self.seen_apps.add(proc_info['path'])
-                
-                connections.append(Connection(
-                    process_name=proc_info['name'],
-                    process_path=proc_info['path'],
-                    pid=pid,
-                    local_addr=conn.laddr.ip if conn.laddr else '',
-                    local_port=conn.laddr.port if conn.laddr else 0,
-                    remote_addr=conn.raddr.ip if conn.raddr else '',
-                    remote_port=conn.raddr.port if conn.raddr else 0,
-                    status=conn.status,
-                    protocol='TCP' if conn.type == 1 else 'UDP'
-                ))
+                if columnar:
+                    connections.append(proc_info['name'], proc_info['path'], pid, local_addr, local_port,
+                                       remote_addr, remote_port, conn.status, protocol)
+                else:
+                    connections.append(Connection(
+                        process_name=proc_info['name'],
+                        process_path=proc_info['path'],
+                        pid=pid,
+                        local_addr=local_addr,
+                        local_port=local_port,
+                        remote_addr=remote_addr,
+                        remote_port=remote_port,
+                        status=conn.status,
+                        protocol=protocol
+                    ))
+            
+            # Track new apps (one locked update per tick)
+            new_apps = self._mark_seen(app_paths)
             
             # Notify about new apps
-            if self.new_app_callback and new_apps:
-                for app_path in new_apps:
-                    self.new_app_callback(app_path)
+            if new_apps:
+                if self.new_apps_callback:
+                    self.new_apps_callback(sorted(new_apps))
+                if self.new_app_callback:
+                    for app_path in new_apps:
+                        self.new_app_callback(app_path)
         
         except Exception as e:
             print(f"Error fetching connections: {e}")
@@ -0,0 +1,54 @@
+"""
+Path helpers - Canonical form of Windows application paths for lookups
+"""
+import ntpath
+import sys
+from functools import lru_cache
+
+LONG_PATH_PREFIX = "\\\\?\\"
+LONG_UNC_PREFIX = "\\\\?\\UNC\\"
+
+@lru_cache(maxsize=65536)
+def normalize_path(app_path: str) -> str:
+    """
+    Get canonical, case-folded form of an application path.
+    
+    Handles '/' vs '\\', redundant separators and '..' segments,
+    '\\\\?\\' (and '\\\\?\\UNC\\') prefixes and 8.3 short names (Windows only,
+    for existing files). Results are cached, so repeated lookups of the
+    same path don't allocate.
+    
+    Args:
+        app_path: Path as reported by psutil, the firewall or the user
+        
+    Returns:
+        Normalized key suitable for dict/set membership
+    """
+    if not app_path:
+        return ""
+    
+    path = app_path.strip().replace('/', '\\')
+    
+    if path.startswith(LONG_UNC_PREFIX):
+        path = "\\\\" + path[len(LONG_UNC_PREFIX):]
+    elif path.startswith(LONG_PATH_PREFIX):
+        path = path[len(LONG_PATH_PREFIX):]
+    
+    if '~' in path:
+        path = _expand_short_name(path)
+    
+    return ntpath.normpath(path).casefold()
+
+def _expand_short_name(path: str) -> str:
+    """Expand 8.3 short names (e.g. PROGRA~1) using the Win32 API."""
+    if sys.platform != 'win32':
+        return path
+    try:
+        import ctypes
+        buffer = ctypes.create_unicode_buffer(32768)
+        length = ctypes.windll.kernel32.GetLongPathNameW(path, buffer, len(buffer))
+        if 0 < length < len(buffer):
+            return buffer.value
+    except Exception:
+        pass
+    return path
@@ -0,0 +1,96 @@
+"""
+Pending Apps - Queue of new apps waiting for an allow/block decision
+"""
+import ntpath
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+UNKNOWN_PUBLISHER = "Unknown publisher"
+
+def get_directory(app_path: str) -> str:
+    """Folder containing the executable."""
+    return ntpath.dirname(app_path) or app_path
+
+@lru_cache(maxsize=4096)
+def get_publisher(app_path: str) -> str:
+    """Company name from the executable's version resource (Windows only)."""
+    if sys.platform != 'win32':
+        return UNKNOWN_PUBLISHER
+    try:
+        import win32api
+        lang, codepage = win32api.GetFileVersionInfo(app_path, '\\VarFileInfo\\Translation')[0]
+        company = win32api.GetFileVersionInfo(app_path, f'\\StringFileInfo\\{lang:04X}{codepage:04X}\\CompanyName')
+        return (company or '').strip() or UNKNOWN_PUBLISHER
+    except Exception:
+        return UNKNOWN_PUBLISHER
+
+GROUP_BY: Dict[str, Callable[[str], str]] = {
+    'directory': get_directory,
+    'publisher': get_publisher,
+}
+
+class PendingQueue:
+    """
+    Pending apps in arrival order.
+    
+    An insertion-ordered dict holds the queue, so adding or removing an
+    app is O(1) whatever its position. The arrival-ordered list that the
+    virtualized dialog list indexes is built from the dict on demand and
+    cached until the next change: a batch of decisions costs one copy at
+    the next redraw, not a list shift per app.
+    """
+    
+    def __init__(self):
+        self._apps: Dict[str, None] = {}  # Pending apps, arrival order
+        self._items: Optional[List[str]] = None  # Cached list(self._apps)
+    
+    def add_many(self, app_paths: Iterable[str]) -> int:
+        """Queue apps not already pending; returns how many were added."""
+        added = 0
+        for app_path in app_paths:
+            if app_path not in self._apps:
+                self._apps[app_path] = None
+                added += 1
+        if added:
+            self._items = None
+        return added
+    
+    def discard_many(self, app_paths: Iterable[str]) -> int:
+        """Remove apps from the queue; returns how many were pending."""
+        removed = 0
+        for app_path in set(app_paths):
+            if app_path in self._apps:
+                del self._apps[app_path]
+                removed += 1
+        if removed:
+            self._items = None
+        return removed
+    
+    def items(self) -> List[str]:
+        """Pending apps in arrival order (cached until the next change, do not modify)."""
+        if self._items is None:
+            self._items = list(self._apps)
+        return self._items
+    
+    def groups(self, by: str) -> List[Tuple[str, List[str]]]:
+        """
+        Pending apps grouped by 'directory' or 'publisher'.
+        
+        Returns:
+            (group, app paths) pairs, largest group first
+        """
+        key = GROUP_BY[by]
+        groups: Dict[str, List[str]] = {}
+        for app_path in self._apps:
+            groups.setdefault(key(app_path), []).append(app_path)
+        return sorted(groups.items(), key=lambda group: (-len(group[1]), group[0].casefold()))
+    
+    def __contains__(self, app_path: str) -> bool:
+        return app_path in self._apps
+    
+    def __len__(self) -> int:
+        return len(self._apps)
+    
+    def __iter__(self):
+        return iter(self.items())
@@ -0,0 +1,126 @@
+"""
+Persistence - Atomic, debounced background writes of JSON state files
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from typing import Callable, Dict
+from config import SETTINGS_SAVE_DELAY
+
+_writers = weakref.WeakSet()  # Live writers, flushed at interpreter exit
+
+def atomic_write_json(path: str, data: Dict, indent: int = 2):
+    """
+    Write JSON file atomically (temp file + fsync + rename).
+    
+    A crash mid-write leaves either the previous or the new file, never a
+    truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+class DebouncedWriter:
+    """
+    Coalesce save requests and write them on a background thread.
+    
+    The first request after a write opens a window of `delay` seconds;
+    every request inside the window is folded into a single write of the
+    latest snapshot. A delay of 0 writes synchronously on the caller thread.
+    """
+    
+    def __init__(self, path: str, snapshot: Callable[[], Dict], delay: float = SETTINGS_SAVE_DELAY):
+        self.path = path
+        self.snapshot = snapshot  # Called on the writer thread, must be thread-safe
+        self.delay = delay
+        self.write_count = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty_since = None
+        self._closed = False
+        self._thread = None
+        _writers.add(self)
+    
+    def schedule(self):
+        """Request a write of the current state."""
+        if self.delay <= 0 or self._closed:
+            self._dirty_since = time.monotonic()
+            self.flush()
+            return
+        
+        with self._cond:
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def flush(self):
+        """Write pending changes now (blocks until written)."""
+        with self._write_lock:
+            with self._cond:
+                pending = self._dirty_since is not None
+                self._dirty_since = None
+            if pending:
+                self._write()
+    
+    def close(self):
+        """Flush pending changes and stop background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+    
+    @property
+    def pending(self) -> bool:
+        """True if changes are waiting to be written."""
+        return self._dirty_since is not None
+    
+    def _run(self):
+        """Background loop: wait for the debounce window, then write."""
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                deadline = self._dirty_since + self.delay
+                while not self._closed and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                if self._closed:
+                    return  # close() flushes on the caller thread
+            self.flush()
+    
+    def _write(self):
+        """Write one snapshot to disk."""
+        try:
+            atomic_write_json(self.path, self.snapshot())
+            self.write_count += 1
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+def _flush_all():
+    """Flush all live writers (interpreter exit)."""
+    for writer in list(_writers):
+        writer.flush()
+
+atexit.register(_flush_all)
@@ -0,0 +1,134 @@
+"""
+Poll Scheduler - Adaptive, drift-free scan timing for NetworkMonitor
+"""
+import math
+import threading
+from config import (MONITOR_MIN_INTERVAL, MONITOR_MAX_INTERVAL, MONITOR_HIDDEN_MAX_INTERVAL,
+                    MONITOR_CHURN_THRESHOLD, MONITOR_BACKOFF_FACTOR)
+
+class AdaptiveScheduler:
+    """
+    Decide when the next connection scan should start.
+    
+    Scans are scheduled on a monotonic deadline (deadline += interval), so
+    the time spent scanning doesn't push later ticks back. The interval
+    halves on bursts (many opened/closed connections or new apps), backs
+    off while nothing changes, and relaxes towards the base interval
+    otherwise. While the window is hidden the back-off ceiling is raised.
+    """
+    
+    def __init__(self, base_interval: float = 2.0,
+                 min_interval: float = MONITOR_MIN_INTERVAL,
+                 max_interval: float = MONITOR_MAX_INTERVAL,
+                 hidden_max_interval: float = MONITOR_HIDDEN_MAX_INTERVAL,
+                 churn_threshold: int = MONITOR_CHURN_THRESHOLD,
+                 backoff_factor: float = MONITOR_BACKOFF_FACTOR):
+        self._lock = threading.Lock()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hidden_max_interval = hidden_max_interval
+        self.churn_threshold = churn_threshold
+        self.backoff_factor = backoff_factor
+        self.visible = True
+        self.base_interval = base_interval
+        self.interval = base_interval
+        
+        # Metrics
+        self.ticks = 0
+        self.skipped_ticks = 0  # Deadlines missed because a scan overran
+        self.early_ticks = 0  # Scans triggered before their deadline (events)
+        self.last_scan_duration = 0.0
+        self.max_scan_duration = 0.0
+        self.total_scan_duration = 0.0
+        self.last_tick_lateness = 0.0  # How late the last scan started vs. its deadline
+    
+    def set_base_interval(self, interval: float):
+        """Change the user-configured interval (adaptation is relative to it)."""
+        with self._lock:
+            self.base_interval = interval
+            self.interval = self._clamp(interval)
+    
+    def set_visible(self, visible: bool):
+        """Window shown/hidden; hidden windows may back off further."""
+        with self._lock:
+            self.visible = visible
+            self.interval = self._clamp(self.interval)
+    
+    def record_scan(self, churn: int, new_apps: int, duration: float) -> float:
+        """
+        Record a finished scan and adapt the interval.
+        
+        Args:
+            churn: Connections opened + closed by this scan
+            new_apps: Applications seen for the first time
+            duration: Scan time in seconds
+            
+        Returns:
+            New interval in seconds
+        """
+        with self._lock:
+            self.ticks += 1
+            self.last_scan_duration = duration
+            self.total_scan_duration += duration
+            self.max_scan_duration = max(self.max_scan_duration, duration)
+            
+            if new_apps or churn >= self.churn_threshold:
+                interval = self.interval / 2
+            elif churn == 0:
+                interval = self.interval * self.backoff_factor
+            elif self.interval < self.base_interval:
+                interval = min(self.interval * self.backoff_factor, self.base_interval)
+            else:
+                interval = max(self.interval / self.backoff_factor, self.base_interval)
+            
+            self.interval = self._clamp(interval)
+            return self.interval
+    
+    def next_deadline(self, deadline: float, now: float) -> float:
+        """
+        Get the start time of the next scan.
+        
+        Args:
+            deadline: Scheduled start of the scan that just finished
+            now: Current monotonic time
+        """
+        with self._lock:
+            self.last_tick_lateness = 0.0
+            next_deadline = deadline + self.interval
+            if next_deadline <= now:
+                # Scan overran one or more ticks: skip them instead of bunching up
+                missed = math.floor((now - next_deadline) / self.interval) + 1
+                self.skipped_ticks += missed
+                next_deadline += missed * self.interval
+            return next_deadline
+    
+    def record_wait(self, deadline: float, now: float, woken: bool):
+        """Record when a scan actually started relative to its deadline."""
+        with self._lock:
+            if woken and now < deadline:
+                self.early_ticks += 1
+            else:
+                self.last_tick_lateness = max(0.0, now - deadline)
+    
+    def metrics(self) -> dict:
+        """Get timing statistics."""
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'base_interval': self.base_interval,
+                'visible': self.visible,
+                'ticks': self.ticks,
+                'skipped_ticks': self.skipped_ticks,
+                'early_ticks': self.early_ticks,
+                'last_scan_duration': self.last_scan_duration,
+                'max_scan_duration': self.max_scan_duration,
+                'avg_scan_duration': self.total_scan_duration / self.ticks if self.ticks else 0.0,
+                'last_tick_lateness': self.last_tick_lateness,
+            }
+    
+    def _clamp(self, interval: float) -> float:
+        """Keep interval within bounds (bounds always include the base interval)."""
+        low = min(self.min_interval, self.base_interval)
+        ceiling = self.max_interval if self.visible else self.hidden_max_interval
+        high = max(ceiling, self.base_interval)
+        return min(max(interval, low), high)
@@ -0,0 +1,226 @@
+"""
+Proc Net - Fast Linux socket table reader for NetworkMonitor
+
+Reads /proc/net/tcp{,6} (and optionally udp{,6}) directly and returns only
+remote-connected sockets, in the same shape as psutil.net_connections().
+"""
+import os
+import socket
+import struct
+import sys
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional
+
+Address = namedtuple('Address', ['ip', 'port'])
+SocketEntry = namedtuple('SocketEntry', ['fd', 'family', 'type', 'laddr', 'raddr', 'status', 'pid'])
+
+TCP_STATES = {
+    '01': 'ESTABLISHED',
+    '02': 'SYN_SENT',
+    '03': 'SYN_RECV',
+    '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2',
+    '06': 'TIME_WAIT',
+    '07': 'CLOSE',
+    '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK',
+    '0A': 'LISTEN',
+    '0B': 'CLOSING',
+    '0C': 'SYN_RECV',  # NEW_SYN_RECV
+}
+UDP_STATUS = 'NONE'  # psutil reports no state for UDP
+
+TCP_TABLES = (('tcp', socket.AF_INET, socket.SOCK_STREAM),
+              ('tcp6', socket.AF_INET6, socket.SOCK_STREAM))
+UDP_TABLES = (('udp', socket.AF_INET, socket.SOCK_DGRAM),
+              ('udp6', socket.AF_INET6, socket.SOCK_DGRAM))
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+ADDRESS_CACHE_SIZE = 65536
+
+def decode_ip(hex_ip: str, family: int) -> str:
+    """Convert a /proc/net address ("0100007F") to text ("127.0.0.1")."""
+    raw = bytes.fromhex(hex_ip)
+    if _LITTLE_ENDIAN:
+        # Each 32-bit word is printed in host byte order
+        raw = struct.pack(f'>{len(raw) // 4}I', *struct.unpack(f'<{len(raw) // 4}I', raw))
+    return socket.inet_ntop(family, raw)
+
+class SocketInodeIndex:
+    """
+    Map socket inodes to the PID holding them.
+    
+    Keeps a per-process fd -> inode table between scans, so only fds that
+    are new since the last scan need a readlink(); a full rescan is done
+    only when that isn't enough to explain every socket.
+    """
+    
+    def __init__(self, proc_root: str = '/proc'):
+        self.proc_root = proc_root
+        self._fds: Dict[int, Dict[str, Optional[str]]] = {}  # pid -> {fd: inode or None}
+        self._inode_pid: Dict[str, int] = {}
+        self._unresolved: set = set()  # Inodes no visible process holds (e.g. other users)
+        self.readlinks = 0
+        self.full_rescans = 0
+    
+    def resolve(self, inodes: Iterable[str]) -> Dict[str, int]:
+        """
+        Get inode -> PID for the given socket inodes.
+        
+        Inodes that can't be attributed (process gone, access denied) are
+        left out, like psutil reporting pid=None.
+        """
+        wanted = set(inodes)
+        new_pids = self._sync_pids()
+        if new_pids:
+            self._unresolved.clear()  # New processes may own them
+        self._unresolved &= wanted
+        
+        missing = wanted - self._inode_pid.keys() - self._unresolved
+        if missing:
+            missing = self._scan(missing, full=False)
+        if missing:
+            self.full_rescans += 1
+            missing = self._scan(missing, full=True)
+        self._unresolved |= missing
+        
+        inode_pid = self._inode_pid
+        return {inode: inode_pid[inode] for inode in wanted if inode in inode_pid}
+    
+    def _sync_pids(self) -> bool:
+        """Forget exited processes; return True if new PIDs appeared."""
+        live = set()
+        for name in os.listdir(self.proc_root):
+            if name.isdigit():
+                live.add(int(name))
+        
+        for pid in self._fds.keys() - live:
+            self._forget_pid(pid)
+        
+        new = live - self._fds.keys()
+        for pid in new:
+            self._fds[pid] = {}
+        return bool(new)
+    
+    def _forget_pid(self, pid: int):
+        """Drop a process and its inodes from the index."""
+        for inode in self._fds.pop(pid, {}).values():
+            if inode is not None and self._inode_pid.get(inode) == pid:
+                del self._inode_pid[inode]
+    
+    def _scan(self, missing: set, full: bool) -> set:
+        """
+        Read fd tables until all missing inodes are found.
+        
+        Args:
+            missing: Inodes still to attribute
+            full: Re-read every fd (fd numbers may have been reused)
+            
+        Returns:
+            Inodes still missing
+        """
+        for pid, fds in self._fds.items():
+            fd_dir = f"{self.proc_root}/{pid}/fd"
+            try:
+                current = os.listdir(fd_dir)
+            except OSError:
+                continue  # Exited or access denied
+            
+            if full:
+                stale = list(fds)
+            else:
+                stale = fds.keys() - set(current)
+            for fd in stale:
+                inode = fds.pop(fd)
+                if inode is not None and self._inode_pid.get(inode) == pid:
+                    del self._inode_pid[inode]
+            
+            for fd in current:
+                if fd in fds:
+                    continue
+                self.readlinks += 1
+                try:
+                    target = os.readlink(f"{fd_dir}/{fd}")
+                except OSError:
+                    continue
+                if target.startswith('socket:['):
+                    inode = target[8:-1]
+                    fds[fd] = inode
+                    self._inode_pid[inode] = pid
+                    missing.discard(inode)
+                else:
+                    fds[fd] = None
+            
+            if not missing and not full:
+                break
+        
+        return missing
+
+class ProcNetReader:
+    """
+    Read connected inet sockets straight from /proc/net.
+    
+    Skips listeners, unconnected sockets and sockets without an owning
+    process while parsing, so no records are built for sockets that
+    NetworkMonitor would discard anyway. UDP tables are off by default:
+    psutil gives UDP sockets status 'NONE', which the monitor ignores.
+    """
+    
+    def __init__(self, proc_root: str = '/proc', include_udp: bool = False):
+        self.proc_root = proc_root
+        self.tables = TCP_TABLES + (UDP_TABLES if include_udp else ())
+        self.inode_index = SocketInodeIndex(proc_root)
+        self._addresses: Dict[tuple, Address] = {}  # (hex, family) -> Address, reused across scans
+    
+    @staticmethod
+    def is_supported(proc_root: str = '/proc') -> bool:
+        """Check if /proc/net socket tables are readable."""
+        return os.access(f"{proc_root}/net/tcp", os.R_OK)
+    
+    def __call__(self) -> List[SocketEntry]:
+        """Get connected inet sockets (psutil.net_connections-compatible)."""
+        rows = []
+        for name, family, sock_type in self.tables:
+            rows.extend(self._read_table(name, family, sock_type))
+        
+        pids = self.inode_index.resolve(row[0] for row in rows)
+        if len(self._addresses) > max(ADDRESS_CACHE_SIZE, 4 * len(rows)):
+            self._addresses.clear()  # Bounded, but never smaller than one scan's worth
+        entries = []
+        for inode, family, sock_type, laddr, raddr, status in rows:
+            pid = pids.get(inode)
+            if pid is None:
+                continue
+            entries.append(SocketEntry(-1, family, sock_type, self._address(laddr, family),
+                                       self._address(raddr, family), status, pid))
+        return entries
+    
+    def _read_table(self, name: str, family: int, sock_type: int) -> List[tuple]:
+        """Parse one /proc/net table into (inode, family, type, laddr, raddr, status) rows."""
+        try:
+            with open(f"{self.proc_root}/net/{name}", encoding='ascii') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []  # e.g. IPv6 disabled
+        
+        rows = []
+        is_tcp = sock_type == socket.SOCK_STREAM
+        for line in lines[1:]:
+            fields = line.split()
+            raddr = fields[2]
+            inode = fields[9]
+            if raddr.endswith(':0000') or inode == '0':
+                continue  # Not connected, or no owning process (TIME_WAIT)
+            status = TCP_STATES.get(fields[3], 'NONE') if is_tcp else UDP_STATUS
+            rows.append((inode, family, sock_type, fields[1], raddr, status))
+        return rows
+    
+    def _address(self, hex_addr: str, family: int) -> Address:
+        """Decode "IP:PORT" hex address (cached; remote hosts repeat a lot)."""
+        key = (hex_addr, family)
+        address = self._addresses.get(key)
+        if address is None:
+            hex_ip, hex_port = hex_addr.split(':')
+            address = Address(decode_ip(hex_ip, family), int(hex_port, 16))
+            self._addresses[key] = address
+        return address
@@ -0,0 +1,120 @@
+"""
+Process Cache - Long-lived process name/path cache for the network monitor
+"""
+import psutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import PROCESS_CACHE_SIZE, PROCESS_CACHE_TTL, PROCESS_CACHE_NEGATIVE_TTL
+
+UNKNOWN_PROCESS = {'name': 'Unknown', 'path': ''}
+
+class ProcessInfoCache:
+    """
+    Bounded LRU/TTL cache of process metadata keyed by (pid, create_time).
+    
+    Keying on create_time means a reused PID never returns the previous
+    process's name/path. Processes we may not inspect (AccessDenied) are
+    cached as unknown for a shorter negative TTL.
+    """
+    
+    def __init__(self, max_size: int = PROCESS_CACHE_SIZE, ttl: float = PROCESS_CACHE_TTL,
+                 negative_ttl: float = PROCESS_CACHE_NEGATIVE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()  # (pid, create_time) -> (info, expires_at)
+        self._lock = threading.Lock()
+    
+    def get(self, pid: int) -> Dict[str, str]:
+        """
+        Get {'name', 'path'} for a PID, resolving it on a miss.
+        
+        A hit costs one create_time read instead of name() + exe().
+        """
+        try:
+            proc = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return UNKNOWN_PROCESS
+        
+        key = (pid, self._create_time(proc))
+        info = self.lookup(key)
+        if info is not None:
+            return info
+        
+        info, negative = self._resolve(proc)
+        self.store(key, info, negative)
+        return info
+    
+    def lookup(self, key: tuple) -> Optional[Dict[str, str]]:
+        """Get cached entry for a (pid, create_time) key (counts hit/miss)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]  # Expired
+            self.misses += 1
+        return None
+    
+    def store(self, key: tuple, info: Dict[str, str], negative: bool = False):
+        """Cache entry, evicting least recently used ones over max_size."""
+        if self.max_size <= 0:
+            return
+        ttl = self.negative_ttl if negative else self.ttl
+        with self._lock:
+            self._entries[key] = (info, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _create_time(proc) -> Optional[float]:
+        """Get process create time (None if not readable)."""
+        try:
+            return proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    
+    @staticmethod
+    def _resolve(proc) -> tuple[Dict[str, str], bool]:
+        """
+        Read name and path of a process.
+        
+        Returns:
+            (info, negative) - negative is True if the process couldn't be read
+        """
+        try:
+            # Interned: many processes share an executable (browsers, svchost.exe)
+            return {'name': sys.intern(proc.name()), 'path': sys.intern(proc.exe())}, False
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return UNKNOWN_PROCESS, True
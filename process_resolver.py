@@ -0,0 +1,218 @@
+"""
+Process Resolver - Resolve process name/path on a bounded worker pool
+"""
+import psutil
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Dict, Iterable, List, Optional, Set
+from process_cache import ProcessInfoCache, UNKNOWN_PROCESS
+from config import (PROCESS_RESOLVE_WORKERS, PROCESS_RESOLVE_QUEUE, PROCESS_RESOLVE_BUDGET,
+                    PROCESS_RESOLVE_TIMEOUT, PROCESS_RESOLVE_MAX_THREADS)
+
+PENDING_PROCESS = {'name': 'Resolving...', 'path': ''}
+
+class ProcessResolver:
+    """
+    Look up process metadata without letting slow processes stall a scan.
+    
+    Cache misses are queued to daemon worker threads. A scan waits at most
+    `budget` seconds for them; whatever isn't done yet is reported as
+    PENDING_PROCESS and shows up with its real name/path in a later delta
+    once the worker stores it in the cache. Lookups stuck for longer than
+    `timeout` are cached as unknown (negative TTL) so they aren't retried
+    every scan.
+    
+    A worker whose current lookup has run longer than `timeout` is
+    abandoned: it no longer counts towards `workers`, a replacement is
+    started, and it exits once (if ever) its lookup returns. Abandoned
+    threads count towards `max_threads`, so hung handles can't grow the
+    pool without bound - at the cap, new lookups wait in the queue.
+    """
+    
+    def __init__(self, cache: ProcessInfoCache = None, workers: int = PROCESS_RESOLVE_WORKERS,
+                 queue_size: int = PROCESS_RESOLVE_QUEUE, budget: float = PROCESS_RESOLVE_BUDGET,
+                 timeout: float = PROCESS_RESOLVE_TIMEOUT, max_threads: int = PROCESS_RESOLVE_MAX_THREADS):
+        self.cache = cache if cache is not None else ProcessInfoCache()
+        self.workers = max(1, workers)
+        self.max_threads = max(self.workers, max_threads)
+        self.budget = budget
+        self.timeout = timeout
+        self.timeouts = 0  # Lookups given up on
+        self.deferred = 0  # Lookups not queued because the queue was full
+        self.abandoned = 0  # Workers given up on (stuck in a lookup)
+        self.closed = False  # Set by shutdown(); no lookups are queued afterwards
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._pending: Dict[tuple, tuple] = {}  # key -> (Future, submitted_at)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []  # Active workers (at most `workers`)
+        self._stuck: Set[threading.Thread] = set()  # Abandoned workers still in a lookup
+        self._busy: Dict[threading.Thread, float] = {}  # Worker -> start of its current lookup
+    
+    def resolve_many(self, pids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Get {'name', 'path'} for each PID, waiting at most `budget` seconds.
+        
+        Returns:
+            pid -> info (UNKNOWN_PROCESS if gone/inaccessible, PENDING_PROCESS if not resolved yet)
+        """
+        results = {}
+        waiting = {}  # pid -> (key, Future)
+        now = time.monotonic()
+        self._abandon_stuck(now)
+        
+        for pid in pids:
+            proc, key = self._identify(pid)
+            if proc is None:
+                results[pid] = UNKNOWN_PROCESS
+                continue
+            info = self.cache.lookup(key)
+            if info is not None:
+                results[pid] = info
+                continue
+            future = self._submit(key, proc, now)
+            if future is None:
+                results[pid] = PENDING_PROCESS
+            else:
+                waiting[pid] = (key, future)
+        
+        if waiting:
+            wait([future for _, future in waiting.values()], timeout=self.budget)
+            for pid, (key, future) in waiting.items():
+                if future.cancelled():
+                    results[pid] = PENDING_PROCESS  # Dropped by shutdown(); not known to be gone
+                elif future.done():
+                    results[pid] = UNKNOWN_PROCESS if future.exception() else future.result()
+                else:
+                    results[pid] = self._still_pending(key)
+        
+        return results
+    
+    def pending(self) -> int:
+        """Number of lookups queued or running."""
+        with self._lock:
+            return len(self._pending)
+    
+    def shutdown(self):
+        """
+        Cancel queued lookups and stop the workers; later lookups aren't queued.
+        
+        Busy workers exit after their current lookup (they are daemons, so a
+        hung one dies with the process).
+        """
+        with self._lock:
+            self.closed = True
+            threads, self._threads = self._threads, []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[2].cancel()
+            self._pending.clear()
+        for _ in threads:
+            try:
+                self._queue.put_nowait(None)  # Wake idle workers
+            except queue.Full:
+                break
+    
+    def threads(self) -> int:
+        """Number of live worker threads (active and abandoned)."""
+        with self._lock:
+            return len(self._threads) + len(self._stuck)
+    
+    @staticmethod
+    def _identify(pid: int) -> tuple:
+        """Get (Process, cache key) for a PID, or (None, None) if it's gone."""
+        try:
+            proc = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return None, None
+        return proc, (pid, ProcessInfoCache._create_time(proc))
+    
+    @staticmethod
+    def _resolve(proc) -> tuple:
+        """Read name/path (runs on a worker thread)."""
+        return ProcessInfoCache._resolve(proc)
+    
+    def _submit(self, key: tuple, proc, now: float) -> Optional[Future]:
+        """Queue a lookup unless one is already in flight; None if the queue is full or closed."""
+        with self._lock:
+            if self.closed:
+                return None
+            entry = self._pending.get(key)
+            if entry is not None:
+                return entry[0]
+            
+            future = Future()
+            try:
+                self._queue.put_nowait((key, proc, future))
+            except queue.Full:
+                self.deferred += 1
+                return None
+            self._pending[key] = (future, now)
+            self._start_workers()
+            return future
+    
+    def _start_workers(self):
+        """Top the pool up to `workers`, within `max_threads` (lock held)."""
+        while (len(self._threads) < self.workers
+               and len(self._threads) + len(self._stuck) < self.max_threads):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            self._threads.append(thread)
+            thread.start()
+    
+    def _abandon_stuck(self, now: float):
+        """Give up on workers whose current lookup overran `timeout` and replace them."""
+        with self._lock:
+            if self.closed:
+                return
+            stuck = [thread for thread, started in self._busy.items()
+                     if thread not in self._stuck and now - started >= self.timeout]
+            for thread in stuck:
+                self._stuck.add(thread)
+                self._threads.remove(thread)
+                self.abandoned += 1
+            if stuck and not self.closed and not self._queue.empty():
+                self._start_workers()
+    
+    def _still_pending(self, key: tuple) -> Dict[str, str]:
+        """Info for a lookup that didn't finish within the budget."""
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None or time.monotonic() - entry[1] < self.timeout:
+                return PENDING_PROCESS
+            # Give up; a late result still replaces this in the cache
+            del self._pending[key]
+            self.timeouts += 1
+        self.cache.store(key, UNKNOWN_PROCESS, negative=True)
+        return UNKNOWN_PROCESS
+    
+    def _worker(self):
+        """Worker loop: resolve queued lookups and cache the results."""
+        thread = threading.current_thread()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            key, proc, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._busy[thread] = time.monotonic()
+            try:
+                info, negative = self._resolve(proc)
+                self.cache.store(key, info, negative)
+                future.set_result(info)
+            except Exception as e:
+                future.set_exception(e)
+            with self._lock:
+                del self._busy[thread]
+                entry = self._pending.get(key)
+                if entry is not None and entry[0] is future:
+                    del self._pending[key]
+                if thread in self._stuck or self.closed:
+                    self._stuck.discard(thread)
+                    return  # Replaced (or shut down) meanwhile
@@ -0,0 +1,100 @@
+"""
+Rule Reconciler - Keep [WinNetGuard] block rules in line with the registry
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from paths import normalize_path
+
+@dataclass
+class ReconcileResult:
+    """Outcome of one reconciliation pass."""
+    blocked: List[str] = field(default_factory=list)  # Rules added
+    unblocked: List[str] = field(default_factory=list)  # Rules removed
+    failed: Dict[str, str] = field(default_factory=dict)  # app path -> reason
+    skipped: bool = False  # Fingerprint unchanged, nothing compared
+    
+    @property
+    def changed(self) -> bool:
+        """True if any rule was added or removed."""
+        return bool(self.blocked or self.unblocked)
+
+class RuleReconciler:
+    """
+    Makes the firewall's app rules match the registry blacklist.
+    
+    The blacklist is the desired state and the indexed [WinNetGuard] rules
+    the actual state (at most one enumeration). A pass applies only the
+    missing blocks and stale rules, in one FirewallManager.apply_batch().
+    
+    Afterwards it remembers a fingerprint of both sides: the registry
+    revision and the rule set hash. While neither changes, a pass is a
+    single comparison. Paths that failed (e.g. the executable was
+    uninstalled) are retried only once something changes.
+    """
+    
+    def __init__(self, firewall, registry):
+        """
+        Args:
+            firewall: FirewallManager (or compatible) holding the rules
+            registry: AppRegistry / SqliteAppRegistry holding the blacklist
+        """
+        self.firewall = firewall
+        self.registry = registry
+        self._settled: Optional[tuple] = None  # Fingerprint after the last full pass
+        self._lock = threading.Lock()  # One pass at a time (timer vs. manual runs)
+    
+    def fingerprint(self) -> tuple:
+        """Current (registry revision, rule set hash)."""
+        return (self.registry.revision, self.firewall.rule_fingerprint())
+    
+    def diff(self) -> tuple[List[str], List[str]]:
+        """
+        Compute the minimal changes bringing the rules to the desired state.
+        
+        Returns:
+            (paths to block, paths to unblock)
+        """
+        desired = {normalize_path(p): p for p in self.registry.get_blacklist()}
+        actual = {normalize_path(rule.app_path): rule.app_path
+                  for rule in self.firewall.get_active_rules() if rule.app_path}
+        to_block = [p for key, p in desired.items() if key not in actual]
+        to_unblock = [p for key, p in actual.items() if key not in desired]
+        return to_block, to_unblock
+    
+    def reconcile(self, force: bool = False) -> ReconcileResult:
+        """
+        Run one pass (cheap no-op if nothing changed since the last one).
+        
+        Args:
+            force: Compare even if the fingerprint is unchanged
+        """
+        with self._lock:
+            try:
+                fingerprint = self.fingerprint()
+            except Exception as e:
+                print(f"Error reading firewall rules: {e}")
+                return ReconcileResult(skipped=True)
+            if not force and fingerprint == self._settled:
+                return ReconcileResult(skipped=True)
+            
+            result = ReconcileResult()
+            to_block, to_unblock = self.diff()
+            if to_block or to_unblock:
+                results = self.firewall.apply_batch(block=to_block, unblock=to_unblock)
+                blocking = set(to_block)
+                for app_path, (success, message) in results.items():
+                    if not success:
+                        result.failed[app_path] = message
+                    elif app_path in blocking:
+                        result.blocked.append(app_path)
+                    else:
+                        result.unblocked.append(app_path)
+                fingerprint = self.fingerprint()
+            
+            self._settled = fingerprint
+            return result
+    
+    def invalidate(self):
+        """Force a full comparison on the next pass."""
+        self._settled = None
@@ -0,0 +1,224 @@
+"""
+Registry Storage - Persistence backends for AppRegistry
+"""
+import json
+import os
+from typing import Callable, Dict, List
+from config import SETTINGS_SAVE_DELAY, REGISTRY_BACKEND, JOURNAL_SUFFIX, JOURNAL_COMPACT_EVERY
+from paths import normalize_path
+from persistence import DebouncedWriter, atomic_write_json
+
+# Registry change events: (kind, *args)
+EVENT_WHITELIST = 'w'  # (EVENT_WHITELIST, app_path)
+EVENT_BLACKLIST = 'b'  # (EVENT_BLACKLIST, app_path)
+EVENT_FORGET = 'f'     # (EVENT_FORGET, app_path)
+EVENT_CLEAR = 'c'      # (EVENT_CLEAR,)
+EVENT_SETTING = 's'    # (EVENT_SETTING, key, value)
+
+def empty_state() -> Dict:
+    """Get empty registry state."""
+    return {'whitelist': [], 'blacklist': [], 'settings': {}}
+
+def read_json_state(path: str) -> Dict:
+    """Read registry state from a JSON snapshot (empty state if missing/invalid)."""
+    state = empty_state()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            state['whitelist'] = list(data.get('whitelist', []))
+            state['blacklist'] = list(data.get('blacklist', []))
+            state['settings'] = dict(data.get('settings', {}))
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+    return state
+
+def apply_events(state: Dict, events: List) -> Dict:
+    """
+    Apply change events to a registry state (same semantics as AppRegistry).
+    
+    Replaying the same events twice yields the same state, so a log that
+    was already folded into the snapshot can safely be replayed again.
+    """
+    if not events:
+        return state
+    
+    whitelist = {normalize_path(p): p for p in state['whitelist']}
+    blacklist = {normalize_path(p): p for p in state['blacklist']}
+    settings = state['settings']
+    
+    for event in events:
+        kind = event[0]
+        if kind == EVENT_WHITELIST:
+            key = normalize_path(event[1])
+            blacklist.pop(key, None)
+            whitelist[key] = event[1]
+        elif kind == EVENT_BLACKLIST:
+            key = normalize_path(event[1])
+            whitelist.pop(key, None)
+            blacklist[key] = event[1]
+        elif kind == EVENT_FORGET:
+            key = normalize_path(event[1])
+            whitelist.pop(key, None)
+            blacklist.pop(key, None)
+        elif kind == EVENT_CLEAR:
+            whitelist.clear()
+            blacklist.clear()
+        elif kind == EVENT_SETTING:
+            settings[event[1]] = event[2]
+    
+    return {
+        'whitelist': list(whitelist.values()),
+        'blacklist': list(blacklist.values()),
+        'settings': settings
+    }
+
+class JsonStorage:
+    """Full JSON snapshot, rewritten (debounced, atomically) after changes."""
+    
+    def __init__(self, path: str, delay: float = SETTINGS_SAVE_DELAY):
+        self.path = path
+        self.delay = delay
+        self._writer = None
+    
+    def bind(self, snapshot: Callable[[], Dict]):
+        """Set callable returning the full registry state."""
+        self._writer = DebouncedWriter(self.path, snapshot, self.delay)
+    
+    def load(self) -> Dict:
+        """Load registry state."""
+        return read_json_state(self.path)
+    
+    def record(self, events: List):
+        """Persist change events (schedules a snapshot write)."""
+        self._writer.schedule()
+    
+    @property
+    def write_count(self) -> int:
+        """Number of snapshot writes performed."""
+        return self._writer.write_count
+    
+    def flush(self):
+        """Write pending changes now."""
+        self._writer.flush()
+    
+    def close(self):
+        """Flush and stop background writer."""
+        self._writer.close()
+
+class JournalStorage:
+    """
+    Append-only event log on top of a JSON snapshot.
+    
+    Each change appends one compact line to `<path>.log`; on load the log is
+    replayed over the snapshot at `path` (same format as JsonStorage, so it
+    doubles as import/export file). After `compact_every` events, and on
+    close, the state is written as a new snapshot and the log truncated.
+    """
+    
+    def __init__(self, path: str, compact_every: int = JOURNAL_COMPACT_EVERY, fsync: bool = False):
+        self.path = path
+        self.log_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.fsync = fsync  # fsync every append (survives power loss, slower)
+        self.log_events = 0  # Events in log since last compaction
+        self.write_count = 0  # Appends + compactions
+        self._snapshot = None
+        self._log = None
+    
+    def bind(self, snapshot: Callable[[], Dict]):
+        """Set callable returning the full registry state."""
+        self._snapshot = snapshot
+    
+    def load(self) -> Dict:
+        """Load snapshot and replay the log on top of it."""
+        state = read_json_state(self.path)
+        events = self._read_log()
+        self.log_events = len(events)
+        return apply_events(state, events)
+    
+    def record(self, events: List):
+        """Append change events to the log."""
+        if not events:
+            return
+        try:
+            log = self._open_log()
+            log.write(''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in events))
+            log.flush()
+            if self.fsync:
+                os.fsync(log.fileno())
+            self.log_events += len(events)
+            self.write_count += 1
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return
+        
+        if self.compact_every and self.log_events >= self.compact_every:
+            self.compact()
+    
+    def compact(self):
+        """Fold the log into a new snapshot and truncate it."""
+        try:
+            atomic_write_json(self.path, self._snapshot())
+            # Crash before truncation is harmless: replay is idempotent
+            if self._log:
+                self._log.close()
+                self._log = None
+            with open(self.log_path, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self.log_events = 0
+            self.write_count += 1
+        except Exception as e:
+            print(f"Error compacting settings journal: {e}")
+    
+    def flush(self):
+        """Force appended events to disk."""
+        if self._log:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+    
+    def close(self):
+        """Compact pending events and close the log."""
+        if self.log_events:
+            self.compact()
+        if self._log:
+            self._log.close()
+            self._log = None
+    
+    def _open_log(self):
+        """Get log file handle (opened lazily in append mode)."""
+        if self._log is None:
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+        return self._log
+    
+    def _read_log(self) -> List:
+        """Read events from the log, skipping a torn last line."""
+        events = []
+        if not os.path.exists(self.log_path):
+            return events
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue  # Partially written entry (crash mid-append)
+        except Exception as e:
+            print(f"Error loading settings journal: {e}")
+        return events
+
+def create_storage(backend: str = REGISTRY_BACKEND, path: str = None, save_delay: float = SETTINGS_SAVE_DELAY):
+    """
+    Create registry storage backend by name.
+    
+    Args:
+        backend: "json" or "journal"
+        path: Settings (snapshot) file path
+        save_delay: Debounce window for the JSON backend
+    """
+    if backend == "json":
+        return JsonStorage(path, save_delay)
+    if backend == "journal":
+        return JournalStorage(path)
+    raise ValueError(f"Unknown registry backend: {backend}")
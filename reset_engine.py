@@ -0,0 +1,247 @@
+"""
+Reset Engine - Remove all app firewall rules (with backup) and restore them
+"""
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+from config import RULE_PREFIX, LEGACY_RULE_PREFIXES, RESET_BATCH_SIZE, RESET_BACKUP_DIR
+from persistence import atomic_write_json
+
+BACKUP_VERSION = 1
+PORT_PROTOCOLS = (6, 17)  # TCP, UDP - ports can't be set for other protocols
+# Saved per rule, in the order they are restored (Protocol before ports, Enabled last)
+RULE_FIELDS = ('Name', 'Description', 'ApplicationName', 'Protocol', 'LocalPorts', 'RemotePorts',
+               'RemoteAddresses', 'Direction', 'Action', 'Profiles', 'Enabled')
+
+ProgressCallback = Callable[[int, int], None]  # (done, total)
+
+@dataclass
+class ResetResult:
+    """Outcome of a reset or restore."""
+    count: int = 0  # Rules removed (reset) or added (restore)
+    errors: List[str] = field(default_factory=list)
+    backup_file: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # phase -> seconds
+
+class ResetEngine:
+    """
+    Removes every rule created by this app, current or legacy prefix.
+    
+    Rules are collected in one pass over the policy (only the name is
+    read from rules that aren't ours), written to a compact backup file,
+    then removed in batches with a progress callback after each batch.
+    With a registry, its whitelist/blacklist go into the backup and are
+    cleared too (otherwise the reconciler would re-create the rules).
+    restore() replays a backup, skipping rules that already exist, and
+    puts the saved lists back so the reconciler keeps the rules.
+    """
+    
+    def __init__(self, fw_policy=None, rule_factory: Callable = None,
+                 prefixes: Sequence[str] = (RULE_PREFIX,) + LEGACY_RULE_PREFIXES,
+                 batch_size: int = RESET_BATCH_SIZE, registry=None):
+        """
+        Args:
+            fw_policy: Policy object (default: HNetCfg.FwPolicy2)
+            rule_factory: Creates empty rule objects for restore (default: HNetCfg.FwRule)
+            prefixes: Rule name prefixes that mark app rules
+            batch_size: Rules removed/added between progress callbacks
+            registry: AppRegistry / SqliteAppRegistry whose lists are backed up,
+                cleared and restored along with the rules (None = rules only)
+        """
+        if fw_policy is None:
+            import win32com.client  # Only needed for the real policy
+            fw_policy = win32com.client.Dispatch("HNetCfg.FwPolicy2")
+        self.fw_policy = fw_policy
+        self.rule_factory = rule_factory
+        self.prefixes = tuple(prefixes)
+        self.batch_size = max(1, batch_size)
+        self.registry = registry
+    
+    def collect(self) -> List[list]:
+        """Read all app rules in a single pass (one row of RULE_FIELDS per rule)."""
+        prefixes = self.prefixes
+        rows = []
+        for rule in self.fw_policy.Rules:
+            if rule.Name.startswith(prefixes):
+                rows.append([getattr(rule, name, None) for name in RULE_FIELDS])
+        return rows
+    
+    def count(self) -> int:
+        """Number of app rules in the policy."""
+        prefixes = self.prefixes
+        return sum(1 for rule in self.fw_policy.Rules if rule.Name.startswith(prefixes))
+    
+    def reset(self, backup_file: str = None, progress: ProgressCallback = None,
+              rows: List[list] = None) -> ResetResult:
+        """
+        Back up and remove all app rules (and clear the registry lists).
+        
+        Args:
+            backup_file: Where to write the backup (default: new file in RESET_BACKUP_DIR,
+                '' to skip the backup)
+            progress: Called with (removed so far, total) after each batch
+            rows: Result of an earlier collect() (skips the policy scan)
+        """
+        result = ResetResult()
+        start = time.perf_counter()
+        try:
+            if rows is None:
+                rows = self.collect()
+        except Exception as e:
+            result.errors.append(f"Emergency reset failed: {str(e)}")
+            return result
+        result.timings['collect'] = time.perf_counter() - start
+        
+        lists = None
+        if self.registry is not None:
+            lists = {'whitelist': self.registry.get_whitelist(), 'blacklist': self.registry.get_blacklist()}
+        
+        if backup_file != '' and (rows or (lists and any(lists.values()))):
+            start = time.perf_counter()
+            try:
+                result.backup_file = write_backup(backup_file or new_backup_path(), rows, lists)
+            except OSError as e:
+                # Restoring network access matters more than the undo file
+                result.errors.append(f"Backup failed: {str(e)}")
+            result.timings['backup'] = time.perf_counter() - start
+        
+        if self.registry is not None:
+            self.registry.clear_lists()
+        
+        start = time.perf_counter()
+        names = [row[0] for row in rows]
+        rules = self.fw_policy.Rules
+        for offset in range(0, len(names), self.batch_size):
+            for rule_name in names[offset:offset + self.batch_size]:
+                try:
+                    rules.Remove(rule_name)
+                    result.count += 1
+                except Exception as e:
+                    result.errors.append(f"Failed to remove {rule_name}: {str(e)}")
+            if progress:
+                progress(min(offset + self.batch_size, len(names)), len(names))
+        result.timings['remove'] = time.perf_counter() - start
+        return result
+    
+    def restore(self, backup_file: str, progress: ProgressCallback = None) -> ResetResult:
+        """
+        Re-create the rules saved in a backup (rules that exist are skipped)
+        and, with a registry, add the saved whitelist/blacklist back.
+        
+        Args:
+            backup_file: File written by reset()
+            progress: Called with (processed so far, total) after each batch
+        """
+        result = ResetResult(backup_file=backup_file)
+        start = time.perf_counter()
+        try:
+            fields, rows, lists = read_backup(backup_file)
+            prefixes = self.prefixes
+            existing = {rule.Name for rule in self.fw_policy.Rules if rule.Name.startswith(prefixes)}
+        except Exception as e:
+            result.errors.append(f"Restore failed: {str(e)}")
+            return result
+        result.timings['collect'] = time.perf_counter() - start
+        
+        if self.registry is not None and lists:
+            # Lists first: a reconcile running meanwhile then keeps the restored rules
+            try:
+                self.registry.add_many_to_whitelist(lists.get('whitelist', []))
+                self.registry.add_many_to_blacklist(lists.get('blacklist', []))
+            except Exception as e:
+                result.errors.append(f"Failed to restore lists: {str(e)}")
+        
+        start = time.perf_counter()
+        rules = self.fw_policy.Rules
+        for offset in range(0, len(rows), self.batch_size):
+            for row in rows[offset:offset + self.batch_size]:
+                values = dict(zip(fields, row))
+                rule_name = values.get('Name')
+                if not rule_name or rule_name in existing:
+                    continue
+                try:
+                    rule = self._create_rule_object()
+                    for name in RULE_FIELDS:  # Restore order, not file order
+                        if values.get(name) is None:
+                            continue
+                        if name.endswith('Ports') and values.get('Protocol') not in PORT_PROTOCOLS:
+                            continue
+                        setattr(rule, name, values[name])
+                    rules.Add(rule)
+                    existing.add(rule_name)
+                    result.count += 1
+                except Exception as e:
+                    result.errors.append(f"Failed to restore {rule_name}: {str(e)}")
+            if progress:
+                progress(min(offset + self.batch_size, len(rows)), len(rows))
+        result.timings['restore'] = time.perf_counter() - start
+        return result
+    
+    def _create_rule_object(self):
+        """Create a new, empty firewall rule object."""
+        if self.rule_factory:
+            return self.rule_factory()
+        import win32com.client
+        return win32com.client.Dispatch("HNetCfg.FwRule")
+
+def new_backup_path(directory: str = RESET_BACKUP_DIR) -> str:
+    """
+    Reserve a new timestamped backup file in directory.
+    
+    The name is claimed by creating the file exclusively, so resets in the
+    same second (double-click, script and GUI back to back) get
+    rules_<time>_1.json, _2, ... instead of overwriting an earlier backup.
+    """
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, time.strftime("rules_%Y%m%d_%H%M%S"))
+    suffix = 0
+    while True:
+        path = f"{stem}_{suffix}.json" if suffix else f"{stem}.json"
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return path
+        except FileExistsError:
+            suffix += 1
+
+def latest_backup(directory: str = RESET_BACKUP_DIR) -> Optional[str]:
+    """Most recent backup file in directory (None if there is none)."""
+    # Empty files are names reserved by a reset whose backup failed
+    files = [path for path in glob.glob(os.path.join(directory, "rules_*.json")) if os.path.getsize(path)]
+    return max(files, key=lambda path: (os.path.getmtime(path), path)) if files else None
+
+def write_backup(path: str, rows: List[list], lists: Dict[str, List[str]] = None) -> str:
+    """
+    Write rules compactly: field names once, then one value list per rule.
+    
+    Args:
+        lists: Registry lists to save ({'whitelist': [...], 'blacklist': [...]})
+    
+    Returns:
+        Path written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    atomic_write_json(path, {
+        'version': BACKUP_VERSION,
+        'created': time.time(),
+        'fields': list(RULE_FIELDS),
+        'rules': rows,
+        'lists': lists,
+    }, indent=None)
+    return path
+
+def read_backup(path: str) -> tuple[List[str], List[list], Optional[Dict[str, List[str]]]]:
+    """
+    Read a backup file.
+    
+    Returns:
+        (field names, rows, registry lists or None)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BACKUP_VERSION:
+        raise ValueError(f"Unsupported backup version: {data.get('version')}")
+    return data['fields'], data['rules'], data.get('lists')
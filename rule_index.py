@@ -0,0 +1,152 @@
+"""
+Rule Index - In-process index of WinNetGuard firewall rules
+"""
+import hashlib
+import ntpath
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from config import RULE_PREFIX, RULE_INDEX_MAX_AGE
+from paths import normalize_path
+
+@lru_cache(maxsize=65536)
+def rule_name_for_path(app_path: str) -> str:
+    """
+    Get the firewall rule name identifying an application path.
+    
+    The identity is a stable hash of the normalized path, so two different
+    executables sharing a basename (python.exe, updater.exe) get different
+    rules, and the name can be computed from the path for a keyed lookup.
+    The basename is only a label for the Windows Firewall console.
+    
+    Example:
+        "[WinNetGuard] python.exe #3f9c0a1d2b4e6f70"
+    """
+    key = normalize_path(app_path)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{RULE_PREFIX} {ntpath.basename(key)} #{digest}"
+
+class RuleIndex:
+    """
+    Index of [WinNetGuard] rules keyed by rule name and application path.
+    
+    Filled from a single enumeration of the policy rule collection and kept
+    up to date by the owner on every add/remove. The total policy rule count
+    is remembered so changes made outside the app can be detected cheaply.
+    
+    The count is the only staleness check (besides max_age): it costs one
+    COM Rules.Count call per lookup, and an outside edit that leaves the
+    count unchanged (a rule removed and another added) is not seen by it.
+    Owners should confirm individual lookups with a keyed Rules.Item call
+    and correct the index (add/discard) when it disagrees; that moves
+    policy_count off the real count, so the next check rebuilds.
+    
+    fingerprint is an order-independent hash of the indexed rule set (XOR
+    of per-rule hashes), updated in O(1) per change, so two states of the
+    rule set can be compared without sorting or walking them. Like hash(),
+    it is only meaningful within one process.
+    """
+    
+    def __init__(self, max_age: float = RULE_INDEX_MAX_AGE):
+        self.max_age = max_age  # seconds, 0 disables age-based refresh
+        self.loaded = False
+        self.loaded_at = 0.0
+        self.policy_count = 0  # Total rules in policy at last sync
+        self._by_name: Dict[str, object] = {}
+        self._by_path: Dict[str, str] = {}  # normalized path -> rule name
+        self.fingerprint = 0
+    
+    def rebuild(self, rules: Iterable, make_record) -> int:
+        """
+        Rebuild the index from one pass over the policy rules.
+        
+        Args:
+            rules: Iterable of COM (or fake) rule objects
+            make_record: Callable turning a matching rule into a stored record
+            
+        Returns:
+            Number of app rules indexed
+        """
+        self._by_name.clear()
+        self._by_path.clear()
+        self.fingerprint = 0
+        total = 0
+        for rule in rules:
+            total += 1
+            if rule.Name.startswith(RULE_PREFIX):
+                self.add(make_record(rule), adjust_count=False)
+        self.policy_count = total
+        self.loaded = True
+        self.loaded_at = time.monotonic()
+        return len(self._by_name)
+    
+    def invalidate(self):
+        """Mark index as stale so the next lookup triggers a rebuild."""
+        self.loaded = False
+    
+    def is_stale(self, policy_count: Optional[int] = None) -> bool:
+        """
+        Check whether the index needs a rebuild.
+        
+        Args:
+            policy_count: Current total rule count of the policy, if known
+        """
+        if not self.loaded:
+            return True
+        if policy_count is not None and policy_count != self.policy_count:
+            return True
+        if self.max_age and time.monotonic() - self.loaded_at > self.max_age:
+            return True
+        return False
+    
+    def add(self, record, adjust_count: bool = True):
+        """Add or replace a rule record (needs .name and .app_path)."""
+        previous = self._by_name.get(record.name)
+        if previous is None and adjust_count:
+            self.policy_count += 1
+        elif previous is not None:
+            self._drop_path(previous)
+            self.fingerprint ^= self._rule_hash(previous)
+        self._by_name[record.name] = record
+        self.fingerprint ^= self._rule_hash(record)
+        if record.app_path:
+            self._by_path[normalize_path(record.app_path)] = record.name
+    
+    def discard(self, rule_name: str):
+        """Remove a rule record by name (no error if missing)."""
+        record = self._by_name.pop(rule_name, None)
+        if record is not None:
+            self.policy_count -= 1
+            self._drop_path(record)
+            self.fingerprint ^= self._rule_hash(record)
+    
+    def get(self, rule_name: str):
+        """Get rule record by name."""
+        return self._by_name.get(rule_name)
+    
+    def get_by_path(self, app_path: str):
+        """Get rule record by application path (normalized)."""
+        rule_name = self._by_path.get(normalize_path(app_path))
+        return self._by_name.get(rule_name) if rule_name else None
+    
+    def records(self) -> List:
+        """Get all indexed rule records."""
+        return list(self._by_name.values())
+    
+    def __contains__(self, rule_name: str) -> bool:
+        return rule_name in self._by_name
+    
+    def __len__(self) -> int:
+        return len(self._by_name)
+    
+    @staticmethod
+    def _rule_hash(record) -> int:
+        """Hash of one rule's identity (name and application path)."""
+        return hash((record.name, normalize_path(record.app_path)))
+    
+    def _drop_path(self, record):
+        """Remove path mapping of a record if it still points to it."""
+        if record.app_path:
+            key = normalize_path(record.app_path)
+            if self._by_path.get(key) == record.name:
+                del self._by_path[key]
@@ -1,8 +1,9 @@
 """
 Safety module - Critical system protections and emergency reset functionality
 """
-import win32com.client
-from config import RULE_PREFIX
+from typing import Callable, Iterable, List
+from app_registry import open_registry
+from reset_engine import ResetEngine
 
 # Critical services that should NEVER be blocked
 CORE_WHITELIST = {
@@ -46,47 +47,51 @@ def is_safe_to_block(app_path: str = None, port: int = None, ip: str = None) ->
     
     return True, ""
 
-def emergency_reset() -> tuple[int, list[str]]:
+def triage_new_apps(app_paths: Iterable[str], is_known: Callable[[str], bool]) -> List[str]:
     """
-    Remove ALL rules created by this application.
+    Reduce a batch of newly detected apps to the ones to auto-block.
+    
+    Drops duplicates, apps already in the registry and apps that are not
+    safe to block.
+    
+    Args:
+        app_paths: Detected executable paths
+        is_known: Registry membership check (whitelist or blacklist)
+        
+    Returns:
+        Sorted list of paths to block
+    """
+    return sorted(app_path for app_path in set(app_paths)
+                  if app_path and not is_known(app_path) and is_safe_to_block(app_path=app_path)[0])
+
+def emergency_reset(progress: Callable[[int, int], None] = None, registry=None) -> tuple[int, list[str]]:
+    """
+    Remove ALL rules created by this application and clear the whitelist
+    and blacklist (both are backed up first, like the GUI and script reset).
+    
+    Args:
+        progress: Called with (removed so far, total) after each batch
+        registry: Registry to clear (default: the app's registry, opened and closed here)
     
     Returns:
         (count, errors) - Number of rules removed and list of any errors
     """
+    owns_registry = registry is None
     try:
-        fw_policy = win32com.client.Dispatch("HNetCfg.FwPolicy2")
-        rules = fw_policy.Rules
-        
-        removed_count = 0
-        errors = []
-        
-        # Collect rules to remove (can't modify collection while iterating)
-        rules_to_remove = []
-        for rule in rules:
-            if rule.Name.startswith(RULE_PREFIX):
-                rules_to_remove.append(rule.Name)
-        
-        # Remove collected rules
-        for rule_name in rules_to_remove:
-            try:
-                rules.Remove(rule_name)
-                removed_count += 1
-            except Exception as e:
-                errors.append(f"Failed to remove {rule_name}: {str(e)}")
-        
-        return removed_count, errors
-    
+        if owns_registry:
+            registry = open_registry()
+        try:
+            result = ResetEngine(registry=registry).reset(progress=progress)
+        finally:
+            if owns_registry:
+                registry.close()
     except Exception as e:
         return 0, [f"Emergency reset failed: {str(e)}"]
+    return result.count, result.errors
 
 def get_app_rules_count() -> int:
     """Get count of rules created by this app."""
     try:
-        fw_policy = win32com.client.Dispatch("HNetCfg.FwPolicy2")
-        count = 0
-        for rule in fw_policy.Rules:
-            if rule.Name.startswith(RULE_PREFIX):
-                count += 1
-        return count
-    except:
+        return ResetEngine().count()
+    except Exception:
         return 0
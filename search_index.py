@@ -0,0 +1,171 @@
+"""
+Search Index - Incremental substring index over app and connection fields
+"""
+import re
+from typing import Collection, Dict, Hashable, List, Optional, Set, Tuple
+
+_WORD = re.compile(r'\w+')  # Paths/addresses split on \ / . : space - etc.
+GRAM = 3
+
+def _grams(word: str) -> Set[str]:
+    """Trigrams of a word."""
+    return {word[i:i + GRAM] for i in range(len(word) - GRAM + 1)}
+
+class SearchIndex:
+    """
+    Case-insensitive substring search over a few text fields per key.
+    
+    Rows share most of their values (a process path appears on every
+    connection it owns), so the index is layered on distinct values:
+    trigram -> words -> field values ("tokens") -> keys. Memory grows with
+    the vocabulary rather than the row count, and a query only touches the
+    tokens containing its rarest word. add()/discard() keep every layer
+    up to date, so nothing is rebuilt when rows change.
+    
+    A query is split on whitespace; a key matches if every term is a
+    substring of one of its fields.
+    """
+    
+    def __init__(self):
+        self._fields: Dict[Hashable, Tuple[str, ...]] = {}  # key -> lowercased fields
+        self._token_keys: Dict[str, Set[Hashable]] = {}
+        self._word_tokens: Dict[str, Set[str]] = {}
+        self._gram_words: Dict[str, Set[str]] = {}
+    
+    def add(self, key: Hashable, *fields) -> bool:
+        """
+        Index key under the given field values (replaces earlier values).
+        
+        Returns:
+            True if the indexed values changed
+        """
+        tokens = tuple(dict.fromkeys(str(field).lower() for field in fields if field != ''))
+        old = self._fields.get(key)
+        if old == tokens:
+            return False
+        if old is not None:
+            self._unlink(key, old)
+        self._fields[key] = tokens
+        for token in tokens:
+            keys = self._token_keys.get(token)
+            if keys is None:
+                keys = self._token_keys[token] = set()
+                self._add_token(token)
+            keys.add(key)
+        return True
+    
+    def discard(self, key: Hashable) -> bool:
+        """Remove key from the index; False if it wasn't indexed."""
+        tokens = self._fields.pop(key, None)
+        if tokens is None:
+            return False
+        self._unlink(key, tokens)
+        return True
+    
+    def clear(self):
+        """Remove everything."""
+        self._fields.clear()
+        self._token_keys.clear()
+        self._word_tokens.clear()
+        self._gram_words.clear()
+    
+    def search(self, query: str) -> Optional[Set[Hashable]]:
+        """
+        Keys matching every term of query.
+        
+        Returns:
+            Set of keys, or None for an empty query (no filter)
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        
+        terms = sorted(set(terms), key=len, reverse=True)  # Longest is usually most selective
+        tokens = self._match_tokens(terms[0])
+        if len(tokens) == len(self._token_keys):
+            result = set(self._fields)  # Every value matches (e.g. ".exe")
+        else:
+            result = set().union(*(self._token_keys[token] for token in tokens))
+        if len(terms) > 1 and result:
+            rest = terms[1:]
+            fields = self._fields
+            result = {key for key in result
+                      if all(any(term in token for token in fields[key]) for term in rest)}
+        return result
+    
+    def matches(self, key: Hashable, query: str) -> bool:
+        """True if key is indexed and matches query (empty query matches all)."""
+        tokens = self._fields.get(key)
+        if tokens is None:
+            return False
+        return all(any(term in token for token in tokens) for term in query.lower().split())
+    
+    def _match_tokens(self, term: str) -> List[str]:
+        """Indexed field values containing term."""
+        pieces = _WORD.findall(term)
+        if not pieces:  # Only separators, e.g. "::"
+            return [token for token in self._token_keys if term in token]
+        
+        anchor = max(pieces, key=len)
+        words = self._match_words(anchor)
+        if len(words) > len(self._token_keys) // 8:
+            return [token for token in self._token_keys if term in token]  # Broad query: scan is cheaper
+        tokens = set()
+        for word in words:
+            tokens.update(self._word_tokens[word])
+        if term == anchor:
+            return list(tokens)  # A token containing the word contains the term
+        return [token for token in tokens if term in token]
+    
+    def _match_words(self, piece: str) -> Collection[str]:
+        """Words containing piece (trigram lookup, scan for short pieces)."""
+        if len(piece) < GRAM:
+            return [word for word in self._word_tokens if piece in word]
+        
+        candidates = None
+        for gram in sorted(_grams(piece), key=lambda gram: len(self._gram_words.get(gram, ()))):
+            words = self._gram_words.get(gram)
+            if not words:
+                return ()
+            candidates = set(words) if candidates is None else candidates & words
+            if not candidates:
+                return ()
+        if len(piece) == GRAM:
+            return candidates
+        return [word for word in candidates if piece in word]
+    
+    def _add_token(self, token: str):
+        """Link a new distinct value into the word and trigram layers."""
+        for word in set(_WORD.findall(token)):
+            tokens = self._word_tokens.get(word)
+            if tokens is None:
+                tokens = self._word_tokens[word] = set()
+                for gram in _grams(word):
+                    self._gram_words.setdefault(gram, set()).add(word)
+            tokens.add(token)
+    
+    def _unlink(self, key: Hashable, tokens: Tuple[str, ...]):
+        """Drop key from its tokens, and tokens/words nothing refers to anymore."""
+        for token in tokens:
+            keys = self._token_keys[token]
+            keys.discard(key)
+            if keys:
+                continue
+            del self._token_keys[token]
+            for word in set(_WORD.findall(token)):
+                word_tokens = self._word_tokens[word]
+                word_tokens.discard(token)
+                if word_tokens:
+                    continue
+                del self._word_tokens[word]
+                for gram in _grams(word):
+                    gram_words = self._gram_words[gram]
+                    gram_words.discard(word)
+                    if not gram_words:
+                        del self._gram_words[gram]
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fields
+    
+    def __len__(self) -> int:
+        return len(self._fields)
@@ -0,0 +1,329 @@
+"""
+SQLite Registry - AppRegistry backend on sqlite3 (WAL) with indexed queries and decision history
+"""
+import json
+import ntpath
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+from config import DEFAULT_SETTINGS, REGISTRY_DB_FILE, SETTINGS_FILE
+from paths import normalize_path
+from persistence import atomic_write_json
+from registry_storage import read_json_state
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    path_key   TEXT PRIMARY KEY,  -- normalize_path(app_path)
+    app_path   TEXT NOT NULL,     -- path as first/last decided
+    basename   TEXT NOT NULL,     -- case-folded file name
+    list       TEXT,              -- 'whitelist', 'blacklist' or NULL (forgotten/seen only)
+    decided_at REAL,
+    first_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_apps_list ON apps(list, app_path);
+CREATE INDEX IF NOT EXISTS idx_apps_basename ON apps(basename);
+CREATE INDEX IF NOT EXISTS idx_apps_decided_at ON apps(decided_at);
+DROP INDEX IF EXISTS idx_apps_first_seen;  -- Only read per app (by path_key)
+
+CREATE TABLE IF NOT EXISTS decisions (
+    id       INTEGER PRIMARY KEY,
+    path_key TEXT NOT NULL,
+    app_path TEXT NOT NULL,
+    decision TEXT NOT NULL,       -- 'whitelist', 'blacklist', 'forget'
+    ts       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_path ON decisions(path_key, ts);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL           -- JSON encoded
+);
+"""
+
+LIST_TYPES = ('whitelist', 'blacklist')
+
+class SqliteAppRegistry:
+    """
+    Drop-in alternative to AppRegistry backed by SQLite.
+    
+    Lists are not held in memory: membership checks, counts and paged,
+    filtered listings run as indexed queries. Every decision is also
+    appended to a history table. Each thread gets its own connection; WAL
+    mode lets readers run concurrently with the (serialized) writer.
+    """
+    
+    in_memory = False  # Queries hit the database
+    
+    def __init__(self, db_file: str = None, import_from: str = None):
+        """
+        Args:
+            db_file: SQLite database path
+            import_from: JSON settings file imported when the database is new
+        """
+        self.db_file = db_file or REGISTRY_DB_FILE
+        self.pending_decisions: Set[str] = set()  # Apps waiting for user decision
+        self.revision = 0  # Bumped on every whitelist/blacklist change
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        
+        is_new = not os.path.exists(self.db_file)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self.settings: Dict = DEFAULT_SETTINGS.copy()  # User settings (small, cached)
+        for key, value in conn.execute("SELECT key, value FROM settings"):
+            self.settings[key] = json.loads(value)
+        
+        if is_new and import_from and os.path.exists(import_from):
+            self.import_json(import_from)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get connection for the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _set_list(self, app_paths: List[str], list_type: Optional[str], decision: str):
+        """Move apps into a list (or out of both for None) and log the decision."""
+        with self._write_lock:
+            self._transaction(lambda conn, now: self._write_list(conn, now, app_paths, list_type, decision))
+            self.revision += 1
+        for app_path in app_paths:
+            self.pending_decisions.discard(app_path)
+    
+    def _transaction(self, write: Callable):
+        """Run write(conn, now) in one transaction (write lock held)."""
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            write(conn, time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    @staticmethod
+    def _write_list(conn, now: float, app_paths: List[str], list_type: Optional[str], decision: str):
+        """Set apps' list and append the decisions (inside a transaction)."""
+        rows = [(normalize_path(p), p, ntpath.basename(normalize_path(p))) for p in app_paths]
+        if list_type is None:
+            conn.executemany(
+                "UPDATE apps SET list = NULL, decided_at = ? WHERE path_key = ?",
+                [(now, key) for key, _, _ in rows]
+            )
+        else:
+            conn.executemany(
+                "INSERT INTO apps (path_key, app_path, basename, list, decided_at, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path_key) DO UPDATE SET "
+                "app_path = excluded.app_path, list = excluded.list, decided_at = excluded.decided_at",
+                [(key, path, base, list_type, now, now) for key, path, base in rows]
+            )
+        conn.executemany(
+            "INSERT INTO decisions (path_key, app_path, decision, ts) VALUES (?, ?, ?, ?)",
+            [(key, path, decision, now) for key, path, _ in rows]
+        )
+    
+    @staticmethod
+    def _clear_all(conn, now: float):
+        """Forget every listed app, logging 'forget' decisions (inside a transaction)."""
+        conn.execute(
+            "INSERT INTO decisions (path_key, app_path, decision, ts) "
+            "SELECT path_key, app_path, 'forget', ? FROM apps WHERE list IS NOT NULL",
+            (now,)
+        )
+        conn.execute("UPDATE apps SET list = NULL, decided_at = ? WHERE list IS NOT NULL", (now,))
+    
+    def _list_of(self, app_path: str) -> Optional[str]:
+        """Get list an app belongs to (None if unknown)."""
+        row = self._conn().execute(
+            "SELECT list FROM apps WHERE path_key = ?", (normalize_path(app_path),)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def get_setting(self, key: str):
+        """Get a setting value."""
+        return self.settings.get(key, DEFAULT_SETTINGS.get(key))
+    
+    def update_setting(self, key: str, value):
+        """Update a setting value."""
+        self.settings[key] = value
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+    
+    def is_whitelisted(self, app_path: str) -> bool:
+        """Check if app is in whitelist."""
+        return self._list_of(app_path) == 'whitelist'
+    
+    def is_blacklisted(self, app_path: str) -> bool:
+        """Check if app is in blacklist."""
+        return self._list_of(app_path) == 'blacklist'
+    
+    def is_known(self, app_path: str) -> bool:
+        """Check if app decision was made (in whitelist or blacklist)."""
+        return self._list_of(app_path) is not None
+    
+    def add_to_whitelist(self, app_path: str):
+        """Add app to whitelist."""
+        self._set_list([app_path], 'whitelist', 'whitelist')
+    
+    def add_to_blacklist(self, app_path: str):
+        """Add app to blacklist."""
+        self._set_list([app_path], 'blacklist', 'blacklist')
+    
+    def add_many_to_whitelist(self, app_paths: list):
+        """Add several apps to whitelist in one transaction."""
+        self._set_list(list(app_paths), 'whitelist', 'whitelist')
+    
+    def add_many_to_blacklist(self, app_paths: list):
+        """Add several apps to blacklist in one transaction."""
+        self._set_list(list(app_paths), 'blacklist', 'blacklist')
+    
+    def remove_from_whitelist(self, app_path: str):
+        """Remove app from whitelist."""
+        if self.is_whitelisted(app_path):
+            self._set_list([app_path], None, 'forget')
+    
+    def remove_from_blacklist(self, app_path: str):
+        """Remove app from blacklist."""
+        if self.is_blacklisted(app_path):
+            self._set_list([app_path], None, 'forget')
+    
+    def forget_app(self, app_path: str):
+        """Remove app from both lists (will ask again on next connection)."""
+        self._set_list([app_path], None, 'forget')
+    
+    def mark_seen(self, app_path: str):
+        """Record first-seen time of an app without making a decision."""
+        self.mark_seen_many([app_path])
+    
+    def mark_seen_many(self, app_paths: list):
+        """Record first-seen time of apps the monitor just detected (known apps keep theirs)."""
+        now = time.time()
+        rows = [(normalize_path(p), p, ntpath.basename(normalize_path(p)), now) for p in app_paths]
+        with self._write_lock:
+            self._conn().executemany(
+                "INSERT OR IGNORE INTO apps (path_key, app_path, basename, list, decided_at, first_seen) "
+                "VALUES (?, ?, ?, NULL, NULL, ?)",
+                rows
+            )
+    
+    def get_first_seen(self, app_path: str) -> Optional[float]:
+        """When the app was first detected or decided on (None if never)."""
+        row = self._conn().execute(
+            "SELECT first_seen FROM apps WHERE path_key = ?", (normalize_path(app_path),)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def clear_lists(self):
+        """Remove all apps from whitelist and blacklist (logged as 'forget' decisions)."""
+        with self._write_lock:
+            self._transaction(self._clear_all)
+            self.revision += 1
+        self.pending_decisions.clear()
+    
+    def get_whitelist(self) -> list:
+        """Get list of whitelisted apps."""
+        return self.query_apps('whitelist')
+    
+    def get_blacklist(self) -> list:
+        """Get list of blacklisted apps."""
+        return self.query_apps('blacklist')
+    
+    def query_apps(self, list_type: str, search: str = None, offset: int = 0, limit: int = None) -> List[str]:
+        """
+        Get one page of a list, sorted by path.
+        
+        Args:
+            list_type: 'whitelist' or 'blacklist'
+            search: Case-insensitive substring of the path to filter by
+            offset: Number of matching apps to skip
+            limit: Maximum number of apps to return (None = all)
+        """
+        sql, params = self._list_query("SELECT app_path", list_type, search)
+        sql += " ORDER BY app_path LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return [row[0] for row in self._conn().execute(sql, params)]
+    
+    def count_apps(self, list_type: str, search: str = None) -> int:
+        """Count apps in a list (optionally filtered by path substring)."""
+        sql, params = self._list_query("SELECT COUNT(*)", list_type, search)
+        return self._conn().execute(sql, params).fetchone()[0]
+    
+    def get_history(self, app_path: str = None, limit: int = 100) -> List[tuple]:
+        """
+        Get most recent decisions, newest first.
+        
+        Returns:
+            List of (app_path, decision, timestamp)
+        """
+        if app_path:
+            rows = self._conn().execute(
+                "SELECT app_path, decision, ts FROM decisions WHERE path_key = ? ORDER BY ts DESC, id DESC LIMIT ?",
+                (normalize_path(app_path), limit)
+            )
+        else:
+            rows = self._conn().execute(
+                "SELECT app_path, decision, ts FROM decisions ORDER BY id DESC LIMIT ?", (limit,)
+            )
+        return rows.fetchall()
+    
+    def export_json(self, path: str):
+        """Export lists and settings in the standard settings JSON format."""
+        atomic_write_json(path, {
+            'whitelist': self.get_whitelist(),
+            'blacklist': self.get_blacklist(),
+            'settings': dict(self.settings)
+        })
+    
+    def import_json(self, path: str):
+        """Replace lists and settings with the contents of a JSON export (all or nothing)."""
+        data = read_json_state(path)
+        settings = DEFAULT_SETTINGS.copy()
+        settings.update(data['settings'])
+        
+        def write(conn, now: float):
+            self._clear_all(conn, now)
+            self._write_list(conn, now, data['whitelist'], 'whitelist', 'whitelist')
+            self._write_list(conn, now, data['blacklist'], 'blacklist', 'blacklist')
+            conn.execute("DELETE FROM settings")
+            conn.executemany(
+                "INSERT INTO settings (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in data['settings'].items()]
+            )
+        
+        with self._write_lock:
+            self._transaction(write)
+            self.settings = settings
+            self.revision += 1
+        self.pending_decisions.clear()
+    
+    def flush(self):
+        """Writes are committed immediately; nothing to flush."""
+    
+    def close(self):
+        """Close the current thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    @staticmethod
+    def _list_query(select: str, list_type: str, search: str = None) -> tuple:
+        """Build filtered list query."""
+        if list_type not in LIST_TYPES:
+            raise ValueError(f"Unknown list: {list_type}")
+        sql = f"{select} FROM apps WHERE list = ?"
+        params = [list_type]
+        if search:
+            sql += " AND path_key LIKE ? ESCAPE '\\'"
+            escaped = search.casefold().replace('/', '\\').replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        return sql, params
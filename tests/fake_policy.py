@@ -0,0 +1,64 @@
+"""Fake HNetCfg.FwPolicy2 stand-in for tests and benchmarks (no COM needed)"""
+
+
+class FakeFwRule:
+    """Mimics the attributes of an HNetCfg.FwRule COM object."""
+    
+    def __init__(self, name: str = "", app_path: str = "", direction: int = 2, enabled: bool = True):
+        self.Name = name
+        self.Description = ""
+        self.ApplicationName = app_path
+        self.Action = 0
+        self.Direction = direction
+        self.Enabled = enabled
+
+
+class FakeRules:
+    """Mimics the INetFwRules collection (name-keyed, insertion ordered)."""
+    
+    def __init__(self):
+        self._rules = {}
+        self.enumerations = 0  # Number of full scans performed
+    
+    def __iter__(self):
+        self.enumerations += 1
+        return iter(list(self._rules.values()))
+    
+    @property
+    def Count(self) -> int:
+        return len(self._rules)
+    
+    def Add(self, rule):
+        self._rules[rule.Name] = rule
+    
+    def Remove(self, name: str):
+        self._rules.pop(name, None)
+    
+    def Item(self, name: str):
+        try:
+            return self._rules[name]
+        except KeyError:
+            raise Exception(f"Rule not found: {name}")
+
+
+class FakeFwPolicy2:
+    """Mimics the subset of HNetCfg.FwPolicy2 used by WinNetGuard."""
+    
+    def __init__(self, system_rules: int = 0):
+        self.Rules = FakeRules()
+        self.add_system_rules(system_rules)
+    
+    def add_system_rules(self, count: int):
+        """Fill policy with unrelated (non-WinNetGuard) rules."""
+        start = self.Rules.Count
+        for i in range(start, start + count):
+            self.Rules.Add(FakeFwRule(
+                name=f"System Rule {i}",
+                app_path=f"C:\\Windows\\System32\\svc{i}.exe",
+                direction=1 if i % 2 else 2
+            ))
+
+
+def fake_rule_factory() -> FakeFwRule:
+    """Create empty fake rule (replaces Dispatch("HNetCfg.FwRule"))."""
+    return FakeFwRule()
@@ -0,0 +1,57 @@
+"""Synthetic /proc tree with socket tables for tests and benchmarks"""
+import os
+import socket
+import struct
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+
+
+def encode_ipv4(ip: str, port: int) -> str:
+    """Encode address the way /proc/net/tcp prints it (little-endian host)."""
+    packed = struct.unpack('<I', socket.inet_aton(ip))[0]
+    return f"{packed:08X}:{port:04X}"
+
+
+class FakeProcfs:
+    """
+    Build a directory that looks like /proc to ProcNetReader and psutil.
+    
+    Sockets are added with add_socket(); write() lays out net/tcp and
+    <pid>/fd/<n> -> "socket:[inode]" symlinks.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        self.sockets = []  # (pid, fd, inode, local, remote, state)
+        self._next_inode = 10000
+        self._next_fd = {}
+    
+    def add_socket(self, pid: int, local: tuple, remote: tuple = ('0.0.0.0', 0), state: str = '01',
+                   owned: bool = True) -> str:
+        """Add a TCP socket; returns its inode. owned=False leaves it without a process (inode 0)."""
+        if owned:
+            self._next_inode += 1
+            inode = str(self._next_inode)
+            fd = self._next_fd.get(pid, 3)
+            self._next_fd[pid] = fd + 1
+        else:
+            inode, fd = '0', None
+        self.sockets.append((pid, fd, inode, local, remote, state))
+        return inode
+    
+    def write(self):
+        """Write the tree to disk."""
+        net_dir = os.path.join(self.root, 'net')
+        os.makedirs(net_dir, exist_ok=True)
+        with open(os.path.join(net_dir, 'tcp'), 'w') as f:
+            f.write(HEADER)
+            for sl, (pid, fd, inode, local, remote, state) in enumerate(self.sockets):
+                f.write(f"{sl:4}: {encode_ipv4(*local)} {encode_ipv4(*remote)} {state} "
+                        f"00000000:00000000 00:00000000 00000000  1000        0 {inode} 1 0000000000000000 20 4 30 10 -1\n")
+        open(os.path.join(net_dir, 'udp'), 'w').write(HEADER)
+        
+        for pid, fd, inode, *_ in self.sockets:
+            fd_dir = os.path.join(self.root, str(pid), 'fd')
+            os.makedirs(fd_dir, exist_ok=True)
+            if fd is not None and not os.path.lexists(os.path.join(fd_dir, str(fd))):
+                os.symlink(f"socket:[{inode}]", os.path.join(fd_dir, str(fd)))
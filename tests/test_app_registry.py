@@ -3,7 +3,8 @@ import unittest
 import os
 import json
 import tempfile
-from app_registry import AppRegistry
+from app_registry import AppRegistry, open_registry
+from registry_storage import JournalStorage
 
 
 class TestAppRegistry(unittest.TestCase):
@@ -17,6 +18,7 @@ class TestAppRegistry(unittest.TestCase):
     
     def tearDown(self):
         """Clean up temporary file."""
+        self.registry.close()
         if os.path.exists(self.temp_file.name):
             os.unlink(self.temp_file.name)
     
@@ -64,6 +66,22 @@ class TestAppRegistry(unittest.TestCase):
         self.assertNotIn(app_path, self.registry.blacklist)
         self.assertIn(app_path, self.registry.whitelist)
     
+    def test_add_many_to_whitelist(self):
+        """Test adding several apps to whitelist at once."""
+        apps = ["C:\\Test\\app1.exe", "C:\\Test\\app2.exe"]
+        self.registry.add_to_blacklist(apps[0])
+        self.registry.add_many_to_whitelist(apps)
+        self.assertEqual(self.registry.get_whitelist(), sorted(apps))
+        self.assertEqual(self.registry.get_blacklist(), [])
+    
+    def test_add_many_to_blacklist(self):
+        """Test adding several apps to blacklist with one save."""
+        apps = ["C:\\Test\\app1.exe", "C:\\Test\\app2.exe"]
+        self.registry.add_many_to_blacklist(apps)
+        self.registry.flush()
+        new_registry = AppRegistry(settings_file=self.temp_file.name)
+        self.assertEqual(new_registry.get_blacklist(), sorted(apps))
+    
     def test_forget_app(self):
         """Test forgetting app removes from both lists."""
         app_path = "C:\\Test\\app.exe"
@@ -93,6 +111,43 @@ class TestAppRegistry(unittest.TestCase):
         self.registry.add_to_whitelist(app_path)
         self.assertTrue(self.registry.is_known(app_path))
     
+    def test_lookup_is_normalized(self):
+        """Test lookups ignore case, separators and long-path prefix."""
+        self.registry.add_to_blacklist("C:\\Test\\App.exe")
+        self.assertTrue(self.registry.is_blacklisted("c:/test/app.EXE"))
+        self.assertTrue(self.registry.is_known("\\\\?\\C:\\Test\\app.exe"))
+        self.assertFalse(self.registry.is_whitelisted("C:\\Test\\App.exe"))
+    
+    def test_move_between_lists_with_different_spelling(self):
+        """Test equivalent path spellings don't end up in both lists."""
+        self.registry.add_to_blacklist("C:\\Test\\App.exe")
+        self.registry.add_to_whitelist("c:\\test\\app.exe")
+        self.assertEqual(self.registry.get_blacklist(), [])
+        self.assertEqual(self.registry.get_whitelist(), ["c:\\test\\app.exe"])
+    
+    def test_forget_with_different_spelling(self):
+        """Test forgetting app by equivalent path spelling."""
+        self.registry.add_to_whitelist("C:\\Test\\App.exe")
+        self.registry.forget_app("C:/TEST/APP.EXE")
+        self.assertFalse(self.registry.is_known("C:\\Test\\App.exe"))
+        self.assertEqual(self.registry.whitelist, set())
+    
+    def test_clear_lists(self):
+        """Test clearing both lists."""
+        self.registry.add_to_whitelist("C:\\Test\\app1.exe")
+        self.registry.add_to_blacklist("C:\\Test\\app2.exe")
+        self.registry.clear_lists()
+        self.assertFalse(self.registry.is_known("C:\\Test\\app1.exe"))
+        self.assertFalse(self.registry.is_known("C:\\Test\\app2.exe"))
+    
+    def test_revision(self):
+        """Test list changes bump the revision, settings don't."""
+        revision = self.registry.revision
+        self.registry.add_to_blacklist("C:\\Test\\app.exe")
+        self.assertEqual(self.registry.revision, revision + 1)
+        self.registry.update_setting('ui_font_size', 14)
+        self.assertEqual(self.registry.revision, revision + 1)
+    
     def test_update_setting(self):
         """Test updating a setting."""
         self.registry.update_setting('ui_font_size', 14)
@@ -103,12 +158,48 @@ class TestAppRegistry(unittest.TestCase):
         app_path = "C:\\Test\\app.exe"
         self.registry.add_to_whitelist(app_path)
         self.registry.update_setting('ui_font_size', 16)
+        self.registry.flush()
         
         # Create new registry instance with same file
         new_registry = AppRegistry(settings_file=self.temp_file.name)
         self.assertIn(app_path, new_registry.whitelist)
         self.assertEqual(new_registry.get_setting('ui_font_size'), 16)
     
+    def test_saves_are_coalesced(self):
+        """Test many mutations result in a single write."""
+        for i in range(100):
+            self.registry.add_to_blacklist(f"C:\\Test\\app{i}.exe")
+        self.registry.flush()
+        self.assertEqual(self.registry.storage.write_count, 1)
+        with open(self.temp_file.name, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['blacklist']), 100)
+    
+    def test_close_flushes(self):
+        """Test pending changes are written on close."""
+        self.registry.add_to_whitelist("C:\\Test\\app.exe")
+        self.registry.close()
+        new_registry = AppRegistry(settings_file=self.temp_file.name)
+        self.assertTrue(new_registry.is_whitelisted("C:\\Test\\app.exe"))
+    
+    def test_query_apps(self):
+        """Test paged and filtered listing."""
+        self.registry.add_many_to_blacklist([f"C:\\Apps\\tool{i:02d}.exe" for i in range(30)])
+        self.registry.add_to_blacklist("C:\\Other\\chrome.exe")
+        self.assertEqual(
+            self.registry.query_apps('blacklist', offset=5, limit=3),
+            ["C:\\Apps\\tool05.exe", "C:\\Apps\\tool06.exe", "C:\\Apps\\tool07.exe"]
+        )
+        self.assertEqual(self.registry.query_apps('blacklist', search="Chrome"), ["C:\\Other\\chrome.exe"])
+        self.assertEqual(self.registry.count_apps('blacklist'), 31)
+        self.assertEqual(self.registry.count_apps('blacklist', search="apps/tool1"), 10)
+        self.assertEqual(self.registry.count_apps('whitelist'), 0)
+    
+    def test_open_registry(self):
+        """Test registry factory picks the storage backend."""
+        registry = open_registry("journal", settings_file=self.temp_file.name)
+        self.assertIsInstance(registry.storage, JournalStorage)
+        registry.close()
+    
     def test_get_whitelist(self):
         """Test getting whitelist as list."""
         apps = ["C:\\Test\\app1.exe", "C:\\Test\\app2.exe"]
@@ -0,0 +1,191 @@
+"""Tests for asyncio facade module"""
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from app_registry import AppRegistry
+from async_api import AsyncFirewall, AsyncMonitor, AsyncRegistry, SUPERSEDED
+from firewall_manager import FirewallManager
+from firewall_worker import FirewallWorker
+from monitor import Connection, ConnectionDelta, NetworkMonitor
+from sqlite_registry import SqliteAppRegistry
+from tests.fake_policy import FakeFwPolicy2, fake_rule_factory
+
+
+def make_connection(port: int) -> Connection:
+    return Connection("app.exe", "C:\\Apps\\app.exe", 100, "127.0.0.1", port,
+                      "10.0.0.1", 443, "ESTABLISHED", "TCP")
+
+
+def publish_from_thread(monitor: NetworkMonitor, *ports: int):
+    """Publish one tick per port from another thread, like the monitor loop."""
+    def run():
+        for port in ports:
+            conn = make_connection(port)
+            monitor._publish([conn], ConnectionDelta(opened=[conn], total=1))
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+
+class TestAsyncMonitor(unittest.IsolatedAsyncioTestCase):
+    """Test async iteration over monitor snapshots."""
+    
+    async def asyncSetUp(self):
+        self.monitor = NetworkMonitor()
+        self.facade = AsyncMonitor(self.monitor)
+    
+    async def asyncTearDown(self):
+        self.facade.close()
+    
+    async def test_consumers_share_one_subscription(self):
+        """Test many consumers are served from a single monitor subscription."""
+        iterators = [self.facade.snapshots(current=True) for _ in range(200)]
+        for iterator in iterators:
+            await iterator.__anext__()  # Registers the consumer
+        self.assertEqual(len(self.monitor._subscribers), 1)
+        self.assertEqual(self.facade.consumers(), 200)
+        
+        publish_from_thread(self.monitor, 1000)
+        snapshots = await asyncio.wait_for(asyncio.gather(*(it.__anext__() for it in iterators)), 5)
+        self.assertTrue(all(snapshot.version == 1 for snapshot in snapshots))
+        for iterator in iterators:
+            await iterator.aclose()
+        self.assertEqual(self.facade.consumers(), 0)
+    
+    async def test_lagging_consumer_gets_merged_delta(self):
+        """Test updates missed while not awaiting arrive as one merged delta."""
+        iterator = self.facade.deltas()
+        consumer = asyncio.ensure_future(iterator.__anext__())
+        await asyncio.sleep(0)  # Consumer registered and waiting
+        publish_from_thread(self.monitor, 1000)
+        first = await asyncio.wait_for(consumer, 5)
+        self.assertEqual(len(first.opened), 1)
+        
+        publish_from_thread(self.monitor, 1001, 1002)
+        await asyncio.sleep(0.01)
+        merged = await asyncio.wait_for(iterator.__anext__(), 5)
+        self.assertEqual(sorted(conn.local_port for conn in merged.opened), [1001, 1002])
+        await iterator.aclose()
+    
+    async def test_close_ends_iterators(self):
+        """Test close() finishes waiting consumers."""
+        async def consume():
+            return [snapshot async for snapshot in self.facade.snapshots()]
+        
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        self.facade.close()
+        self.assertEqual(await asyncio.wait_for(task, 5), [])
+        self.assertEqual(self.monitor._subscribers, ())
+
+
+class TestAsyncFirewall(unittest.IsolatedAsyncioTestCase):
+    """Test awaitable firewall operations."""
+    
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app = os.path.join(self.temp_dir, 'app.exe')
+        with open(self.app, 'w') as f:
+            f.write('')
+        self.worker = FirewallWorker(lambda: FirewallManager(fw_policy=FakeFwPolicy2(system_rules=100),
+                                                             rule_factory=fake_rule_factory))
+        self.worker.start()
+        self.firewall = AsyncFirewall(self.worker)
+    
+    async def asyncTearDown(self):
+        self.worker.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    async def test_block_unblock(self):
+        """Test block/unblock are awaitable and reach the worker."""
+        success, msg = await self.firewall.block(self.app)
+        self.assertTrue(success, msg)
+        self.assertTrue(await self.firewall.is_blocked(self.app))
+        success, msg = await self.firewall.unblock(self.app)
+        self.assertTrue(success, msg)
+        self.assertFalse(await self.firewall.is_blocked(self.app))
+    
+    async def test_apply_batch_concurrent(self):
+        """Test concurrent awaiters get per-path results."""
+        missing = os.path.join(self.temp_dir, 'missing.exe')
+        results, rules = await asyncio.gather(
+            self.firewall.apply_batch(block=[self.app, missing]),
+            self.firewall.get_active_rules()
+        )
+        self.assertTrue(results[self.app][0])
+        self.assertFalse(results[missing][0])
+        self.assertIsInstance(rules, list)
+    
+    def hold_worker(self, gate: threading.Event):
+        """Park the worker thread until gate is set, so commands stay pending."""
+        running = threading.Event()
+        self.worker.submit(lambda: (running.set(), gate.wait()))
+        running.wait(5)
+    
+    async def test_superseded_command_returns_result(self):
+        """Test a block superseded by an unblock returns a result instead of raising CancelledError."""
+        gate = threading.Event()
+        self.hold_worker(gate)
+        block = asyncio.ensure_future(self.firewall.block(self.app))
+        await asyncio.sleep(0)
+        unblock = asyncio.ensure_future(self.firewall.unblock(self.app))
+        await asyncio.sleep(0)
+        gate.set()
+        
+        self.assertEqual(await block, (False, SUPERSEDED))
+        self.assertIsInstance(await unblock, tuple)  # Ran: nothing to unblock
+        self.assertFalse(await self.firewall.is_blocked(self.app))
+    
+    async def test_task_cancel_cancels_command(self):
+        """Test cancelling the awaiting task still raises CancelledError and drops the command."""
+        gate = threading.Event()
+        self.hold_worker(gate)
+        task = asyncio.ensure_future(self.firewall.block(self.app))
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        gate.set()
+        self.assertFalse(await self.firewall.is_blocked(self.app))
+        self.assertEqual(self.worker.stats()['cancelled'], 1)
+
+
+class TestAsyncRegistry(unittest.IsolatedAsyncioTestCase):
+    """Test awaitable registry queries."""
+    
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    async def asyncTearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    async def test_in_memory_runs_inline(self):
+        """Test the in-memory registry is queried without an executor."""
+        registry = AppRegistry(settings_file=os.path.join(self.temp_dir, 'settings.json'))
+        registry.add_to_blacklist("C:\\Apps\\a.exe")
+        facade = AsyncRegistry(registry)
+        self.assertIsNone(facade.executor)
+        self.assertTrue(await facade.is_blacklisted("c:\\apps\\A.EXE"))
+        self.assertEqual(await facade.query_apps('blacklist', search="a.exe"), ["C:\\Apps\\a.exe"])
+        registry.close()
+    
+    async def test_sqlite_uses_one_thread(self):
+        """Test database queries run on the shared executor thread."""
+        registry = SqliteAppRegistry(db_file=os.path.join(self.temp_dir, 'registry.db'))
+        registry.add_many_to_blacklist([f"C:\\Apps\\{i}.exe" for i in range(10)])
+        facade = AsyncRegistry(registry)
+        self.assertIsNotNone(facade.executor)
+        counts = await asyncio.gather(*(facade.count_apps('blacklist') for _ in range(50)))
+        self.assertEqual(set(counts), {10})
+        self.assertTrue(await facade.is_known("C:\\Apps\\3.exe"))
+        self.assertEqual(len(facade.executor._threads), 1)
+        await facade.call(registry.close)
+        facade.close()
+        registry.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for connection sources module"""
+import unittest
+import subprocess
+import sys
+import time
+from connection_sources import PollingConnectionSource, ProcConnectorSource, create_connection_source
+from monitor import NetworkMonitor
+
+
+class ScriptedSource(PollingConnectionSource):
+    """Source returning no sockets, counting fetches."""
+    
+    def __init__(self):
+        super().__init__()
+        self.fetches = 0
+    
+    def fetch(self):
+        self.fetches += 1
+        return []
+
+
+class TestPollingConnectionSource(unittest.TestCase):
+    """Test polling fallback source."""
+    
+    def test_fetch_returns_list(self):
+        """Test fetch returns psutil connection records."""
+        source = PollingConnectionSource()
+        self.assertIsInstance(source.fetch(), list)
+    
+    def test_wait_times_out(self):
+        """Test wait returns False after the poll interval."""
+        source = PollingConnectionSource()
+        start = time.monotonic()
+        self.assertFalse(source.wait(0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+    
+    def test_wake_interrupts_wait(self):
+        """Test wake() triggers an immediate scan, once."""
+        source = PollingConnectionSource()
+        source.wake()
+        start = time.monotonic()
+        self.assertTrue(source.wait(5))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(source.wait(0.01))
+    
+    def test_restart_clears_stop_wakeup(self):
+        """Test a stop()/start() cycle doesn't leave an early wakeup behind."""
+        source = PollingConnectionSource()
+        source.start()
+        source.stop()
+        source.start()
+        self.assertFalse(source.wait(0.01))
+    
+    def test_factory_fallback(self):
+        """Test factory returns polling source when events are disabled."""
+        source = create_connection_source(event_driven=False)
+        self.assertFalse(source.event_driven)
+
+
+class TestMonitorWithSource(unittest.TestCase):
+    """Test NetworkMonitor driven by a connection source."""
+    
+    def test_monitor_uses_source(self):
+        """Test monitor fetches from its source and wakes early on events."""
+        source = ScriptedSource()
+        monitor = NetworkMonitor(update_interval=10, source=source)
+        monitor.start()
+        time.sleep(0.1)
+        self.assertEqual(source.fetches, 1)
+        
+        source.wake()
+        time.sleep(0.1)
+        self.assertEqual(source.fetches, 2)
+        
+        start = time.monotonic()
+        monitor.stop()
+        self.assertLess(time.monotonic() - start, 1)  # stop() doesn't wait out the interval
+
+
+class TestProcConnectorSource(unittest.TestCase):
+    """Test Linux proc connector source (needs CAP_NET_ADMIN)."""
+    
+    def setUp(self):
+        if not ProcConnectorSource.is_supported():
+            self.skipTest("Proc connector not supported on this platform")
+        self.source = ProcConnectorSource(settle_delay=0)
+        try:
+            self.source.start()
+        except OSError as e:
+            self.skipTest(f"Proc connector unavailable: {e}")
+    
+    def tearDown(self):
+        self.source.stop()
+    
+    def test_exec_wakes_source(self):
+        """Test starting a process triggers a scan before the poll interval."""
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        self.assertTrue(self.source.wait(5))
+        self.assertGreaterEqual(self.source.exec_events, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for connection table module"""
+import unittest
+import os
+import socket
+import time
+from connection_table import ConnectionTable, ConnectionView
+from connection_sources import PollingConnectionSource
+from monitor import NetworkMonitor, Connection, diff_connections
+from proc_net import Address, SocketEntry
+from tests.test_monitor import make_connection
+
+
+def socket_entries(count):
+    """psutil-style records owned by this process."""
+    return [SocketEntry(-1, socket.AF_INET, socket.SOCK_STREAM, Address('10.0.0.2', 20000 + i),
+                        Address('1.1.1.1', 443), 'ESTABLISHED', os.getpid())
+            for i in range(count)]
+
+
+class TestConnectionTable(unittest.TestCase):
+    """Test columnar snapshot storage."""
+    
+    def setUp(self):
+        self.connections = [make_connection(pid=pid) for pid in range(1, 6)]
+        self.table = ConnectionTable.from_connections(self.connections)
+    
+    def test_rows_match_connections(self):
+        """Test views expose the same attributes and compare equal."""
+        self.assertEqual(len(self.table), 5)
+        for view, conn in zip(self.table, self.connections):
+            self.assertEqual(view.pid, conn.pid)
+            self.assertEqual(view.process_path, conn.process_path)
+            self.assertEqual(view.local_port, conn.local_port)
+            self.assertEqual(view, conn)
+            self.assertEqual(Connection(*view.astuple()), conn)
+    
+    def test_indexing_and_slicing(self):
+        """Test list-style access."""
+        self.assertIsInstance(self.table[0], ConnectionView)
+        self.assertEqual(self.table[-1].pid, 5)
+        self.assertEqual([c.pid for c in self.table[1:3]], [2, 3])
+        with self.assertRaises(IndexError):
+            self.table[5]
+    
+    def test_strings_pooled(self):
+        """Test repeated strings are stored once."""
+        self.assertEqual(len(self.table._paths), 1)
+        self.assertEqual(len(self.table._addrs), 2)  # local + remote
+        self.assertEqual(self.table.nbytes(), 5 * (4 * 5 + 2 * 2 + 2))
+    
+    def test_diff_between_tables(self):
+        """Test diffing works on table rows."""
+        table, _ = diff_connections({}, self.table)
+        changed = ConnectionTable.from_connections(self.connections[:4] + [make_connection(pid=5, status="CLOSE_WAIT")])
+        _, delta = diff_connections(table, changed)
+        self.assertEqual([c.pid for c in delta.changed], [5])
+        self.assertTrue(not delta.opened and not delta.closed)
+    
+    def test_connection_has_no_dict(self):
+        """Test Connection is slotted."""
+        self.assertFalse(hasattr(make_connection(), '__dict__'))
+
+
+class TestMonitorColumnar(unittest.TestCase):
+    """Test NetworkMonitor switches to columnar snapshots for large tables."""
+    
+    def test_large_snapshot_is_columnar(self):
+        """Test snapshots at the threshold are tables; small ones stay lists."""
+        entries = socket_entries(20)
+        monitor = NetworkMonitor(source=PollingConnectionSource(lambda: entries), columnar_threshold=10)
+        self.assertIsInstance(monitor.get_current_connections(), ConnectionTable)
+        
+        monitor.columnar_threshold = 0
+        self.assertIsInstance(monitor.get_current_connections(), list)
+    
+    def test_same_connections_either_way(self):
+        """Test columnar and list snapshots hold the same data."""
+        entries = socket_entries(20)
+        columnar = NetworkMonitor(source=PollingConnectionSource(lambda: entries), columnar_threshold=1)
+        plain = NetworkMonitor(source=PollingConnectionSource(lambda: entries), columnar_threshold=0)
+        self.assertEqual(list(columnar.get_current_connections()), plain.get_current_connections())
+    
+    def test_deltas_are_standalone(self):
+        """Test deltas carry Connection objects, not views pinning the table."""
+        deltas = []
+        entries = socket_entries(20)
+        monitor = NetworkMonitor(delta_callback=deltas.append, update_interval=10,
+                                 source=PollingConnectionSource(lambda: entries), columnar_threshold=1)
+        monitor.start()
+        time.sleep(0.1)
+        monitor.stop()
+        
+        self.assertEqual(len(deltas[0].opened), 20)
+        self.assertTrue(all(type(c) is Connection for c in deltas[0].opened))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,11 @@
 import unittest
 import ctypes
 import os
+import tempfile
+from config import RULE_PREFIX
 from firewall_manager import FirewallManager, FirewallRule
+from rule_index import rule_name_for_path
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
 
 
 def is_admin():
@@ -127,5 +131,134 @@ class TestFirewallManager(unittest.TestCase):
             self.fw.remove_rule(self.test_app)
 
 
+class TestFirewallManagerRuleIndex(unittest.TestCase):
+    """Test rule index handling against a fake policy (no admin needed)."""
+    
+    def setUp(self):
+        """Create manager over fake policy and a dummy executable."""
+        self.policy = FakeFwPolicy2(system_rules=5000)
+        self.fw = FirewallManager(fw_policy=self.policy, rule_factory=fake_rule_factory)
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_app = os.path.join(self.temp_dir, 'indexed_app.exe')
+        with open(self.test_app, 'w') as f:
+            f.write('')
+    
+    def tearDown(self):
+        """Remove dummy executable."""
+        os.unlink(self.test_app)
+        os.rmdir(self.temp_dir)
+    
+    def test_startup_enumeration(self):
+        """Test rules are enumerated once at startup."""
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+        self.assertEqual(self.fw.get_active_rules(), [])
+    
+    def test_lookups_do_not_rescan(self):
+        """Test add/is_blocked/remove use the index instead of scanning."""
+        success, msg = self.fw.add_block_rule(self.test_app)
+        self.assertTrue(success, msg)
+        self.assertTrue(self.fw.is_blocked(self.test_app))
+        success, msg = self.fw.remove_rule(self.test_app)
+        self.assertTrue(success, msg)
+        self.assertFalse(self.fw.is_blocked(self.test_app))
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+    
+    def test_external_change_reconciled(self):
+        """Test rules removed outside the app are noticed."""
+        self.fw.add_block_rule(self.test_app)
+        self.policy.Rules.Remove(rule_name_for_path(self.test_app))
+        self.assertFalse(self.fw.is_blocked(self.test_app))
+        self.assertEqual(self.policy.Rules.enumerations, 2)
+    
+    def test_swap_with_same_count_detected(self):
+        """Test rules swapped outside the app (count unchanged) are noticed."""
+        self.fw.add_block_rule(self.test_app)
+        self.policy.Rules.Remove(rule_name_for_path(self.test_app))
+        self.policy.add_system_rules(1)
+        self.assertFalse(self.fw.is_blocked(self.test_app))
+        
+        self.policy.Rules.Remove(next(iter(self.policy.Rules)).Name)
+        self.policy.Rules.Add(FakeFwRule(rule_name_for_path(self.test_app), self.test_app))
+        self.assertTrue(self.fw.is_blocked(self.test_app))
+        success, msg = self.fw.remove_rule(self.test_app)
+        self.assertTrue(success, msg)
+        with self.assertRaises(Exception):
+            self.policy.Rules.Item(rule_name_for_path(self.test_app))
+    
+    def test_same_basename_no_collision(self):
+        """Test executables sharing a basename are blocked separately."""
+        other_dir = os.path.join(self.temp_dir, 'other')
+        os.mkdir(other_dir)
+        other_app = os.path.join(other_dir, 'indexed_app.exe')
+        with open(other_app, 'w') as f:
+            f.write('')
+        
+        try:
+            self.assertTrue(self.fw.add_block_rule(self.test_app)[0])
+            success, msg = self.fw.add_block_rule(other_app)
+            self.assertTrue(success, msg)
+            success, msg = self.fw.remove_rule(other_app)
+            self.assertTrue(success, msg)
+            self.assertTrue(self.fw.is_blocked(self.test_app))
+            self.assertFalse(self.fw.is_blocked(other_app))
+        finally:
+            os.unlink(other_app)
+            os.rmdir(other_dir)
+    
+    def test_legacy_rules_migrated(self):
+        """Test basename-named rules are renamed to path-hash names."""
+        policy = FakeFwPolicy2(system_rules=100)
+        legacy = FakeFwRule(f"{RULE_PREFIX} indexed_app.exe", self.test_app, enabled=False)
+        policy.Rules.Add(legacy)
+        policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} STRICT MODE"))
+        fw = FirewallManager(fw_policy=policy, rule_factory=fake_rule_factory)
+        
+        rule = policy.Rules.Item(rule_name_for_path(self.test_app))
+        self.assertEqual(rule.ApplicationName, self.test_app)
+        self.assertFalse(rule.Enabled)
+        with self.assertRaises(Exception):
+            policy.Rules.Item(legacy.Name)
+        policy.Rules.Item(f"{RULE_PREFIX} STRICT MODE")  # No path: left alone
+        self.assertEqual(policy.Rules.Count, 102)
+        
+        self.assertTrue(fw.is_blocked(self.test_app))
+        self.assertTrue(fw.remove_rule(self.test_app)[0])
+        self.assertEqual(policy.Rules.enumerations, 1)
+    
+    def test_get_active_rules(self):
+        """Test active rules come from the index."""
+        self.fw.add_block_rule(self.test_app)
+        rules = self.fw.get_active_rules()
+        self.assertEqual(len(rules), 1)
+        self.assertIsInstance(rules[0], FirewallRule)
+        self.assertEqual(rules[0].app_path, self.test_app)
+    
+    def test_apply_batch(self):
+        """Test batch block/unblock returns per-item results in one pass."""
+        other_app = os.path.join(self.temp_dir, 'other_app.exe')
+        with open(other_app, 'w') as f:
+            f.write('')
+        
+        try:
+            results = self.fw.apply_batch(block=[self.test_app, other_app, "C:\\Missing\\app.exe"])
+            self.assertTrue(results[self.test_app][0])
+            self.assertTrue(results[other_app][0])
+            self.assertFalse(results["C:\\Missing\\app.exe"][0])
+            self.assertEqual(len(self.fw.get_active_rules()), 2)
+            
+            results = self.fw.apply_batch(unblock=[self.test_app, other_app])
+            self.assertTrue(all(ok for ok, _ in results.values()))
+            self.assertEqual(self.fw.get_active_rules(), [])
+            self.assertEqual(self.policy.Rules.enumerations, 1)
+        finally:
+            os.unlink(other_app)
+    
+    def test_apply_batch_conflict(self):
+        """Test path in both block and unblock is rejected."""
+        results = self.fw.apply_batch(block=[self.test_app], unblock=[self.test_app])
+        self.assertFalse(results[self.test_app][0])
+        self.assertFalse(self.fw.is_blocked(self.test_app))
+
+
 if __name__ == '__main__':
     unittest.main()
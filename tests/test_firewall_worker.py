@@ -0,0 +1,131 @@
+"""Tests for firewall worker module"""
+import unittest
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from firewall_manager import FirewallManager
+from firewall_worker import FirewallWorker
+from tests.fake_policy import FakeFwPolicy2, fake_rule_factory
+
+
+class RecordingManager(FirewallManager):
+    """FirewallManager recording batches and the thread they ran on."""
+    
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        self.threads = set()
+        super().__init__(*args, **kwargs)
+    
+    def apply_batch(self, block=None, unblock=None):
+        self.batches.append((sorted(block or []), sorted(unblock or [])))
+        self.threads.add(threading.get_ident())
+        return super().apply_batch(block=block, unblock=unblock)
+
+
+class TestFirewallWorker(unittest.TestCase):
+    """Test the firewall command queue."""
+    
+    def setUp(self):
+        """Create dummy executables and an unstarted worker."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.apps = []
+        for name in ('a.exe', 'b.exe', 'c.exe'):
+            app_path = os.path.join(self.temp_dir, name)
+            with open(app_path, 'w') as f:
+                f.write('')
+            self.apps.append(app_path)
+        self.worker = FirewallWorker(
+            lambda: RecordingManager(fw_policy=FakeFwPolicy2(system_rules=100), rule_factory=fake_rule_factory),
+            max_pending=3
+        )
+    
+    def tearDown(self):
+        """Stop worker and remove executables."""
+        self.worker.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_runs_on_worker_thread(self):
+        """Test the manager is created and used on the worker thread only."""
+        self.worker.start()
+        success, msg = self.worker.block(self.apps[0]).result(timeout=5)
+        self.assertTrue(success, msg)
+        self.assertTrue(self.worker.submit(self.worker.manager.is_blocked, self.apps[0]).result(timeout=5))
+        self.assertEqual(self.worker.manager.threads, {self.worker._thread.ident})
+        self.assertNotIn(threading.get_ident(), self.worker.manager.threads)
+    
+    def test_pending_ops_coalesced_into_one_batch(self):
+        """Test repeats share a future and everything pending runs in one batch."""
+        a, b, c = self.apps
+        first = self.worker.block(a)
+        self.assertIs(self.worker.block(a), first)
+        futures = self.worker.apply(block=[b, c])
+        self.assertEqual(self.worker.depth(), 3)
+        
+        self.worker.start()
+        self.assertTrue(first.result(timeout=5)[0])
+        self.assertTrue(all(f.result(timeout=5)[0] for f in futures.values()))
+        self.assertEqual(self.worker.manager.batches, [(sorted(self.apps), [])])
+        self.assertEqual(self.worker.stats()['coalesced'], 1)
+    
+    def test_opposite_op_supersedes(self):
+        """Test a later unblock cancels a pending block for the same app."""
+        block = self.worker.block(self.apps[0])
+        unblock = self.worker.unblock(self.apps[0])
+        self.assertTrue(block.cancelled())
+        
+        self.worker.start()
+        unblock.result(timeout=5)
+        self.assertEqual(self.worker.manager.batches, [([], [self.apps[0]])])
+    
+    def test_back_pressure(self):
+        """Test a full queue refuses commands instead of growing."""
+        futures = self.worker.apply(block=self.apps)
+        rejected = self.worker.submit(len, "x")
+        self.assertIsInstance(rejected.exception(), queue.Full)
+        self.assertEqual(self.worker.stats()['rejected'], 1)
+        
+        self.worker.start()
+        for future in futures.values():
+            future.result(timeout=5)
+        self.assertEqual(self.worker.submit(len, "x", timeout=1).result(timeout=5), 1)
+    
+    def test_wait_for_room(self):
+        """Test a submitter with a timeout waits until the worker makes room."""
+        self.worker.apply(block=self.apps)
+        threading.Timer(0.05, self.worker.start).start()
+        self.assertEqual(self.worker.submit(len, "xy", timeout=5).result(timeout=5), 2)
+    
+    def test_cancel_pending(self):
+        """Test cancelled commands never reach the firewall."""
+        a, b, _ = self.apps
+        cancelled = self.worker.block(a)
+        kept = self.worker.block(b)
+        self.assertTrue(cancelled.cancel())
+        
+        self.worker.start()
+        kept.result(timeout=5)
+        self.assertEqual(self.worker.manager.batches, [([b], [])])
+        self.assertEqual(self.worker.stats()['cancelled'], 1)
+    
+    def test_stats(self):
+        """Test queue depth and latency are reported."""
+        self.worker.start()
+        self.worker.block(self.apps[0]).result(timeout=5)
+        stats = self.worker.stats()
+        self.assertEqual(stats['depth'], 0)
+        self.assertEqual(stats['completed'], 1)
+        self.assertGreater(stats['max_latency'], 0)
+    
+    def test_factory_error_raised_by_start(self):
+        """Test manager creation errors reach the caller of start()."""
+        def fail():
+            raise RuntimeError("Failed to initialize firewall manager")
+        worker = FirewallWorker(fail)
+        with self.assertRaises(RuntimeError):
+            worker.start()
+
+
+if __name__ == '__main__':
+    unittest.main()
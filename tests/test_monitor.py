@@ -1,7 +1,28 @@
 """Tests for network monitor module"""
 import unittest
+import random
+import threading
 import time
-from monitor import NetworkMonitor, Connection
+import socket
+from connection_sources import PollingConnectionSource
+from proc_net import Address, SocketEntry
+from monitor import (NetworkMonitor, Connection, ConnectionDelta, ConnectionSnapshot, Subscription,
+                     connection_key, diff_connections, merge_deltas)
+
+
+def make_connection(pid=1234, remote_port=443, status="ESTABLISHED"):
+    """Create test connection."""
+    return Connection(
+        process_name="test.exe",
+        process_path="C:\\Test\\test.exe",
+        pid=pid,
+        local_addr="192.168.1.1",
+        local_port=50000 + pid,
+        remote_addr="8.8.8.8",
+        remote_port=remote_port,
+        status=status,
+        protocol="TCP"
+    )
 
 
 class TestNetworkMonitor(unittest.TestCase):
@@ -100,5 +121,280 @@ class TestNetworkMonitor(unittest.TestCase):
         monitor.stop()
 
 
+class TestConnectionDiff(unittest.TestCase):
+    """Test incremental connection diffing."""
+    
+    def test_initial_snapshot_all_opened(self):
+        """Test first snapshot reports every connection as opened."""
+        conns = [make_connection(pid=1), make_connection(pid=2)]
+        table, delta = diff_connections({}, conns)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(delta.opened, conns)
+        self.assertEqual(delta.closed, [])
+        self.assertEqual(delta.total, 2)
+    
+    def test_unchanged_snapshot_is_empty(self):
+        """Test identical snapshot produces empty delta."""
+        conns = [make_connection(pid=1), make_connection(pid=2)]
+        table, _ = diff_connections({}, conns)
+        table, delta = diff_connections(table, [make_connection(pid=1), make_connection(pid=2)])
+        self.assertTrue(delta.empty)
+        self.assertEqual(delta.total, 2)
+    
+    def test_opened_closed_changed(self):
+        """Test opened, closed and state-changed connections are reported."""
+        table, _ = diff_connections({}, [make_connection(pid=1), make_connection(pid=2)])
+        table, delta = diff_connections(table, [
+            make_connection(pid=1, status="CLOSE_WAIT"),
+            make_connection(pid=3),
+        ])
+        self.assertEqual([c.pid for c in delta.opened], [3])
+        self.assertEqual([c.pid for c in delta.closed], [2])
+        self.assertEqual([c.status for c in delta.changed], ["CLOSE_WAIT"])
+        self.assertFalse(delta.empty)
+    
+    def test_monitor_emits_deltas(self):
+        """Test monitor only calls delta callback when something changed."""
+        deltas = []
+        snapshots = [[make_connection(pid=1)], [make_connection(pid=1)], []]
+        
+        monitor = NetworkMonitor(delta_callback=deltas.append, update_interval=0.05)
+        monitor._fetch_connections = lambda: snapshots.pop(0) if snapshots else []
+        monitor.start()
+        time.sleep(0.4)
+        monitor.stop()
+        
+        self.assertEqual(len(deltas), 2)
+        self.assertIsInstance(deltas[0], ConnectionDelta)
+        self.assertEqual(len(deltas[0].opened), 1)
+        self.assertEqual(len(deltas[1].closed), 1)
+        self.assertEqual(monitor.connection_table, {})
+
+
+
+def apply_delta(table, delta):
+    """Apply a delta to a keyed table (as the GUI does)."""
+    for conn in delta.closed:
+        table.pop(connection_key(conn), None)
+    for conn in delta.opened + delta.changed:
+        table[connection_key(conn)] = conn
+
+
+def snapshot_of(version, connections, previous=None):
+    """Build a published-style snapshot from a connection list."""
+    _, delta = diff_connections(previous or {}, connections)
+    return ConnectionSnapshot(version, tuple(connections), delta, 0.0)
+
+
+class TestSnapshotPublication(unittest.TestCase):
+    """Test snapshots, delta merging and subscriptions."""
+    
+    def test_merge_opened_then_closed_cancels(self):
+        """Test a connection opened and closed between deliveries disappears."""
+        conn = make_connection(pid=1)
+        merged = merge_deltas(ConnectionDelta(opened=[conn]), ConnectionDelta(closed=[conn]))
+        self.assertTrue(merged.empty)
+    
+    def test_merge_closed_then_opened_is_changed(self):
+        """Test close + reopen of the same key is reported as changed."""
+        conn = make_connection(pid=1)
+        merged = merge_deltas(ConnectionDelta(closed=[conn]), ConnectionDelta(opened=[conn]))
+        self.assertEqual(merged.changed, [conn])
+        self.assertFalse(merged.opened or merged.closed)
+    
+    def test_merge_opened_then_changed_stays_opened(self):
+        """Test a new connection that changed state is still new, with latest state."""
+        old = make_connection(pid=1)
+        new = make_connection(pid=1, status="CLOSE_WAIT")
+        merged = merge_deltas(ConnectionDelta(opened=[old]), ConnectionDelta(changed=[new], total=1))
+        self.assertEqual(merged.opened, [new])
+        self.assertEqual(merged.total, 1)
+    
+    def test_subscription_coalesces_when_full(self):
+        """Test slow consumers get merged updates, never more than maxsize."""
+        subscription = Subscription(maxsize=2)
+        table = {}
+        previous = {}
+        for version in range(1, 6):
+            connections = [make_connection(pid=pid) for pid in range(version)]
+            snapshot = snapshot_of(version, connections, previous)
+            previous = {connection_key(c): c for c in connections}
+            subscription.put(snapshot)
+            self.assertLessEqual(len(subscription), 2)
+        
+        snapshots = subscription.drain()
+        self.assertEqual([s.version for s in snapshots], [1, 5])
+        self.assertEqual(subscription.coalesced, 3)
+        for snapshot in snapshots:
+            apply_delta(table, snapshot.delta)
+        self.assertEqual(set(table), set(previous))
+    
+    def test_notify_once_per_batch(self):
+        """Test notify fires only when the queue becomes non-empty."""
+        calls = []
+        subscription = Subscription(maxsize=4, notify=lambda: calls.append(1))
+        subscription.put(snapshot_of(1, [make_connection(pid=1)]))
+        subscription.put(snapshot_of(2, [make_connection(pid=2)]))
+        self.assertEqual(len(calls), 1)
+        subscription.drain()
+        subscription.put(snapshot_of(3, [make_connection(pid=3)]))
+        self.assertEqual(len(calls), 2)
+    
+    def test_get_and_close(self):
+        """Test get() waits with timeout and close() releases it."""
+        subscription = Subscription()
+        self.assertIsNone(subscription.get(timeout=0.01))
+        threading.Timer(0.05, subscription.close).start()
+        self.assertIsNone(subscription.get(timeout=5))
+        self.assertTrue(subscription.closed)
+    
+    def test_monitor_publishes_versions(self):
+        """Test each tick is published as a new immutable snapshot."""
+        snapshots = [[make_connection(pid=1)], [make_connection(pid=1), make_connection(pid=2)]]
+        monitor = NetworkMonitor(update_interval=0.02)
+        monitor._fetch_connections = lambda: list(snapshots.pop(0)) if snapshots else [make_connection(pid=2)]
+        subscription = monitor.subscribe()
+        monitor.start()
+        time.sleep(0.3)
+        monitor.stop()
+        
+        snapshot = monitor.get_snapshot()
+        self.assertIsInstance(snapshot.connections, tuple)
+        self.assertGreaterEqual(snapshot.version, 3)
+        self.assertEqual([c.pid for c in monitor.get_connections()], [2])
+        self.assertEqual([s.version for s in subscription.drain()], [1, 2, 3])
+    
+    def test_new_apps_callback_batches(self):
+        """Test new apps found in one tick are reported in one sorted batch."""
+        batches = []
+        monitor = NetworkMonitor(new_apps_callback=batches.append)
+        monitor.source = PollingConnectionSource(lambda: [
+            SocketEntry(-1, socket.AF_INET, socket.SOCK_STREAM, Address('10.0.0.2', 5000 + pid),
+                        Address('1.1.1.1', 443), 'ESTABLISHED', pid)
+            for pid in (3, 1, 2, 1)])
+        monitor.resolver.resolve_many = lambda pids: {pid: {'name': f"app{pid}.exe", 'path': f"C:\\app{pid}.exe"}
+                                                      for pid in pids}
+        monitor._fetch_connections()
+        monitor._fetch_connections()  # Nothing new the second time
+        self.assertEqual(batches, [["C:\\app1.exe", "C:\\app2.exe", "C:\\app3.exe"]])
+    
+    def test_forget_app(self):
+        """Test seen apps can be forgotten and are reported again."""
+        monitor = NetworkMonitor()
+        self.assertEqual(monitor._mark_seen(["C:\\a.exe"]), {"C:\\a.exe"})
+        self.assertEqual(monitor._mark_seen(["C:\\a.exe"]), set())
+        monitor.forget_app("C:\\a.exe")
+        self.assertEqual(monitor._mark_seen(["C:\\a.exe"]), {"C:\\a.exe"})
+
+
+class TestMonitorConcurrency(unittest.TestCase):
+    """Stress snapshot publication from many threads."""
+    
+    def test_fetches_serialized(self):
+        """Test get_current_connections doesn't fetch concurrently with the monitor thread."""
+        active = []
+        overlaps = []
+        
+        def reader():
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(len(active))
+            time.sleep(0.002)
+            active.pop()
+            return []
+        
+        monitor = NetworkMonitor(update_interval=0.001, source=PollingConnectionSource(reader))
+        monitor.start()
+        try:
+            callers = [threading.Thread(target=lambda: [monitor.get_current_connections() for _ in range(20)])
+                       for _ in range(3)]
+            for thread in callers:
+                thread.start()
+            for thread in callers:
+                thread.join(timeout=5)
+        finally:
+            monitor.stop()
+        self.assertEqual(overlaps, [])
+    
+    def test_stress(self):
+        """Test readers, subscribers and seen-app writers against a fast-churning monitor."""
+        rng = random.Random(42)
+        
+        def fetch():
+            pids = rng.sample(range(200), 50)
+            monitor._mark_seen(f"C:\\app{pid}.exe" for pid in pids)
+            return [make_connection(pid=pid, status=rng.choice(["ESTABLISHED", "CLOSE_WAIT"])) for pid in pids]
+        
+        monitor = NetworkMonitor(update_interval=0.001)
+        monitor._fetch_connections = fetch
+        errors = []
+        stop = threading.Event()
+        
+        def reader():
+            last_version = 0
+            while not stop.is_set():
+                snapshot = monitor.get_snapshot()
+                if snapshot.version < last_version:
+                    errors.append("version went backwards")
+                if snapshot.version and len(snapshot.connections) != snapshot.delta.total:
+                    errors.append("torn snapshot")
+                last_version = snapshot.version
+                len(monitor.get_connections())
+                time.sleep(0.0001)
+        
+        def consumer(delay):
+            table = {}
+            subscription = monitor.subscribe(maxsize=3)
+            last = 0
+            while not stop.is_set():
+                snapshot = subscription.get(timeout=0.05)
+                if snapshot is None:
+                    continue
+                if snapshot.version <= last:
+                    errors.append("subscriber got stale version")
+                last = snapshot.version
+                apply_delta(table, snapshot.delta)
+                if len(subscription) > 3:
+                    errors.append("queue exceeded bound")
+                time.sleep(delay)
+            monitor.unsubscribe(subscription)
+            for snapshot in subscription.drain():
+                apply_delta(table, snapshot.delta)
+            consumers_done.append((delay, table, last, subscription))
+        
+        def forgetter():
+            while not stop.is_set():
+                monitor.forget_app(f"C:\\app{rng.randrange(200)}.exe")
+                len(monitor.seen_apps)
+                time.sleep(0.0001)
+        
+        consumers_done = []
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads += [threading.Thread(target=consumer, args=(delay,)) for delay in (0, 0.001, 0.02)]
+        threads += [threading.Thread(target=forgetter) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        monitor.start()
+        time.sleep(1.0)
+        monitor.stop()
+        
+        # Let consumers catch up with the final snapshot
+        final = monitor.get_snapshot()
+        time.sleep(0.2)
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        self.assertEqual(errors, [])
+        self.assertGreater(final.version, 10)
+        self.assertEqual(len(consumers_done), 3)
+        expected = {connection_key(c): c for c in final.connections}
+        for delay, table, last, subscription in consumers_done:
+            self.assertEqual(last, final.version)
+            self.assertEqual(table, expected)
+        slowest = max(consumers_done, key=lambda done: done[0])[3]
+        self.assertGreater(slowest.coalesced, 0)  # Slow consumer got merged updates, not a backlog
+
+
 if __name__ == '__main__':
     unittest.main()
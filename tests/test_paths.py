@@ -0,0 +1,50 @@
+"""Tests for path helpers"""
+import unittest
+from paths import normalize_path
+
+
+class TestNormalizePath(unittest.TestCase):
+    """Test canonical path normalization."""
+    
+    def test_case_folding(self):
+        """Test paths differing only in case normalize equally."""
+        self.assertEqual(
+            normalize_path("C:\\Program Files\\App\\App.EXE"),
+            normalize_path("c:\\program files\\app\\app.exe")
+        )
+    
+    def test_forward_slashes(self):
+        """Test '/' and '\\\\' separators are equivalent."""
+        self.assertEqual(
+            normalize_path("C:/Program Files/App/app.exe"),
+            normalize_path("C:\\Program Files\\App\\app.exe")
+        )
+    
+    def test_long_path_prefix(self):
+        """Test '\\\\?\\' prefix is stripped."""
+        self.assertEqual(
+            normalize_path("\\\\?\\C:\\Tools\\app.exe"),
+            normalize_path("C:\\Tools\\app.exe")
+        )
+    
+    def test_long_unc_prefix(self):
+        """Test '\\\\?\\UNC\\' prefix maps to a regular UNC path."""
+        self.assertEqual(
+            normalize_path("\\\\?\\UNC\\server\\share\\app.exe"),
+            normalize_path("\\\\server\\share\\app.exe")
+        )
+    
+    def test_redundant_segments(self):
+        """Test duplicate separators and '..' segments are collapsed."""
+        self.assertEqual(
+            normalize_path("C:\\Tools\\\\sub\\..\\app.exe"),
+            normalize_path("C:\\Tools\\app.exe")
+        )
+    
+    def test_empty(self):
+        """Test empty path normalizes to empty string."""
+        self.assertEqual(normalize_path(""), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for pending apps module"""
+import sys
+import unittest
+from pending_apps import PendingQueue, UNKNOWN_PUBLISHER, get_directory, get_publisher
+
+
+class TestPendingQueue(unittest.TestCase):
+    """Test queue order, O(1) membership changes and grouping."""
+    
+    def setUp(self):
+        self.queue = PendingQueue()
+        self.queue.add_many([
+            "C:\\Games\\Launcher\\launcher.exe",
+            "C:\\Tools\\a.exe",
+            "C:\\Games\\Launcher\\updater.exe",
+            "C:\\Tools\\b.exe",
+            "C:\\Games\\Launcher\\crash.exe",
+        ])
+    
+    def test_arrival_order_without_duplicates(self):
+        """Test apps keep arrival order and duplicates are ignored."""
+        self.assertEqual(self.queue.add_many(["C:\\Tools\\a.exe", "C:\\Tools\\c.exe"]), 1)
+        self.assertEqual(self.queue.items()[-1], "C:\\Tools\\c.exe")
+        self.assertEqual(len(self.queue), 6)
+    
+    def test_discard(self):
+        """Test removing apps, including ones not pending."""
+        self.assertEqual(self.queue.discard_many(["C:\\Tools\\a.exe", "C:\\Missing.exe"]), 1)
+        self.assertNotIn("C:\\Tools\\a.exe", self.queue)
+        self.assertEqual(self.queue.items(), ["C:\\Games\\Launcher\\launcher.exe", "C:\\Games\\Launcher\\updater.exe",
+                                              "C:\\Tools\\b.exe", "C:\\Games\\Launcher\\crash.exe"])
+        self.assertEqual(self.queue.discard_many(["C:\\Tools\\a.exe"]), 0)
+    
+    def test_items_cached_until_change(self):
+        """Test the list handed to the view is built once per change, not per call."""
+        items = self.queue.items()
+        self.assertIs(self.queue.items(), items)
+        self.queue.discard_many(["C:\\Missing.exe"])
+        self.assertIs(self.queue.items(), items)
+        
+        self.queue.discard_many(["C:\\Tools\\b.exe"])
+        self.queue.add_many(["C:\\Tools\\d.exe"])
+        items = self.queue.items()
+        self.assertEqual(items[-2:], ["C:\\Games\\Launcher\\crash.exe", "C:\\Tools\\d.exe"])
+        self.assertEqual(list(self.queue), items)
+    
+    def test_discard_many_large_batch(self):
+        """Test removing most of a large queue keeps order and membership."""
+        queue = PendingQueue()
+        apps = [f"C:\\Apps\\app{i}.exe" for i in range(100)]
+        queue.add_many(apps)
+        self.assertEqual(queue.discard_many(apps[::3] + ["C:\\Missing.exe"]), 34)
+        self.assertEqual(queue.items(), [app for i, app in enumerate(apps) if i % 3])
+        self.assertNotIn(apps[0], queue)
+        self.assertEqual(queue.discard_many(apps[1:2]), 1)
+        self.assertEqual(queue.items()[0], apps[2])
+    
+    def test_groups_by_directory(self):
+        """Test directory groups, largest first, apps in arrival order."""
+        self.assertEqual(self.queue.groups('directory'), [
+            ("C:\\Games\\Launcher", ["C:\\Games\\Launcher\\launcher.exe", "C:\\Games\\Launcher\\updater.exe",
+                                     "C:\\Games\\Launcher\\crash.exe"]),
+            ("C:\\Tools", ["C:\\Tools\\a.exe", "C:\\Tools\\b.exe"]),
+        ])
+    
+    @unittest.skipIf(sys.platform == 'win32', "Reads real version resources on Windows")
+    def test_groups_by_publisher_fallback(self):
+        """Test apps without version info share the unknown publisher group."""
+        groups = self.queue.groups('publisher')
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0][0], UNKNOWN_PUBLISHER)
+        self.assertEqual(groups[0][1], self.queue.items())
+    
+    def test_helpers(self):
+        """Test group key helpers."""
+        self.assertEqual(get_directory("C:\\Tools\\a.exe"), "C:\\Tools")
+        self.assertEqual(get_directory("a.exe"), "a.exe")
+        self.assertEqual(get_publisher("C:\\Missing\\none.exe"), UNKNOWN_PUBLISHER)
+
+
+if __name__ == '__main__':
+    unittest.main()
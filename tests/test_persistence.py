@@ -0,0 +1,102 @@
+"""Tests for persistence module"""
+import unittest
+import os
+import json
+import tempfile
+import time
+from persistence import DebouncedWriter, atomic_write_json
+
+
+class TestAtomicWriteJson(unittest.TestCase):
+    """Test atomic JSON writes."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'state.json')
+    
+    def tearDown(self):
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+    
+    def test_write(self):
+        """Test data is written and no temp files remain."""
+        atomic_write_json(self.path, {'a': [1, 2]})
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'a': [1, 2]})
+        self.assertEqual(os.listdir(self.temp_dir), ['state.json'])
+    
+    def test_failed_write_keeps_previous_file(self):
+        """Test a write failing mid-way leaves the old file intact."""
+        atomic_write_json(self.path, {'a': 1})
+        with self.assertRaises(TypeError):
+            atomic_write_json(self.path, {'a': 2, 'bad': object()})
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'a': 1})
+        self.assertEqual(os.listdir(self.temp_dir), ['state.json'])
+
+
+class TestDebouncedWriter(unittest.TestCase):
+    """Test coalescing background writer."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'state.json')
+        self.state = {'count': 0}
+    
+    def tearDown(self):
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+    
+    def _read(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def test_coalesces_within_window(self):
+        """Test many requests within the window produce one write."""
+        writer = DebouncedWriter(self.path, lambda: dict(self.state), delay=0.1)
+        for i in range(50):
+            self.state['count'] = i
+            writer.schedule()
+        time.sleep(0.4)
+        self.assertEqual(writer.write_count, 1)
+        self.assertEqual(self._read(), {'count': 49})
+        writer.close()
+    
+    def test_flush_writes_immediately(self):
+        """Test flush writes pending state without waiting."""
+        writer = DebouncedWriter(self.path, lambda: dict(self.state), delay=60)
+        self.state['count'] = 7
+        writer.schedule()
+        self.assertTrue(writer.pending)
+        writer.flush()
+        self.assertFalse(writer.pending)
+        self.assertEqual(self._read(), {'count': 7})
+        writer.close()
+    
+    def test_flush_without_changes(self):
+        """Test flush is a no-op when nothing is pending."""
+        writer = DebouncedWriter(self.path, lambda: dict(self.state), delay=60)
+        writer.flush()
+        self.assertEqual(writer.write_count, 0)
+        self.assertFalse(os.path.exists(self.path))
+    
+    def test_close_flushes(self):
+        """Test close writes pending changes."""
+        writer = DebouncedWriter(self.path, lambda: dict(self.state), delay=60)
+        self.state['count'] = 3
+        writer.schedule()
+        writer.close()
+        self.assertEqual(self._read(), {'count': 3})
+    
+    def test_zero_delay_is_synchronous(self):
+        """Test delay of 0 writes on the caller thread."""
+        writer = DebouncedWriter(self.path, lambda: dict(self.state), delay=0)
+        writer.schedule()
+        self.assertEqual(writer.write_count, 1)
+        self.assertEqual(self._read(), {'count': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for poll scheduler module"""
+import unittest
+import time
+from poll_scheduler import AdaptiveScheduler
+from monitor import NetworkMonitor
+
+
+class TestAdaptiveScheduler(unittest.TestCase):
+    """Test adaptive scan interval and deadline handling."""
+    
+    def setUp(self):
+        self.scheduler = AdaptiveScheduler(base_interval=2.0, min_interval=0.5, max_interval=6.0,
+                                           hidden_max_interval=15.0, churn_threshold=5,
+                                           backoff_factor=1.5)
+    
+    def test_burst_tightens_interval(self):
+        """Test high churn and new apps shorten the interval down to the minimum."""
+        self.assertEqual(self.scheduler.record_scan(churn=10, new_apps=0, duration=0.01), 1.0)
+        self.assertEqual(self.scheduler.record_scan(churn=0, new_apps=1, duration=0.01), 0.5)
+        self.assertEqual(self.scheduler.record_scan(churn=10, new_apps=3, duration=0.01), 0.5)
+    
+    def test_stable_backs_off(self):
+        """Test quiet scans lengthen the interval up to the maximum."""
+        for _ in range(10):
+            self.scheduler.record_scan(churn=0, new_apps=0, duration=0.01)
+        self.assertEqual(self.scheduler.interval, 6.0)
+    
+    def test_hidden_backs_off_further(self):
+        """Test hidden window raises the back-off ceiling; showing it clamps back."""
+        self.scheduler.set_visible(False)
+        for _ in range(20):
+            self.scheduler.record_scan(churn=0, new_apps=0, duration=0.01)
+        self.assertEqual(self.scheduler.interval, 15.0)
+        
+        self.scheduler.set_visible(True)
+        self.assertEqual(self.scheduler.interval, 6.0)
+    
+    def test_moderate_churn_returns_to_base(self):
+        """Test some churn moves the interval back towards the base interval."""
+        self.scheduler.record_scan(churn=10, new_apps=0, duration=0.01)
+        self.scheduler.record_scan(churn=2, new_apps=0, duration=0.01)
+        self.scheduler.record_scan(churn=2, new_apps=0, duration=0.01)
+        self.assertEqual(self.scheduler.interval, 2.0)
+    
+    def test_deadline_does_not_drift(self):
+        """Test deadlines advance by the interval regardless of scan duration."""
+        deadline = 100.0
+        self.assertEqual(self.scheduler.next_deadline(deadline, now=100.3), 102.0)
+        self.assertEqual(self.scheduler.skipped_ticks, 0)
+    
+    def test_overrun_skips_ticks(self):
+        """Test scans longer than the interval skip missed ticks."""
+        self.assertEqual(self.scheduler.next_deadline(100.0, now=105.0), 106.0)
+        self.assertEqual(self.scheduler.metrics()['skipped_ticks'], 2)
+    
+    def test_metrics(self):
+        """Test scan duration statistics."""
+        self.scheduler.record_scan(churn=0, new_apps=0, duration=0.1)
+        self.scheduler.record_scan(churn=0, new_apps=0, duration=0.3)
+        metrics = self.scheduler.metrics()
+        self.assertEqual(metrics['ticks'], 2)
+        self.assertAlmostEqual(metrics['avg_scan_duration'], 0.2)
+        self.assertAlmostEqual(metrics['max_scan_duration'], 0.3)
+    
+    def test_base_interval_within_bounds(self):
+        """Test a base interval outside the defaults is still honoured."""
+        scheduler = AdaptiveScheduler(base_interval=0.05)
+        self.assertEqual(scheduler.interval, 0.05)
+        scheduler.set_base_interval(30)
+        self.assertEqual(scheduler.interval, 30)
+
+
+class TestMonitorScheduling(unittest.TestCase):
+    """Test NetworkMonitor uses the adaptive scheduler."""
+    
+    def test_update_interval_sets_base(self):
+        """Test changing update_interval (settings slider) updates the scheduler."""
+        monitor = NetworkMonitor(update_interval=2.0)
+        monitor.update_interval = 3.5
+        self.assertEqual(monitor.scheduler.base_interval, 3.5)
+        self.assertEqual(monitor.get_metrics()['interval'], 3.5)
+    
+    def test_monitor_records_ticks(self):
+        """Test loop records ticks and scan durations."""
+        monitor = NetworkMonitor(update_interval=0.05)
+        monitor._fetch_connections = lambda: []
+        monitor.start()
+        time.sleep(0.3)
+        monitor.stop()
+        
+        metrics = monitor.get_metrics()
+        self.assertGreaterEqual(metrics['ticks'], 2)
+        self.assertGreater(metrics['interval'], 0.05)  # Nothing changed: backed off
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for proc net module"""
+import unittest
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import psutil
+from proc_net import ProcNetReader, SocketInodeIndex, decode_ip
+from connection_sources import PollingConnectionSource
+from monitor import NetworkMonitor
+from tests.fake_procfs import FakeProcfs
+
+
+class TestDecode(unittest.TestCase):
+    """Test /proc/net address decoding."""
+    
+    @unittest.skipUnless(sys.byteorder == 'little', "Fixtures are little-endian")
+    def test_decode_ipv4(self):
+        """Test IPv4 hex address decoding."""
+        self.assertEqual(decode_ip('0100007F', socket.AF_INET), '127.0.0.1')
+        self.assertEqual(decode_ip('0500000A', socket.AF_INET), '10.0.0.5')
+    
+    @unittest.skipUnless(sys.byteorder == 'little', "Fixtures are little-endian")
+    def test_decode_ipv6(self):
+        """Test IPv6 hex address decoding."""
+        self.assertEqual(decode_ip('0000000000000000FFFF00000100007F', socket.AF_INET6), '::ffff:127.0.0.1')
+        self.assertEqual(decode_ip('00000000000000000000000001000000', socket.AF_INET6), '::1')
+
+
+@unittest.skipUnless(sys.byteorder == 'little', "Fixtures are little-endian")
+class TestProcNetReader(unittest.TestCase):
+    """Test reader against a synthetic /proc tree."""
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.procfs = FakeProcfs(self.root)
+    
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def test_only_connected_owned_sockets(self):
+        """Test listeners and process-less sockets are skipped."""
+        self.procfs.add_socket(100, ('0.0.0.0', 80), state='0A')
+        self.procfs.add_socket(100, ('10.0.0.2', 5000), ('93.184.216.34', 443))
+        self.procfs.add_socket(200, ('10.0.0.2', 5001), ('93.184.216.34', 443), state='06', owned=False)
+        self.procfs.write()
+        
+        entries = ProcNetReader(self.root)()
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry.pid, 100)
+        self.assertEqual(entry.laddr, ('10.0.0.2', 5000))
+        self.assertEqual(entry.raddr.ip, '93.184.216.34')
+        self.assertEqual(entry.raddr.port, 443)
+        self.assertEqual(entry.status, 'ESTABLISHED')
+        self.assertEqual(entry.type, socket.SOCK_STREAM)
+    
+    def test_incremental_inode_index(self):
+        """Test only new fds are read on later scans."""
+        for pid in range(100, 110):
+            self.procfs.add_socket(pid, ('10.0.0.2', pid), ('1.1.1.1', 443))
+        self.procfs.write()
+        reader = ProcNetReader(self.root)
+        self.assertEqual(len(reader()), 10)
+        first = reader.inode_index.readlinks
+        
+        reader()
+        self.assertEqual(reader.inode_index.readlinks, first)
+        
+        self.procfs.add_socket(105, ('10.0.0.2', 6000), ('1.1.1.1', 443))
+        self.procfs.write()
+        self.assertEqual(len(reader()), 11)
+        self.assertLessEqual(reader.inode_index.readlinks - first, 10)
+        self.assertEqual(reader.inode_index.full_rescans, 0)
+    
+    def test_exited_process_forgotten(self):
+        """Test inodes of exited processes are dropped from the index."""
+        self.procfs.add_socket(100, ('10.0.0.2', 5000), ('1.1.1.1', 443))
+        inode = self.procfs.add_socket(101, ('10.0.0.2', 5001), ('1.1.1.1', 443))
+        self.procfs.write()
+        reader = ProcNetReader(self.root)
+        reader()
+        
+        shutil.rmtree(os.path.join(self.root, '101'))
+        self.assertEqual([e.pid for e in reader()], [100])
+        self.assertNotIn(inode, reader.inode_index._inode_pid)
+    
+    def test_reused_fd_triggers_full_rescan(self):
+        """Test an fd number reused for a new socket is still attributed."""
+        self.procfs.add_socket(100, ('10.0.0.2', 5000), ('1.1.1.1', 443))
+        self.procfs.write()
+        reader = ProcNetReader(self.root)
+        reader()
+        
+        # Same fd 3 now points to a different socket
+        self.procfs.sockets.clear()
+        self.procfs._next_fd.clear()
+        os.unlink(os.path.join(self.root, '100', 'fd', '3'))
+        self.procfs.add_socket(100, ('10.0.0.2', 5002), ('1.1.1.1', 443))
+        self.procfs.write()
+        
+        entries = reader()
+        self.assertEqual([e.laddr.port for e in entries], [5002])
+        self.assertEqual(reader.inode_index.full_rescans, 1)
+    
+    def test_unresolvable_inode_not_rescanned(self):
+        """Test sockets no visible process holds don't force a rescan every tick."""
+        self.procfs.add_socket(100, ('10.0.0.2', 5000), ('1.1.1.1', 443))
+        self.procfs.write()
+        os.unlink(os.path.join(self.root, '100', 'fd', '3'))
+        reader = ProcNetReader(self.root)
+        
+        self.assertEqual(reader(), [])
+        reader()
+        self.assertEqual(reader.inode_index.full_rescans, 1)
+
+
+@unittest.skipUnless(ProcNetReader.is_supported(), "Requires Linux /proc/net")
+class TestProcNetReaderLive(unittest.TestCase):
+    """Test reader against the real /proc and psutil."""
+    
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen()
+        self.client = socket.create_connection(self.server.getsockname())
+        self.accepted, _ = self.server.accept()
+    
+    def tearDown(self):
+        for sock in (self.client, self.accepted, self.server):
+            sock.close()
+    
+    def test_matches_psutil(self):
+        """Test own connections match psutil.net_connections output."""
+        pid = os.getpid()
+        ours = sorted((tuple(e.laddr), tuple(e.raddr), e.status)
+                      for e in ProcNetReader()() if e.pid == pid)
+        expected = sorted((tuple(c.laddr), tuple(c.raddr), c.status)
+                          for c in psutil.net_connections(kind='inet')
+                          if c.pid == pid and c.raddr and c.status != 'NONE')
+        self.assertEqual(ours, expected)
+        self.assertEqual(len(ours), 2)
+    
+    def test_monitor_produces_same_connections(self):
+        """Test NetworkMonitor builds identical Connection objects from both sources."""
+        pid = os.getpid()
+        fast = NetworkMonitor(source=PollingConnectionSource(ProcNetReader()))
+        slow = NetworkMonitor(source=PollingConnectionSource())
+        
+        def own(monitor):
+            return sorted((c for c in monitor.get_current_connections() if c.pid == pid),
+                          key=lambda c: c.local_port)
+        
+        self.assertEqual(own(fast), own(slow))
+
+
+class TestSocketInodeIndex(unittest.TestCase):
+    """Test inode index edge cases."""
+    
+    def test_empty_request(self):
+        """Test resolving nothing does no fd reads."""
+        root = tempfile.mkdtemp()
+        try:
+            index = SocketInodeIndex(root)
+            self.assertEqual(index.resolve([]), {})
+            self.assertEqual(index.readlinks, 0)
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    unittest.main()
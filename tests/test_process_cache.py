@@ -0,0 +1,74 @@
+"""Tests for process cache module"""
+import unittest
+import os
+import subprocess
+import sys
+import time
+import psutil
+from process_cache import ProcessInfoCache, UNKNOWN_PROCESS
+
+
+class TestProcessInfoCache(unittest.TestCase):
+    """Test cross-tick process metadata cache."""
+    
+    def test_resolves_current_process(self):
+        """Test name/path of a live process are resolved."""
+        cache = ProcessInfoCache()
+        info = cache.get(os.getpid())
+        self.assertEqual(info['path'], psutil.Process().exe())
+        self.assertEqual(cache.stats()['misses'], 1)
+    
+    def test_hit_on_second_lookup(self):
+        """Test repeated lookups are served from cache."""
+        cache = ProcessInfoCache()
+        cache.get(os.getpid())
+        cache.get(os.getpid())
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+    
+    def test_keyed_by_create_time(self):
+        """Test a reused PID (different create time) is not served stale data."""
+        cache = ProcessInfoCache()
+        pid = os.getpid()
+        cache.store((pid, 1.0), {'name': 'old.exe', 'path': 'C:\\\\old.exe'})
+        info = cache.get(pid)
+        self.assertNotEqual(info['name'], 'old.exe')
+    
+    def test_missing_process(self):
+        """Test vanished PIDs resolve to unknown."""
+        proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+        proc.wait()
+        cache = ProcessInfoCache()
+        self.assertEqual(cache.get(proc.pid), UNKNOWN_PROCESS)
+    
+    def test_lru_eviction(self):
+        """Test cache stays bounded."""
+        cache = ProcessInfoCache(max_size=3)
+        for pid in range(5):
+            cache.store((pid, 0.0), {'name': f'{pid}.exe', 'path': ''})
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.stats()['evictions'], 2)
+        self.assertIsNone(cache.lookup((0, 0.0)))
+        self.assertIsNotNone(cache.lookup((4, 0.0)))
+    
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL; negative entries sooner."""
+        cache = ProcessInfoCache(ttl=60, negative_ttl=0.01)
+        cache.store((1, 0.0), {'name': 'a.exe', 'path': ''})
+        cache.store((2, 0.0), UNKNOWN_PROCESS, negative=True)
+        time.sleep(0.05)
+        self.assertIsNotNone(cache.lookup((1, 0.0)))
+        self.assertIsNone(cache.lookup((2, 0.0)))
+    
+    def test_disabled(self):
+        """Test max_size of 0 disables caching."""
+        cache = ProcessInfoCache(max_size=0)
+        cache.get(os.getpid())
+        cache.get(os.getpid())
+        self.assertEqual(cache.stats()['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Tests for process resolver module"""
+import unittest
+import os
+import threading
+import time
+import psutil
+from process_cache import ProcessInfoCache, UNKNOWN_PROCESS
+from process_resolver import ProcessResolver, PENDING_PROCESS
+from connection_sources import PollingConnectionSource
+from monitor import NetworkMonitor, diff_connections
+from tests.test_connection_table import socket_entries
+
+
+def fake_identify(pid):
+    """Pretend every PID exists (no psutil)."""
+    return object(), (pid, 0.0)
+
+
+class TestProcessResolver(unittest.TestCase):
+    """Test pooled process metadata lookups."""
+    
+    def test_resolves_current_process(self):
+        """Test a fast lookup completes within the budget."""
+        resolver = ProcessResolver(budget=5)
+        info = resolver.resolve_many([os.getpid()])[os.getpid()]
+        self.assertEqual(info['path'], psutil.Process().exe())
+        self.assertEqual(resolver.pending(), 0)
+    
+    def test_slow_lookup_filled_in_later(self):
+        """Test a slow lookup is pending first, then served from cache."""
+        resolver = ProcessResolver(budget=0.01)
+        resolver._resolve = lambda proc: (time.sleep(0.2), ({'name': 'slow.exe', 'path': 'C:\\slow.exe'}, False))[1]
+        resolver._identify = fake_identify
+        
+        self.assertIs(resolver.resolve_many([42])[42], PENDING_PROCESS)
+        time.sleep(0.4)
+        self.assertEqual(resolver.resolve_many([42])[42]['name'], 'slow.exe')
+    
+    def test_tail_latency_bounded(self):
+        """Test hundreds of new slow PIDs don't stall the caller."""
+        resolver = ProcessResolver(workers=4, queue_size=32, budget=0.05)
+        release = threading.Event()
+        resolver._resolve = lambda proc: (release.wait(), ({'name': 'a.exe', 'path': ''}, False))[1]
+        resolver._identify = fake_identify
+        
+        start = time.monotonic()
+        results = resolver.resolve_many(range(1, 301))
+        elapsed = time.monotonic() - start
+        release.set()
+        
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(info is PENDING_PROCESS for info in results.values()))
+        self.assertGreater(resolver.deferred, 0)  # Queue bound respected
+        self.assertLessEqual(resolver.pending(), 32 + 4)
+    
+    def test_stuck_lookup_times_out(self):
+        """Test a stuck lookup becomes unknown, and a late result still lands."""
+        resolver = ProcessResolver(budget=0.01, timeout=0.05)
+        release = threading.Event()
+        resolver._resolve = lambda proc: (release.wait(), ({'name': 'late.exe', 'path': ''}, False))[1]
+        resolver._identify = fake_identify
+        
+        self.assertIs(resolver.resolve_many([7])[7], PENDING_PROCESS)
+        time.sleep(0.1)
+        self.assertIs(resolver.resolve_many([7])[7], UNKNOWN_PROCESS)
+        self.assertEqual(resolver.timeouts, 1)
+        
+        release.set()
+        time.sleep(0.1)
+        self.assertEqual(resolver.resolve_many([7])[7]['name'], 'late.exe')
+    
+    def test_hung_lookups_replaced(self):
+        """Test lookups that never return don't starve later ones, within the thread cap."""
+        resolver = ProcessResolver(workers=2, budget=0.01, timeout=0.05, max_threads=4)
+        hang = threading.Event()  # Never set
+        resolver._resolve = lambda proc: (hang.wait() if proc == 'hung' else None,
+                                          ({'name': f'{proc}.exe', 'path': ''}, False))[1]
+        resolver._identify = lambda pid: ('hung' if pid < 10 else f'app{pid}', (pid, 0.0))
+        
+        resolver.resolve_many([1, 2])  # Both workers hang
+        time.sleep(0.1)
+        self.assertEqual(resolver.resolve_many([11])[11]['name'], 'app11.exe')  # Served by a replacement
+        self.assertEqual(resolver.abandoned, 2)
+        
+        # Replacements hang too: the pool stops growing at max_threads
+        resolver.resolve_many([3, 4])
+        time.sleep(0.1)
+        self.assertIs(resolver.resolve_many([12])[12], PENDING_PROCESS)
+        self.assertEqual(resolver.abandoned, 4)
+        self.assertEqual(resolver.threads(), 4)
+    
+    def test_shutdown_is_final(self):
+        """Test no workers are started after shutdown."""
+        resolver = ProcessResolver(budget=0.01)
+        resolver._identify = fake_identify
+        resolver._resolve = lambda proc: ({'name': 'a.exe', 'path': ''}, False)
+        resolver.resolve_many([1])
+        resolver.shutdown()
+        time.sleep(0.05)
+        
+        self.assertIs(resolver.resolve_many([2])[2], PENDING_PROCESS)
+        self.assertEqual(resolver.threads(), 0)
+        self.assertEqual(resolver.pending(), 0)
+    
+    def test_shutdown_during_wait(self):
+        """Test a scan waiting on lookups cancelled by shutdown() doesn't raise."""
+        resolver = ProcessResolver(workers=1, budget=0.3)
+        release = threading.Event()
+        resolver._resolve = lambda proc: (release.wait(), ({'name': 'a.exe', 'path': ''}, False))[1]
+        resolver._identify = fake_identify
+        results = []
+        scan = threading.Thread(target=lambda: results.append(resolver.resolve_many([1, 2])))
+        scan.start()
+        time.sleep(0.05)
+        resolver.shutdown()  # Cancels the lookup still queued behind the busy worker
+        scan.join(timeout=5)
+        release.set()
+        
+        self.assertEqual(len(results), 1)
+        self.assertIs(results[0][2], PENDING_PROCESS)
+    
+    def test_missing_process(self):
+        """Test PIDs that don't exist resolve to unknown immediately."""
+        resolver = ProcessResolver()
+        self.assertIs(resolver.resolve_many([2 ** 22 + 12345])[2 ** 22 + 12345], UNKNOWN_PROCESS)
+
+
+class TestMonitorResolution(unittest.TestCase):
+    """Test monitor fills in slow processes in a later delta."""
+    
+    def test_pending_then_changed(self):
+        """Test pending process info is replaced and reported as changed."""
+        entries = socket_entries(3)
+        monitor = NetworkMonitor(source=PollingConnectionSource(lambda: entries), columnar_threshold=0)
+        monitor.resolver.budget = 0.01
+        original = ProcessInfoCache._resolve
+        monitor.resolver._resolve = lambda proc: (time.sleep(0.2), original(proc))[1]
+        
+        first = monitor.get_current_connections()
+        self.assertEqual({c.process_name for c in first}, {PENDING_PROCESS['name']})
+        table, _ = diff_connections({}, first)
+        
+        time.sleep(0.4)
+        second = monitor.get_current_connections()
+        _, delta = diff_connections(table, second)
+        self.assertEqual(len(delta.changed), 3)
+        self.assertEqual({c.process_path for c in second}, {psutil.Process().exe()})
+        self.assertIn(psutil.Process().exe(), monitor.seen_apps)
+    
+    
+    def test_restart_gets_new_resolver(self):
+        """Test a monitor restarted after stop() can resolve processes again."""
+        monitor = NetworkMonitor(source=PollingConnectionSource(lambda: []))
+        monitor.start()
+        monitor.stop()
+        self.assertTrue(monitor.resolver.closed)
+        monitor.start()
+        try:
+            self.assertFalse(monitor.resolver.closed)
+        finally:
+            monitor.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for rule reconciler module"""
+import unittest
+import os
+import shutil
+import tempfile
+from app_registry import AppRegistry
+from firewall_manager import FirewallManager
+from reconciler import RuleReconciler
+from rule_index import rule_name_for_path
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
+
+
+class CountingFirewall(FirewallManager):
+    """FirewallManager recording apply_batch calls."""
+    
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        super().__init__(*args, **kwargs)
+    
+    def apply_batch(self, block=None, unblock=None):
+        self.batches.append((sorted(block or []), sorted(unblock or [])))
+        return super().apply_batch(block=block, unblock=unblock)
+
+
+class TestRuleReconciler(unittest.TestCase):
+    """Test reconciliation of registry blacklist and firewall rules."""
+    
+    def setUp(self):
+        """Create fake policy, registry and dummy executables."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.apps = []
+        for name in ('a.exe', 'b.exe', 'c.exe'):
+            app_path = os.path.join(self.temp_dir, name)
+            with open(app_path, 'w') as f:
+                f.write('')
+            self.apps.append(app_path)
+        self.policy = FakeFwPolicy2(system_rules=1000)
+        self.fw = CountingFirewall(fw_policy=self.policy, rule_factory=fake_rule_factory)
+        self.registry = AppRegistry(settings_file=os.path.join(self.temp_dir, 'settings.json'))
+        self.reconciler = RuleReconciler(self.fw, self.registry)
+    
+    def tearDown(self):
+        """Remove registry and executables."""
+        self.registry.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_adds_and_removes_minimal_diff(self):
+        """Test only missing rules are added and stale rules removed."""
+        a, b, c = self.apps
+        self.fw.add_block_rule(a)  # Desired and present
+        self.fw.add_block_rule(c)  # Present, no longer blacklisted
+        self.registry.add_many_to_blacklist([a, b])
+        
+        result = self.reconciler.reconcile()
+        self.assertEqual(result.blocked, [b])
+        self.assertEqual(result.unblocked, [c])
+        self.assertEqual(self.fw.batches, [([b], [c])])
+        self.assertTrue(self.fw.is_blocked(a))
+        self.assertTrue(self.fw.is_blocked(b))
+        self.assertFalse(self.fw.is_blocked(c))
+    
+    def test_steady_state_skips(self):
+        """Test unchanged state skips without diffing or enumerating."""
+        self.registry.add_to_blacklist(self.apps[0])
+        self.reconciler.reconcile()
+        enumerations = self.policy.Rules.enumerations
+        
+        result = self.reconciler.reconcile()
+        self.assertTrue(result.skipped)
+        self.assertEqual(len(self.fw.batches), 1)
+        self.assertEqual(self.policy.Rules.enumerations, enumerations)
+    
+    def test_external_deletion_restored(self):
+        """Test a rule deleted outside the app is re-created."""
+        a = self.apps[0]
+        self.registry.add_to_blacklist(a)
+        self.reconciler.reconcile()
+        self.policy.Rules.Remove(rule_name_for_path(a))
+        
+        result = self.reconciler.reconcile()
+        self.assertEqual(result.blocked, [a])
+        self.assertTrue(self.fw.is_blocked(a))
+    
+    def test_registry_change_detected(self):
+        """Test an unblocked registry entry removes its rule."""
+        a = self.apps[0]
+        self.registry.add_to_blacklist(a)
+        self.reconciler.reconcile()
+        self.registry.add_to_whitelist(a)
+        
+        result = self.reconciler.reconcile()
+        self.assertEqual(result.unblocked, [a])
+        self.assertFalse(self.fw.is_blocked(a))
+    
+    def test_failures_not_retried_until_change(self):
+        """Test a path that can't be blocked is reported once per change."""
+        missing = os.path.join(self.temp_dir, 'missing.exe')
+        self.registry.add_to_blacklist(missing)
+        
+        result = self.reconciler.reconcile()
+        self.assertIn(missing, result.failed)
+        self.assertTrue(self.reconciler.reconcile().skipped)
+        
+        self.policy.Rules.Add(FakeFwRule("Other Rule"))  # Not an app rule: still settled
+        self.assertTrue(self.reconciler.reconcile().skipped)
+        
+        self.registry.add_to_blacklist(self.apps[0])
+        result = self.reconciler.reconcile()
+        self.assertEqual(result.blocked, [self.apps[0]])
+        self.assertIn(missing, result.failed)
+        self.assertEqual(len(self.fw.batches), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for registry storage backends"""
+import unittest
+import os
+import json
+import tempfile
+from app_registry import AppRegistry
+from registry_storage import (
+    JournalStorage, JsonStorage, apply_events, create_storage, empty_state,
+    EVENT_WHITELIST, EVENT_BLACKLIST, EVENT_FORGET, EVENT_CLEAR, EVENT_SETTING
+)
+
+
+class TestApplyEvents(unittest.TestCase):
+    """Test event replay semantics."""
+    
+    def test_replay(self):
+        """Test events mirror AppRegistry list semantics."""
+        state = apply_events(empty_state(), [
+            (EVENT_WHITELIST, "C:\\A\\a.exe"),
+            (EVENT_BLACKLIST, "C:\\B\\b.exe"),
+            (EVENT_BLACKLIST, "c:/a/A.EXE"),
+            (EVENT_FORGET, "C:\\B\\b.exe"),
+            (EVENT_SETTING, 'ui_font_size', 14),
+        ])
+        self.assertEqual(state['whitelist'], [])
+        self.assertEqual(state['blacklist'], ["c:/a/A.EXE"])
+        self.assertEqual(state['settings'], {'ui_font_size': 14})
+    
+    def test_clear(self):
+        """Test clear event empties both lists."""
+        state = apply_events(empty_state(), [
+            (EVENT_WHITELIST, "C:\\A\\a.exe"),
+            (EVENT_CLEAR,),
+        ])
+        self.assertEqual(state['whitelist'], [])
+    
+    def test_replay_is_idempotent(self):
+        """Test replaying already-applied events changes nothing."""
+        events = [(EVENT_WHITELIST, "C:\\A\\a.exe"), (EVENT_BLACKLIST, "C:\\B\\b.exe")]
+        once = apply_events(empty_state(), events)
+        twice = apply_events(apply_events(empty_state(), events), events)
+        self.assertEqual(once, twice)
+
+
+class TestJournalStorage(unittest.TestCase):
+    """Test append-only journal backend."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'settings.json')
+    
+    def tearDown(self):
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+    
+    def _registry(self, compact_every=1000):
+        return AppRegistry(settings_file=self.path, storage=JournalStorage(self.path, compact_every))
+    
+    def test_decisions_are_appended(self):
+        """Test each decision appends to the log instead of rewriting the snapshot."""
+        registry = self._registry()
+        registry.add_to_blacklist("C:\\Test\\app1.exe")
+        registry.add_to_whitelist("C:\\Test\\app2.exe")
+        self.assertFalse(os.path.exists(self.path))
+        with open(self.path + '.log', 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        
+        # Replay without compaction (simulates crash)
+        reloaded = self._registry()
+        self.assertTrue(reloaded.is_blacklisted("C:\\Test\\app1.exe"))
+        self.assertTrue(reloaded.is_whitelisted("C:\\Test\\app2.exe"))
+    
+    def test_compaction(self):
+        """Test log is folded into the JSON snapshot periodically."""
+        registry = self._registry(compact_every=10)
+        for i in range(25):
+            registry.add_to_blacklist(f"C:\\Test\\app{i}.exe")
+        self.assertEqual(registry.storage.log_events, 5)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['blacklist']), 20)
+        
+        registry.close()
+        self.assertEqual(os.path.getsize(self.path + '.log'), 0)
+        self.assertEqual(len(self._registry().get_blacklist()), 25)
+    
+    def test_torn_last_line_ignored(self):
+        """Test partially written last entry is skipped on replay."""
+        registry = self._registry()
+        registry.add_to_blacklist("C:\\Test\\app.exe")
+        registry.storage.flush()
+        with open(self.path + '.log', 'a', encoding='utf-8') as f:
+            f.write('["b","C:\\\\Test\\\\to')
+        self.assertEqual(self._registry().get_blacklist(), ["C:\\Test\\app.exe"])
+    
+    def test_settings_replayed(self):
+        """Test setting changes survive through the journal."""
+        registry = self._registry()
+        registry.update_setting('ui_font_size', 18)
+        self.assertEqual(self._registry().get_setting('ui_font_size'), 18)
+    
+    def test_export_import(self):
+        """Test JSON export/import round trip between backends."""
+        registry = self._registry()
+        registry.add_to_whitelist("C:\\Test\\app1.exe")
+        registry.add_to_blacklist("C:\\Test\\app2.exe")
+        export_path = os.path.join(self.temp_dir, 'export.json')
+        registry.export_json(export_path)
+        
+        json_path = os.path.join(self.temp_dir, 'other.json')
+        other = AppRegistry(settings_file=json_path, storage=JsonStorage(json_path, 0))
+        other.import_json(export_path)
+        self.assertTrue(other.is_whitelisted("C:\\Test\\app1.exe"))
+        self.assertTrue(other.is_blacklisted("C:\\Test\\app2.exe"))
+
+
+class TestCreateStorage(unittest.TestCase):
+    """Test backend factory."""
+    
+    def test_backends(self):
+        """Test known backends are created and unknown ones rejected."""
+        self.assertIsInstance(create_storage("json", "x.json"), JsonStorage)
+        self.assertIsInstance(create_storage("journal", "x.json"), JournalStorage)
+        with self.assertRaises(ValueError):
+            create_storage("nope", "x.json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""Tests for reset engine module"""
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from functools import partial
+from unittest import mock
+from app_registry import AppRegistry
+from config import RULE_PREFIX
+from firewall_manager import FirewallManager
+from reconciler import RuleReconciler
+from reset_engine import ResetEngine, latest_backup, new_backup_path, read_backup
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
+
+APP_RULES = 2000
+
+
+class TestResetEngine(unittest.TestCase):
+    """Test reset/restore against a fake policy with 50k rules."""
+    
+    def setUp(self):
+        """Create policy with system rules, app rules and a legacy rule."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.policy = FakeFwPolicy2(system_rules=50_000)
+        for i in range(APP_RULES):
+            self.policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} app{i}.exe #{i:016x}", f"C:\\Apps\\app{i}.exe",
+                                             enabled=bool(i % 2)))
+        self.policy.Rules.Add(FakeFwRule("[SimpleWallAlternative] old.exe", "C:\\Old\\old.exe"))
+        self.engine = ResetEngine(self.policy, rule_factory=fake_rule_factory, batch_size=500)
+        self.backup_file = os.path.join(self.temp_dir, 'backup.json')
+    
+    def tearDown(self):
+        """Remove backups."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_collect_single_pass(self):
+        """Test app rules (current and legacy prefix) are found in one enumeration."""
+        rows = self.engine.collect()
+        self.assertEqual(len(rows), APP_RULES + 1)
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+        self.assertEqual(self.engine.count(), APP_RULES + 1)
+    
+    def test_reset_with_progress_and_backup(self):
+        """Test all app rules are removed in batches after a backup is written."""
+        progress = []
+        result = self.engine.reset(self.backup_file, progress=lambda done, total: progress.append((done, total)))
+        
+        self.assertEqual(result.count, APP_RULES + 1)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(self.policy.Rules.Count, 50_000)
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+        self.assertEqual(len(progress), 5)
+        self.assertEqual(progress[-1], (APP_RULES + 1, APP_RULES + 1))
+        self.assertEqual(set(result.timings), {'collect', 'backup', 'remove'})
+        
+        fields, rows, lists = read_backup(result.backup_file)
+        self.assertEqual(len(rows), APP_RULES + 1)
+        self.assertIn('ApplicationName', fields)
+        self.assertIsNone(lists)
+    
+    def test_reset_with_collected_rows(self):
+        """Test a confirm-then-reset flow scans the policy only once."""
+        rows = self.engine.collect()
+        result = self.engine.reset('', rows=rows)
+        self.assertEqual(result.count, len(rows))
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+    
+    def test_restore_round_trip(self):
+        """Test restore re-creates every removed rule with its settings."""
+        before = {rule.Name: (rule.ApplicationName, rule.Enabled, rule.Direction, rule.Action)
+                  for rule in self.policy.Rules if rule.Name.startswith(RULE_PREFIX)}
+        self.engine.reset(self.backup_file)
+        
+        result = self.engine.restore(self.backup_file)
+        self.assertEqual(result.count, APP_RULES + 1)
+        self.assertEqual(result.errors, [])
+        after = {rule.Name: (rule.ApplicationName, rule.Enabled, rule.Direction, rule.Action)
+                 for rule in self.policy.Rules if rule.Name.startswith(RULE_PREFIX)}
+        self.assertEqual(after, before)
+        
+        # Replaying again adds nothing
+        self.assertEqual(self.engine.restore(self.backup_file).count, 0)
+    
+    def test_restore_skips_existing(self):
+        """Test rules re-created meanwhile are not duplicated."""
+        self.engine.reset(self.backup_file)
+        self.policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} app0.exe #{0:016x}", "C:\\Apps\\app0.exe"))
+        result = self.engine.restore(self.backup_file)
+        self.assertEqual(result.count, APP_RULES)
+    
+    def test_remove_errors_collected(self):
+        """Test a failing removal is reported and the rest still removed."""
+        failing = f"{RULE_PREFIX} app5.exe #{5:016x}"
+        remove = self.policy.Rules.Remove
+        
+        def flaky_remove(name):
+            if name == failing:
+                raise Exception("Access denied")
+            remove(name)
+        self.policy.Rules.Remove = flaky_remove
+        
+        result = self.engine.reset('')
+        self.assertEqual(result.count, APP_RULES)
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn(failing, result.errors[0])
+        self.assertIsNone(result.backup_file)
+    
+    def test_backup_version_checked(self):
+        """Test unknown backup formats are refused."""
+        with open(self.backup_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': 99, 'fields': [], 'rules': []}, f)
+        result = self.engine.restore(self.backup_file)
+        self.assertEqual(result.count, 0)
+        self.assertIn("Unsupported backup version", result.errors[0])
+    
+    def test_back_to_back_resets_keep_both_backups(self):
+        """Test a second reset in the same second doesn't overwrite the first backup."""
+        with mock.patch('reset_engine.new_backup_path', partial(new_backup_path, self.temp_dir)), \
+                mock.patch('reset_engine.time.strftime', lambda fmt: "rules_20250101_000000"):
+            first = self.engine.reset()
+            self.policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} new.exe #{0:016x}", "C:\\Apps\\new.exe"))
+            second = self.engine.reset()
+        
+        self.assertNotEqual(first.backup_file, second.backup_file)
+        self.assertEqual(len(read_backup(first.backup_file)[1]), APP_RULES + 1)
+        self.assertEqual(len(read_backup(second.backup_file)[1]), 1)
+        self.assertEqual(latest_backup(self.temp_dir), second.backup_file)
+    
+    def test_latest_backup(self):
+        """Test the newest backup file is picked for restore."""
+        self.assertIsNone(latest_backup(self.temp_dir))
+        older = os.path.join(self.temp_dir, 'rules_20250101_000000.json')
+        newer = os.path.join(self.temp_dir, 'rules_20250102_000000.json')
+        for path, mtime in ((older, 1000), (newer, 2000)):
+            with open(path, 'w') as f:
+                f.write('{}')
+            os.utime(path, (mtime, mtime))
+        self.assertEqual(latest_backup(self.temp_dir), newer)
+
+
+
+class TestResetEngineRegistry(unittest.TestCase):
+    """Test lists are backed up, cleared and restored with the rules."""
+    
+    def setUp(self):
+        """Create policy with app rules following a registry blacklist."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.blocked = []
+        for i in range(20):
+            app_path = os.path.join(self.temp_dir, f"app{i}.exe")
+            with open(app_path, 'w') as f:
+                f.write('')
+            self.blocked.append(app_path)
+        self.allowed = [os.path.join(self.temp_dir, "browser.exe")]
+        self.policy = FakeFwPolicy2(system_rules=50_000)
+        self.fw = FirewallManager(fw_policy=self.policy, rule_factory=fake_rule_factory)
+        self.registry = AppRegistry(settings_file=os.path.join(self.temp_dir, 'settings.json'))
+        self.registry.add_many_to_blacklist(self.blocked)
+        self.registry.add_many_to_whitelist(self.allowed)
+        self.reconciler = RuleReconciler(self.fw, self.registry)
+        self.reconciler.reconcile()
+        self.engine = ResetEngine(self.policy, rule_factory=fake_rule_factory, registry=self.registry)
+        self.backup_file = os.path.join(self.temp_dir, 'backup.json')
+    
+    def tearDown(self):
+        """Remove registry, backups and executables."""
+        self.registry.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_reset_clears_and_backs_up_lists(self):
+        """Test the registry lists are saved in the backup and cleared."""
+        result = self.engine.reset(self.backup_file)
+        self.assertEqual(result.count, len(self.blocked))
+        self.assertEqual(self.registry.get_blacklist(), [])
+        self.assertEqual(self.registry.get_whitelist(), [])
+        _, _, lists = read_backup(self.backup_file)
+        self.assertEqual(sorted(lists['blacklist']), sorted(self.blocked))
+        self.assertEqual(lists['whitelist'], self.allowed)
+        
+        # Nothing is re-created by the reconciler
+        self.assertFalse(self.reconciler.reconcile(force=True).changed)
+        self.assertEqual(self.fw.get_active_rules(), [])
+    
+    def test_restored_rules_survive_reconcile(self):
+        """Test reset -> restore -> reconcile keeps the restored rules."""
+        self.engine.reset(self.backup_file)
+        result = self.engine.restore(self.backup_file)
+        self.assertEqual(result.count, len(self.blocked))
+        self.assertEqual(result.errors, [])
+        self.assertEqual(sorted(self.registry.get_blacklist()), sorted(self.blocked))
+        self.assertEqual(self.registry.get_whitelist(), self.allowed)
+        
+        reconciled = self.reconciler.reconcile(force=True)
+        self.assertEqual(reconciled.unblocked, [])
+        self.assertTrue(all(self.fw.is_blocked(app_path) for app_path in self.blocked))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for rule index module"""
+import unittest
+from config import RULE_PREFIX
+from rule_index import RuleIndex, rule_name_for_path
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule
+
+
+class Record:
+    """Minimal rule record used by the index."""
+    def __init__(self, name, app_path):
+        self.name = name
+        self.app_path = app_path
+
+
+def make_record(rule):
+    return Record(rule.Name, rule.ApplicationName)
+
+
+class TestRuleIndex(unittest.TestCase):
+    """Test rule index functionality."""
+    
+    def setUp(self):
+        """Create fake policy with system rules and a few app rules."""
+        self.policy = FakeFwPolicy2(system_rules=1000)
+        for name in ("a.exe", "b.exe"):
+            self.policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} {name}", f"C:\\Apps\\{name}"))
+        self.index = RuleIndex(max_age=0)
+    
+    def test_initially_stale(self):
+        """Test index needs a rebuild before first use."""
+        self.assertTrue(self.index.is_stale())
+    
+    def test_rebuild_single_enumeration(self):
+        """Test rebuild indexes only app rules in one pass."""
+        count = self.index.rebuild(self.policy.Rules, make_record)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.policy.Rules.enumerations, 1)
+        self.assertEqual(self.index.policy_count, 1002)
+        self.assertFalse(self.index.is_stale(self.policy.Rules.Count))
+    
+    def test_lookup_by_name_and_path(self):
+        """Test rules can be found by name and by path (case-insensitive)."""
+        self.index.rebuild(self.policy.Rules, make_record)
+        self.assertIn(f"{RULE_PREFIX} a.exe", self.index)
+        record = self.index.get_by_path("c:\\apps\\A.EXE")
+        self.assertIsNotNone(record)
+        self.assertEqual(record.name, f"{RULE_PREFIX} a.exe")
+        self.assertIsNone(self.index.get_by_path("C:\\Apps\\missing.exe"))
+    
+    def test_add_and_discard_track_policy_count(self):
+        """Test own changes keep the index in sync with the policy count."""
+        self.index.rebuild(self.policy.Rules, make_record)
+        rule = FakeFwRule(f"{RULE_PREFIX} c.exe", "C:\\Apps\\c.exe")
+        self.policy.Rules.Add(rule)
+        self.index.add(make_record(rule))
+        self.assertFalse(self.index.is_stale(self.policy.Rules.Count))
+        
+        self.policy.Rules.Remove(rule.Name)
+        self.index.discard(rule.Name)
+        self.assertFalse(self.index.is_stale(self.policy.Rules.Count))
+        self.assertIsNone(self.index.get_by_path("C:\\Apps\\c.exe"))
+    
+    def test_external_change_detected(self):
+        """Test rules changed outside the app make the index stale."""
+        self.index.rebuild(self.policy.Rules, make_record)
+        self.policy.Rules.Remove(f"{RULE_PREFIX} a.exe")
+        self.assertTrue(self.index.is_stale(self.policy.Rules.Count))
+    
+    def test_invalidate(self):
+        """Test explicit invalidation."""
+        self.index.rebuild(self.policy.Rules, make_record)
+        self.index.invalidate()
+        self.assertTrue(self.index.is_stale(self.policy.Rules.Count))
+    
+    def test_max_age(self):
+        """Test index expires after max_age."""
+        index = RuleIndex(max_age=0.001)
+        index.rebuild(self.policy.Rules, make_record)
+        index.loaded_at -= 1
+        self.assertTrue(index.is_stale(self.policy.Rules.Count))
+
+
+class TestRuleIndexFingerprint(unittest.TestCase):
+    """Test the rule set fingerprint."""
+    
+    def test_order_independent(self):
+        """Test same rules added in any order give the same fingerprint."""
+        records = [Record(f"{RULE_PREFIX} {i}.exe", f"C:\\Apps\\{i}.exe") for i in range(5)]
+        first, second = RuleIndex(), RuleIndex()
+        for record in records:
+            first.add(record)
+        for record in reversed(records):
+            second.add(record)
+        self.assertEqual(first.fingerprint, second.fingerprint)
+    
+    def test_tracks_changes(self):
+        """Test add/discard change the fingerprint and undo restores it."""
+        index = RuleIndex()
+        index.add(Record(f"{RULE_PREFIX} a.exe", "C:\\Apps\\a.exe"))
+        before = index.fingerprint
+        index.add(Record(f"{RULE_PREFIX} b.exe", "C:\\Apps\\b.exe"))
+        self.assertNotEqual(index.fingerprint, before)
+        index.discard(f"{RULE_PREFIX} b.exe")
+        self.assertEqual(index.fingerprint, before)
+    
+    def test_rebuild_matches_incremental(self):
+        """Test a rebuild yields the same fingerprint as incremental adds."""
+        policy = FakeFwPolicy2(system_rules=10)
+        index = RuleIndex()
+        for name in ("a.exe", "b.exe"):
+            policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} {name}", f"C:\\Apps\\{name}"))
+            index.add(Record(f"{RULE_PREFIX} {name}", f"C:\\Apps\\{name}"))
+        rebuilt = RuleIndex()
+        rebuilt.rebuild(policy.Rules, make_record)
+        self.assertEqual(rebuilt.fingerprint, index.fingerprint)
+
+
+class TestRuleNameForPath(unittest.TestCase):
+    """Test path-derived rule names."""
+    
+    def test_stable_for_equivalent_paths(self):
+        """Test spellings of the same path map to one name."""
+        name = rule_name_for_path("C:\\Tools\\Python\\python.exe")
+        self.assertEqual(name, rule_name_for_path("c:/tools/python/PYTHON.EXE"))
+        self.assertEqual(name, rule_name_for_path("\\\\?\\C:\\Tools\\Python\\python.exe"))
+    
+    def test_same_basename_differs(self):
+        """Test different executables sharing a basename get different names."""
+        first = rule_name_for_path("C:\\Python311\\python.exe")
+        second = rule_name_for_path("C:\\Python312\\python.exe")
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith(f"{RULE_PREFIX} python.exe #"))
+
+
+if __name__ == '__main__':
+    unittest.main()
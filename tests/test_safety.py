@@ -1,6 +1,14 @@
 """Tests for safety module"""
+import os
+import shutil
+import tempfile
 import unittest
-from safety import is_safe_to_block, emergency_reset, get_app_rules_count, CORE_WHITELIST
+from unittest import mock
+from app_registry import AppRegistry
+from config import RULE_PREFIX
+from reset_engine import ResetEngine, read_backup
+from safety import is_safe_to_block, emergency_reset, get_app_rules_count, triage_new_apps, CORE_WHITELIST
+from tests.fake_policy import FakeFwPolicy2, FakeFwRule, fake_rule_factory
 
 
 class TestSafety(unittest.TestCase):
@@ -77,6 +85,37 @@ class TestSafety(unittest.TestCase):
             port=53
         )
         self.assertFalse(safe)
+    
+    def test_triage_new_apps(self):
+        """Test a detection batch is deduplicated and filtered against registry and safety checks."""
+        known = {"C:\\Apps\\known.exe"}
+        batch = ["C:\\Apps\\b.exe", "C:\\Apps\\known.exe", "C:\\Windows\\System32\\svchost.exe",
+                 "C:\\Apps\\a.exe", "C:\\Apps\\b.exe", ""]
+        self.assertEqual(triage_new_apps(batch, known.__contains__), ["C:\\Apps\\a.exe", "C:\\Apps\\b.exe"])
+        self.assertEqual(triage_new_apps([], known.__contains__), [])
+    
+    def test_emergency_reset_clears_registry(self):
+        """Test emergency_reset() backs up and clears the lists like the GUI and script."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            policy = FakeFwPolicy2(system_rules=100)
+            policy.Rules.Add(FakeFwRule(f"{RULE_PREFIX} app.exe #0123456789abcdef", "C:\\Apps\\app.exe"))
+            registry = AppRegistry(settings_file=os.path.join(temp_dir, 'settings.json'))
+            registry.add_to_blacklist("C:\\Apps\\app.exe")
+            backup_file = os.path.join(temp_dir, 'backup.json')
+            
+            def engine(registry=None):
+                return ResetEngine(policy, rule_factory=fake_rule_factory, registry=registry)
+            with mock.patch('safety.ResetEngine', engine), \
+                    mock.patch('reset_engine.new_backup_path', lambda: backup_file):
+                count, errors = emergency_reset(registry=registry)
+            
+            self.assertEqual((count, errors), (1, []))
+            self.assertEqual(registry.get_blacklist(), [])
+            self.assertEqual(read_backup(backup_file)[2]['blacklist'], ["C:\\Apps\\app.exe"])
+            registry.close()
+        finally:
+            shutil.rmtree(temp_dir)
 
 
 if __name__ == '__main__':
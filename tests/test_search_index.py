@@ -0,0 +1,95 @@
+"""Tests for search index module"""
+import unittest
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test substring search and incremental maintenance."""
+    
+    def setUp(self):
+        """Index a few connections keyed like the GUI's connection table."""
+        self.index = SearchIndex()
+        self.index.add(1, "chrome.exe", "C:\\Program Files\\Google\\Chrome\\chrome.exe", "142.250.74.14", 443)
+        self.index.add(2, "chrome.exe", "C:\\Program Files\\Google\\Chrome\\chrome.exe", "192.168.1.10", 8009)
+        self.index.add(3, "Teams.exe", "C:\\Users\\me\\AppData\\Local\\Teams\\Teams.exe", "52.113.194.132", 443)
+        self.index.add(4, "svchost.exe", "C:\\Windows\\System32\\svchost.exe", "fe80::1", 53)
+    
+    def test_empty_query_is_no_filter(self):
+        """Test empty/blank queries return None."""
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNone(self.index.search("   "))
+    
+    def test_substring_and_prefix(self):
+        """Test matches anywhere inside a field, case-insensitively."""
+        self.assertEqual(self.index.search("chro"), {1, 2})
+        self.assertEqual(self.index.search("HROM"), {1, 2})
+        self.assertEqual(self.index.search("eams"), {3})
+        self.assertEqual(self.index.search("te"), {3, 4})  # Teams, System32
+    
+    def test_address_and_port(self):
+        """Test remote address and port fields are searchable."""
+        self.assertEqual(self.index.search("192.168"), {2})
+        self.assertEqual(self.index.search("443"), {1, 3})
+        self.assertEqual(self.index.search("fe80::"), {4})
+        self.assertEqual(self.index.search("::"), {4})
+    
+    def test_term_spanning_separators(self):
+        """Test terms containing path separators match the whole value."""
+        self.assertEqual(self.index.search("google\\chrome"), {1, 2})
+        self.assertEqual(self.index.search("es\\goo"), {1, 2})
+        self.assertEqual(self.index.search("google\\teams"), set())
+    
+    def test_terms_all_required(self):
+        """Test every whitespace-separated term must match some field."""
+        self.assertEqual(self.index.search("chrome 443"), {1})
+        self.assertEqual(self.index.search("443 teams"), {3})
+        self.assertEqual(self.index.search("chrome teams"), set())
+    
+    def test_no_match(self):
+        """Test unknown text matches nothing."""
+        self.assertEqual(self.index.search("firefox"), set())
+        self.assertEqual(self.index.search("zz"), set())
+    
+    def test_replace_fields(self):
+        """Test re-adding a key replaces its old values."""
+        self.assertTrue(self.index.add(2, "msedge.exe", "C:\\Edge\\msedge.exe", "192.168.1.10", 8009))
+        self.assertEqual(self.index.search("chrome"), {1})
+        self.assertEqual(self.index.search("edge"), {2})
+        self.assertFalse(self.index.add(2, "msedge.exe", "C:\\Edge\\msedge.exe", "192.168.1.10", 8009))
+    
+    def test_discard_cleans_up(self):
+        """Test removing the last key using a value drops it from every layer."""
+        self.assertTrue(self.index.discard(3))
+        self.assertFalse(self.index.discard(3))
+        self.assertNotIn(3, self.index)
+        self.assertEqual(self.index.search("teams"), set())
+        self.assertNotIn("teams", self.index._word_tokens)
+        self.assertNotIn("eam", self.index._gram_words)
+        self.assertIn("443", self.index._token_keys)  # Still used by key 1
+    
+    def test_clear(self):
+        """Test clear empties the index."""
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.search("chrome"), set())
+    
+    def test_matches(self):
+        """Test single-key check agrees with search."""
+        self.assertTrue(self.index.matches(1, "chrome 443"))
+        self.assertFalse(self.index.matches(2, "chrome 443"))
+        self.assertTrue(self.index.matches(2, ""))
+        self.assertFalse(self.index.matches(99, ""))
+    
+    def test_broad_query_matches_scan(self):
+        """Test broad queries (scan path) agree with a naive filter."""
+        index = SearchIndex()
+        paths = {i: f"C:\\Apps\\Vendor{i % 7}\\app{i}.exe" for i in range(500)}
+        for key, path in paths.items():
+            index.add(key, path)
+        for query in ("app", "a", "1", "vendor3", "app4", "s\\v", ".exe", "r3\\app10"):
+            expected = {key for key, path in paths.items() if query in path.lower()}
+            self.assertEqual(index.search(query), expected, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Tests for SQLite app registry"""
+import unittest
+import time
+import os
+import json
+import tempfile
+import threading
+from sqlite_registry import SqliteAppRegistry
+
+
+class TestSqliteAppRegistry(unittest.TestCase):
+    """Test SQLite registry functionality."""
+    
+    def setUp(self):
+        """Create registry in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.temp_dir, 'registry.db')
+        self.registry = SqliteAppRegistry(db_file=self.db_file)
+    
+    def tearDown(self):
+        """Close registry and remove files."""
+        self.registry.close()
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+    
+    def test_default_settings(self):
+        """Test default settings are available."""
+        self.assertEqual(self.registry.get_setting('ui_font_size'), 12)
+        self.assertTrue(self.registry.get_setting('enable_notifications'))
+    
+    def test_whitelist_blacklist_moves(self):
+        """Test list membership follows the latest decision."""
+        app_path = "C:\\Test\\app.exe"
+        self.registry.add_to_whitelist(app_path)
+        self.assertTrue(self.registry.is_whitelisted(app_path))
+        self.registry.add_to_blacklist("c:/test/APP.exe")
+        self.assertFalse(self.registry.is_whitelisted(app_path))
+        self.assertTrue(self.registry.is_blacklisted(app_path))
+        self.assertEqual(self.registry.get_blacklist(), ["c:/test/APP.exe"])
+    
+    def test_forget_app(self):
+        """Test forgetting app removes it from both lists."""
+        app_path = "C:\\Test\\app.exe"
+        self.registry.add_to_blacklist(app_path)
+        self.registry.forget_app(app_path)
+        self.assertFalse(self.registry.is_known(app_path))
+        self.assertEqual(self.registry.get_blacklist(), [])
+    
+    def test_remove_from_list(self):
+        """Test removing from one list leaves the other untouched."""
+        self.registry.add_to_blacklist("C:\\Test\\app.exe")
+        self.registry.remove_from_whitelist("C:\\Test\\app.exe")
+        self.assertTrue(self.registry.is_blacklisted("C:\\Test\\app.exe"))
+        self.registry.remove_from_blacklist("C:\\Test\\app.exe")
+        self.assertFalse(self.registry.is_known("C:\\Test\\app.exe"))
+    
+    def test_persistence(self):
+        """Test lists and settings survive reopening."""
+        self.registry.add_many_to_blacklist(["C:\\Test\\app1.exe", "C:\\Test\\app2.exe"])
+        self.registry.update_setting('ui_font_size', 16)
+        reopened = SqliteAppRegistry(db_file=self.db_file)
+        self.assertEqual(reopened.get_blacklist(), ["C:\\Test\\app1.exe", "C:\\Test\\app2.exe"])
+        self.assertEqual(reopened.get_setting('ui_font_size'), 16)
+        reopened.close()
+    
+    def test_paging_and_search(self):
+        """Test paged and filtered listing via SQL."""
+        self.registry.add_many_to_whitelist([f"C:\\Apps\\tool{i:03d}.exe" for i in range(100)])
+        self.registry.add_to_whitelist("C:\\Other\\chrome.exe")
+        page = self.registry.query_apps('whitelist', offset=10, limit=5)
+        self.assertEqual(page, [f"C:\\Apps\\tool{i:03d}.exe" for i in range(10, 15)])
+        self.assertEqual(self.registry.count_apps('whitelist'), 101)
+        self.assertEqual(self.registry.query_apps('whitelist', search="CHROME"), ["C:\\Other\\chrome.exe"])
+        self.assertEqual(self.registry.count_apps('whitelist', search="apps/tool05"), 10)
+        self.assertEqual(self.registry.count_apps('whitelist', search="100%"), 0)
+        with self.assertRaises(ValueError):
+            self.registry.query_apps('greylist')
+    
+    def test_history(self):
+        """Test every decision is recorded."""
+        app_path = "C:\\Test\\app.exe"
+        self.registry.add_to_blacklist(app_path)
+        self.registry.add_to_whitelist(app_path)
+        self.registry.forget_app(app_path)
+        history = self.registry.get_history(app_path)
+        self.assertEqual([d for _, d, _ in history], ['forget', 'whitelist', 'blacklist'])
+    
+    def test_clear_lists(self):
+        """Test clearing both lists."""
+        self.registry.add_to_whitelist("C:\\Test\\app1.exe")
+        self.registry.add_to_blacklist("C:\\Test\\app2.exe")
+        self.registry.clear_lists()
+        self.assertEqual(self.registry.count_apps('whitelist'), 0)
+        self.assertEqual(self.registry.count_apps('blacklist'), 0)
+    
+    def test_import_replaces_everything(self):
+        """Test import replaces lists and settings, resetting settings missing from the file."""
+        self.registry.add_to_whitelist("C:\\Old\\old.exe")
+        self.registry.update_setting('ui_font_size', 16)
+        self.registry.update_setting('enable_notifications', False)
+        json_file = os.path.join(self.temp_dir, 'settings.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({'whitelist': [], 'blacklist': ["C:\\B\\b.exe"], 'settings': {'ui_font_size': 10}}, f)
+        
+        self.registry.import_json(json_file)
+        self.assertFalse(self.registry.is_known("C:\\Old\\old.exe"))
+        self.assertTrue(self.registry.is_blacklisted("C:\\B\\b.exe"))
+        self.assertEqual(self.registry.get_setting('ui_font_size'), 10)
+        self.assertTrue(self.registry.get_setting('enable_notifications'))
+        
+        reopened = SqliteAppRegistry(db_file=self.db_file)
+        self.assertEqual(reopened.get_setting('ui_font_size'), 10)
+        self.assertTrue(reopened.get_setting('enable_notifications'))
+        reopened.close()
+    
+    def test_failed_import_changes_nothing(self):
+        """Test an import failing partway leaves lists and settings untouched."""
+        self.registry.add_to_whitelist("C:\\Old\\old.exe")
+        self.registry.update_setting('ui_font_size', 16)
+        json_file = os.path.join(self.temp_dir, 'settings.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({'whitelist': ["C:\\A\\a.exe"], 'blacklist': [None], 'settings': {'ui_font_size': 10}}, f)
+        
+        with self.assertRaises(Exception):
+            self.registry.import_json(json_file)
+        self.assertTrue(self.registry.is_whitelisted("C:\\Old\\old.exe"))
+        self.assertFalse(self.registry.is_known("C:\\A\\a.exe"))
+        self.assertEqual(self.registry.get_setting('ui_font_size'), 16)
+        self.assertEqual(self.registry.get_history("C:\\Old\\old.exe")[0][1], 'whitelist')
+    
+    def test_first_seen(self):
+        """Test detection time is kept when the app is decided on later."""
+        app_path = "C:\\Test\\app.exe"
+        self.assertIsNone(self.registry.get_first_seen(app_path))
+        self.registry.mark_seen_many([app_path])
+        first_seen = self.registry.get_first_seen(app_path)
+        self.assertFalse(self.registry.is_known(app_path))
+        
+        time.sleep(0.01)
+        self.registry.add_to_blacklist(app_path)
+        self.registry.mark_seen_many([app_path])
+        self.assertEqual(self.registry.get_first_seen(app_path), first_seen)
+        self.assertTrue(self.registry.is_blacklisted(app_path))
+    
+    def test_clear_lists_history(self):
+        """Test clearing logs a 'forget' decision per listed app only."""
+        self.registry.add_to_whitelist("C:\\Test\\app1.exe")
+        self.registry.add_to_blacklist("C:\\Test\\app2.exe")
+        self.registry.add_to_blacklist("C:\\Test\\gone.exe")
+        self.registry.forget_app("C:\\Test\\gone.exe")
+        self.registry.clear_lists()
+        self.assertEqual(self.registry.get_history("C:\\Test\\app1.exe")[0][1], 'forget')
+        self.assertEqual(self.registry.get_history("C:\\Test\\app2.exe")[0][1], 'forget')
+        self.assertEqual([d for _, d, _ in self.registry.get_history("C:\\Test\\gone.exe")], ['forget', 'blacklist'])
+    
+    def test_revision(self):
+        """Test list changes bump the revision."""
+        revision = self.registry.revision
+        self.registry.add_to_blacklist("C:\\Test\\app.exe")
+        self.registry.clear_lists()
+        self.assertEqual(self.registry.revision, revision + 2)
+    
+    def test_import_export(self):
+        """Test JSON import on creation and export."""
+        json_file = os.path.join(self.temp_dir, 'settings.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({'whitelist': ["C:\\A\\a.exe"], 'blacklist': ["C:\\B\\b.exe"],
+                       'settings': {'ui_font_size': 10}}, f)
+        imported = SqliteAppRegistry(db_file=os.path.join(self.temp_dir, 'imported.db'), import_from=json_file)
+        self.assertTrue(imported.is_whitelisted("C:\\A\\a.exe"))
+        self.assertTrue(imported.is_blacklisted("C:\\B\\b.exe"))
+        self.assertEqual(imported.get_setting('ui_font_size'), 10)
+        
+        export_file = os.path.join(self.temp_dir, 'export.json')
+        imported.export_json(export_file)
+        imported.close()
+        with open(export_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['whitelist'], ["C:\\A\\a.exe"])
+        self.assertEqual(data['blacklist'], ["C:\\B\\b.exe"])
+    
+    def test_concurrent_readers(self):
+        """Test lookups from several threads while one thread writes."""
+        errors = []
+        
+        def reader():
+            try:
+                for i in range(200):
+                    self.registry.is_known(f"C:\\Apps\\app{i}.exe")
+                    self.registry.count_apps('blacklist')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                self.registry.close()
+        
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(200):
+            self.registry.add_to_blacklist(f"C:\\Apps\\app{i}.exe")
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.registry.count_apps('blacklist'), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
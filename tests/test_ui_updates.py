@@ -0,0 +1,122 @@
+"""Tests for UI update channel module"""
+import threading
+import unittest
+from monitor import ConnectionDelta, ConnectionSnapshot, Connection
+from ui_updates import UiUpdateChannel
+
+
+class FakeClock:
+    """Clock advanced by handlers to simulate slow UI work."""
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_conn(port: int) -> Connection:
+    return Connection("app.exe", "C:\\app.exe", 100, "10.0.0.2", port, "1.1.1.1", 443, "ESTABLISHED", "TCP")
+
+
+class TestUiUpdateChannel(unittest.TestCase):
+    """Test coalescing, batching and the per-dispatch budget."""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.channel = UiUpdateChannel(budget=0.010, batch_size=3, clock=self.clock)
+        self.seen = []
+    
+    def test_latest_keeps_newest(self):
+        """Test only the newest value of a kind is delivered."""
+        for tick in range(5):
+            self.channel.set_latest('connections', tick)
+        self.assertEqual(self.channel.pending(), 1)
+        self.channel.dispatch({'connections': self.seen.append})
+        self.assertEqual(self.seen, [4])
+        self.assertEqual(self.channel.coalesced, 4)
+        self.assertEqual(self.channel.pending(), 0)
+    
+    def test_latest_merge(self):
+        """Test merge combines the pending and new snapshot deltas."""
+        older = ConnectionSnapshot(1, (), ConnectionDelta(opened=[make_conn(1)], total=1), 0.0)
+        newer = ConnectionSnapshot(2, (), ConnectionDelta(opened=[make_conn(2)], total=2), 0.0)
+        for snapshot in (older, newer):
+            self.channel.set_latest('connections', snapshot, merge=lambda pending, new: new.merged_after(pending))
+        self.channel.dispatch({'connections': self.seen.append})
+        snapshot, = self.seen
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual({conn.local_port for conn in snapshot.delta.opened}, {1, 2})
+    
+    def test_batch_deduplicated_in_order(self):
+        """Test batch items keep arrival order and drop duplicates."""
+        for app in ("a", "b", "a", "c"):
+            self.channel.add('new_apps', app)
+        self.channel.dispatch({'new_apps': self.seen.append})
+        self.assertEqual(self.seen, [["a", "b", "c"]])
+    
+    def test_batch_chunks(self):
+        """Test handlers get at most batch_size items per call."""
+        for app in range(7):
+            self.channel.add('new_apps', app)
+        handled = self.channel.dispatch({'new_apps': self.seen.append})
+        self.assertEqual(handled, 7)
+        self.assertEqual(self.seen, [[0, 1, 2], [3, 4, 5], [6]])
+    
+    def test_batch_size_per_kind(self):
+        """Test per-kind chunk sizes override the default."""
+        self.channel.batch_sizes['app_lists'] = 100
+        for app in range(7):
+            self.channel.add('app_lists', app)
+        self.channel.dispatch({'app_lists': self.seen.append})
+        self.assertEqual(self.seen, [list(range(7))])
+    
+    def test_budget_defers_batches(self):
+        """Test slow handlers stop the dispatch and the rest waits."""
+        def slow(items):
+            self.seen.append(items)
+            self.clock.now += 0.006
+        
+        for app in range(9):
+            self.channel.add('new_apps', app)
+        self.assertEqual(self.channel.dispatch({'new_apps': slow}), 6)  # Two chunks fit in 10ms
+        self.assertEqual(self.channel.deferred, 1)
+        self.assertEqual(self.channel.pending(), 3)
+        self.channel.dispatch({'new_apps': slow})
+        self.assertEqual(self.seen[-1], [6, 7, 8])
+        self.assertEqual(self.channel.pending(), 0)
+    
+    def test_batch_progress_when_over_budget(self):
+        """Test at least one chunk is handled even if latest values used the budget."""
+        def slow_latest(value):
+            self.clock.now += 1.0
+        
+        self.channel.set_latest('connections', 1)
+        self.channel.add('new_apps', "a")
+        self.channel.dispatch({'connections': slow_latest, 'new_apps': self.seen.append})
+        self.assertEqual(self.seen, [["a"]])
+    
+    def test_concurrent_producers(self):
+        """Test updates from several threads are all accounted for."""
+        def produce(worker):
+            for tick in range(500):
+                self.channel.set_latest('connections', (worker, tick))
+                self.channel.add('new_apps', (worker, tick % 50))
+        
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.channel.budget = 10.0
+        apps = []
+        latest = []
+        self.channel.dispatch({'connections': latest.append, 'new_apps': apps.extend})
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(latest[0][1], 499)
+        self.assertEqual(len(apps), 200)
+        self.assertEqual(self.channel.coalesced, 1999)
+
+
+if __name__ == '__main__':
+    unittest.main()
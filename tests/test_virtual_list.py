@@ -0,0 +1,177 @@
+"""Tests for virtual list module"""
+import unittest
+from virtual_list import VirtualListModel, SortedKeyList, PagedSequence
+
+
+class TestVirtualListModel(unittest.TestCase):
+    """Test viewport math and row recycling."""
+    
+    def setUp(self):
+        self.renders = 0
+        
+        def render(item):
+            self.renders += 1
+            return item
+        
+        self.model = VirtualListModel(row_height=50, render=render)
+        self.model.resize(500)  # 10 rows visible
+        self.model.set_items(list(range(10000)))
+    
+    def test_slot_count_constant(self):
+        """Test rows needed depend only on viewport height."""
+        self.assertEqual(self.model.slot_count(), 11)
+        self.assertFalse(self.model.resize(480))  # Still 10 rows
+        self.assertTrue(self.model.resize(1000))
+        self.assertEqual(self.model.slot_count(), 21)
+    
+    def test_initial_draw_then_nothing(self):
+        """Test first draw fills the slots; unchanged data redraws nothing."""
+        updates = self.model.pending_updates()
+        self.assertEqual([slot for slot, _ in updates], list(range(11)))
+        self.assertEqual(updates[3][1], 3)
+        self.assertEqual(self.model.pending_updates(), [])
+    
+    def test_scroll_recycles_slots(self):
+        """Test scrolling redraws at most the visible slots, with shifted items."""
+        self.model.pending_updates()
+        self.model.scroll_by(1)
+        updates = self.model.pending_updates()
+        self.assertEqual(len(updates), 11)
+        self.assertEqual(updates[0], (0, 1))
+        self.assertEqual(self.model.visible_range(), range(1, 12))
+    
+    def test_in_place_update(self):
+        """Test changing one visible item redraws one slot only."""
+        self.model.pending_updates()
+        items = list(range(10000))
+        items[4] = 'changed'
+        self.model.set_items(items)
+        self.assertEqual(self.model.pending_updates(), [(4, 'changed')])
+    
+    def test_clamping(self):
+        """Test scrolling stops at the ends."""
+        self.model.scroll_by(-5)
+        self.assertEqual(self.model.first, 0)
+        self.model.scroll_to(10 ** 6)
+        self.assertEqual(self.model.first, 10000 - 10)
+        self.model.set_items(list(range(20)))
+        self.assertEqual(self.model.first, 10)
+    
+    def test_shrinking_list_hides_slots(self):
+        """Test slots past the end of the list are reported as hidden."""
+        self.model.pending_updates()
+        self.model.set_items([1, 2, 3])
+        updates = dict(self.model.pending_updates())
+        self.assertEqual(updates[0], 1)
+        self.assertIsNone(updates[3])
+        self.assertIsNone(updates[10])
+    
+    def test_scrollbar(self):
+        """Test scrollbar span and drag."""
+        self.assertEqual(self.model.scrollbar_span(), (0.0, 0.001))
+        self.model.scroll_to_fraction(0.5)
+        self.assertEqual(self.model.first, 5000)
+        self.model.set_items([1, 2])
+        self.assertEqual(self.model.scrollbar_span(), (0.0, 1.0))
+    
+    def test_render_cost_independent_of_size(self):
+        """Test a redraw only renders visible items."""
+        self.renders = 0
+        self.model.pending_updates()
+        self.assertEqual(self.renders, 11)
+
+
+
+class TestSortedKeyList(unittest.TestCase):
+    """Test keyed list reconciliation."""
+    
+    def setUp(self):
+        self.keys = SortedKeyList(["C:\\b.exe", "C:\\d.exe", "C:\\a.exe"])
+    
+    def test_sorted_unique(self):
+        """Test keys are kept sorted without duplicates."""
+        self.assertEqual(list(self.keys), ["C:\\a.exe", "C:\\b.exe", "C:\\d.exe"])
+        self.assertFalse(self.keys.add("C:\\a.exe"))
+        self.assertEqual(len(self.keys), 3)
+    
+    def test_add_discard(self):
+        """Test single inserts/removals land in place."""
+        self.assertTrue(self.keys.add("C:\\c.exe"))
+        self.assertEqual(self.keys.index("C:\\c.exe"), 2)
+        self.assertTrue(self.keys.discard("C:\\a.exe"))
+        self.assertFalse(self.keys.discard("C:\\a.exe"))
+        self.assertEqual(self.keys.index("C:\\a.exe"), -1)
+        self.assertNotIn("C:\\a.exe", self.keys)
+    
+    def test_sync(self):
+        """Test reconciling against a full set reports the differences."""
+        self.assertEqual(self.keys.sync(["C:\\a.exe", "C:\\d.exe", "C:\\e.exe"]), (1, 1))
+        self.assertEqual(list(self.keys), ["C:\\a.exe", "C:\\d.exe", "C:\\e.exe"])
+        self.assertEqual(self.keys.sync(list(self.keys)), (0, 0))
+    
+    def test_view_redraws_only_affected_rows(self):
+        """Test one insert in a 50k list redraws only the slots at/after it."""
+        keys = SortedKeyList(f"C:\\Apps\\app{i:05}.exe" for i in range(0, 100000, 2))
+        model = VirtualListModel(row_height=50, render=lambda key: key)
+        model.resize(500)
+        model.set_items(keys)
+        model.pending_updates()
+        
+        keys.add("C:\\Apps\\app00007.exe")  # Between slots 3 and 4
+        updates = model.pending_updates()
+        self.assertEqual([slot for slot, _ in updates], list(range(4, 11)))
+        self.assertEqual(updates[0][1], "C:\\Apps\\app00007.exe")
+        
+        keys.add("C:\\Apps\\app90001.exe")  # Off screen
+        self.assertEqual(model.pending_updates(), [])
+
+
+class TestPagedSequence(unittest.TestCase):
+    """Test page-at-a-time access to a large source."""
+    
+    def setUp(self):
+        self.data = [f"C:\\Apps\\app{i:05}.exe" for i in range(1000)]
+        self.counts = 0
+        self.fetches = []
+        
+        def count():
+            self.counts += 1
+            return len(self.data)
+        
+        def fetch(offset, limit):
+            self.fetches.append(offset)
+            return self.data[offset:offset + limit]
+        self.items = PagedSequence(count, fetch, page_size=100, max_pages=2)
+    
+    def test_viewport_fetches_one_page(self):
+        """Test showing rows costs one count and one page query."""
+        model = VirtualListModel(10, lambda item: item)
+        model.resize(100)
+        model.set_items(self.items)
+        model.scroll_to(450)
+        updates = model.pending_updates()
+        self.assertEqual([item for _, item in updates][:2], self.data[450:452])
+        self.assertEqual(self.counts, 1)
+        self.assertEqual(self.fetches, [400])
+    
+    def test_pages_cached_lru(self):
+        """Test recently used pages are reused and old ones evicted."""
+        self.assertEqual(self.items[5], self.data[5])
+        self.assertEqual(self.items[150], self.data[150])
+        self.assertEqual(self.items[6], self.data[6])
+        self.assertEqual(self.items[250], self.data[250])  # Evicts page 1
+        self.assertEqual(self.items[-1], self.data[-1])  # Evicts page 0
+        self.assertEqual(self.items[7], self.data[7])
+        self.assertEqual(self.fetches, [0, 100, 200, 900, 0])
+    
+    def test_bounds_and_shrunk_source(self):
+        """Test out-of-range access raises and rows gone since len() read as None."""
+        with self.assertRaises(IndexError):
+            self.items[1000]
+        len(self.items)
+        del self.data[950:]
+        self.assertIsNone(self.items[960])
+
+
+if __name__ == '__main__':
+    unittest.main()
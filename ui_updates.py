@@ -0,0 +1,111 @@
+"""
+UI Updates - Coalescing channel from background threads to the Tk main loop
+"""
+import threading
+import time
+from typing import Callable, Dict, Hashable, List
+from config import UI_UPDATE_BUDGET, UI_BATCH_SIZE
+
+class UiUpdateChannel:
+    """
+    Thread-safe inbox of pending UI work, drained by the main loop.
+    
+    Two kinds of entries:
+      - latest: set_latest() keeps one value per kind; a newer value
+        replaces (or, with merge, is combined with) the queued one, so a
+        stalled UI catches up with one update instead of replaying ticks
+      - batch: add() queues items per kind, dropping duplicates, and the
+        handler gets them in chunks of batch_size (per-kind overrides in
+        batch_sizes)
+    Nothing is posted to Tk from other threads; the main loop calls
+    dispatch() on a fixed cadence and stops when its time budget is spent.
+    """
+    
+    def __init__(self, budget: float = UI_UPDATE_BUDGET, batch_size: int = UI_BATCH_SIZE,
+                 clock: Callable[[], float] = time.perf_counter, batch_sizes: Dict[str, int] = None):
+        self.budget = budget  # seconds per dispatch()
+        self.batch_size = max(1, batch_size)
+        self.batch_sizes = dict(batch_sizes or {})  # kind -> chunk size, for cheap handlers
+        self.clock = clock
+        self.coalesced = 0  # latest values replaced before the UI saw them
+        self.deferred = 0  # dispatch() calls that left batch work for the next one
+        self._latest: Dict[str, object] = {}
+        self._batches: Dict[str, Dict[Hashable, None]] = {}  # kind -> ordered set of items
+        self._lock = threading.Lock()
+    
+    def set_latest(self, kind: str, value, merge: Callable[[object, object], object] = None):
+        """
+        Replace the pending value of kind (any thread).
+        
+        Args:
+            merge: Called as merge(pending, value) when a value is already
+                   queued; its result is queued instead of value
+        """
+        with self._lock:
+            if kind in self._latest:
+                self.coalesced += 1
+                if merge is not None:
+                    value = merge(self._latest[kind], value)
+            self._latest[kind] = value
+    
+    def add(self, kind: str, item: Hashable):
+        """Queue an item for kind's batch handler (any thread, duplicates ignored)."""
+        with self._lock:
+            self._batches.setdefault(kind, {})[item] = None
+    
+    def pending(self) -> int:
+        """Number of queued values and items."""
+        with self._lock:
+            return len(self._latest) + sum(len(items) for items in self._batches.values())
+    
+    def dispatch(self, handlers: Dict[str, Callable]) -> int:
+        """
+        Run handlers for queued work (main thread).
+        
+        Latest values are always delivered; batches are handed out in
+        chunks until the budget is spent (at least one chunk per call, so
+        they always make progress).
+        
+        Args:
+            handlers: kind -> callable(value) for latest kinds,
+                      callable(list of items) for batch kinds
+            
+        Returns:
+            Number of values/items handled
+        """
+        deadline = self.clock() + self.budget
+        with self._lock:
+            latest, self._latest = self._latest, {}
+        handled = 0
+        for kind, value in latest.items():
+            handlers[kind](value)
+            handled += 1
+        
+        while True:
+            chunk = self._take_chunk()
+            if chunk is None:
+                break
+            kind, items = chunk
+            handlers[kind](items)
+            handled += len(items)
+            if self.clock() >= deadline:
+                if self.pending():
+                    self.deferred += 1  # Rest waits for the next call
+                break
+        return handled
+    
+    def _take_chunk(self):
+        """Remove up to batch_size items of the first non-empty batch kind (or None)."""
+        with self._lock:
+            for kind, items in self._batches.items():
+                if items:
+                    size = self.batch_sizes.get(kind, self.batch_size)
+                    chunk: List = []
+                    for item in items:
+                        chunk.append(item)
+                        if len(chunk) >= size:
+                            break
+                    for item in chunk:
+                        del items[item]
+                    return kind, chunk
+            return None
@@ -0,0 +1,218 @@
+"""
+Virtual List - Viewport and row-recycling logic for long widget lists
+
+Tk-independent so it can be tested headless; the widgets in gui.py only
+create VirtualListModel.slot_count() rows and redraw the slots it reports.
+"""
+import math
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, Sequence, Tuple
+
+_UNSET = object()  # Slot not drawn yet
+
+class VirtualListModel:
+    """
+    Which items are visible, and which recycled row slots need redrawing.
+    
+    The list is scrolled in whole rows: slot i shows item first + i. Each
+    slot remembers the render key (display values) it last showed, so
+    updates only touch slots whose content actually changed.
+    """
+    
+    def __init__(self, row_height: int, render: Callable[[object], Hashable]):
+        self.row_height = max(1, row_height)
+        self.render = render  # item -> display values (compared to skip unchanged slots)
+        self.items: Sequence = ()
+        self.first = 0
+        self.viewport_rows = 0
+        self._shown: List = []  # Render key per slot (None = hidden)
+    
+    def slot_count(self) -> int:
+        """Number of row widgets needed (viewport + one partially visible row)."""
+        return self.viewport_rows + 1 if self.viewport_rows else 0
+    
+    def resize(self, height: int) -> bool:
+        """
+        Set viewport height in pixels.
+        
+        Returns:
+            True if the number of slots changed (widgets must be added/removed)
+        """
+        rows = max(1, math.ceil(height / self.row_height)) if height > 0 else 0
+        if rows == self.viewport_rows:
+            return False
+        self.viewport_rows = rows
+        self._shown = [_UNSET] * self.slot_count()
+        self.first = self._clamp(self.first)
+        return True
+    
+    def set_items(self, items: Sequence):
+        """Replace the items (keeps the scroll position where possible)."""
+        self.items = items
+        self.first = self._clamp(self.first)
+    
+    def scroll_to(self, first: int):
+        """Make item `first` the top row."""
+        self.first = self._clamp(first)
+    
+    def scroll_by(self, rows: int):
+        """Scroll by a number of rows (negative = up)."""
+        self.scroll_to(self.first + rows)
+    
+    def scroll_to_fraction(self, fraction: float):
+        """Scroll to a position given as a fraction of the list (scrollbar drag)."""
+        self.scroll_to(round(fraction * len(self.items)))
+    
+    def scrollbar_span(self) -> Tuple[float, float]:
+        """Visible part of the list as (top, bottom) fractions for a scrollbar."""
+        total = len(self.items)
+        if total <= self.viewport_rows or total == 0:
+            return 0.0, 1.0
+        return self.first / total, min(1.0, (self.first + self.viewport_rows) / total)
+    
+    def visible_range(self) -> range:
+        """Indices of the items currently in the viewport slots."""
+        return range(self.first, min(len(self.items), self.first + self.slot_count()))
+    
+    def invalidate(self):
+        """Force every slot to redraw (e.g. font or style change)."""
+        self._shown = [_UNSET] * self.slot_count()
+    
+    def pending_updates(self) -> List[Tuple[int, object]]:
+        """
+        Get slots whose content changed since the last call.
+        
+        Returns:
+            [(slot, item)] - item is None for slots that should be hidden
+        """
+        updates = []
+        items = self.items
+        for slot in range(self.slot_count()):
+            index = self.first + slot
+            if index < len(items):
+                item = items[index]
+                key = self.render(item)
+            else:
+                item = key = None
+            if self._shown[slot] is _UNSET or self._shown[slot] != key:
+                self._shown[slot] = key
+                updates.append((slot, item))
+        return updates
+    
+    def _clamp(self, first: int) -> int:
+        """Keep the top row so the viewport stays filled when possible."""
+        return max(0, min(first, len(self.items) - self.viewport_rows))
+
+class SortedKeyList:
+    """
+    Sorted, duplicate-free list of keys (e.g. app paths) for a list view.
+    
+    Single changes are applied in place with a binary search (no resort),
+    and sync() reconciles against a full new set by inserting/removing
+    only the differences, so the view can redraw just the affected rows.
+    """
+    
+    def __init__(self, keys: Iterable = ()):
+        self._keys = sorted(set(keys))
+    
+    def add(self, key) -> bool:
+        """Insert key at its sorted position; False if already present."""
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return False
+        self._keys.insert(index, key)
+        return True
+    
+    def discard(self, key) -> bool:
+        """Remove key; False if not present."""
+        index = self.index(key)
+        if index < 0:
+            return False
+        del self._keys[index]
+        return True
+    
+    def sync(self, keys: Iterable) -> Tuple[int, int]:
+        """
+        Make the list contain exactly `keys`.
+        
+        Returns:
+            (added, removed) counts
+        """
+        new = set(keys)
+        old = set(self._keys)
+        added = new - old
+        removed = old - new
+        if len(added) + len(removed) > len(self._keys) // 8:
+            self._keys = sorted(new)  # Cheaper to rebuild than to patch
+        else:
+            for key in removed:
+                self.discard(key)
+            for key in added:
+                self.add(key)
+        return len(added), len(removed)
+    
+    def index(self, key) -> int:
+        """Position of key, or -1."""
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return -1
+    
+    def __contains__(self, key) -> bool:
+        return self.index(key) >= 0
+    
+    def __getitem__(self, index):
+        return self._keys[index]
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __iter__(self):
+        return iter(self._keys)
+
+class PagedSequence:
+    """
+    Read-only sequence over a paged source (e.g. a registry's query_apps).
+    
+    len() is one count query; items are fetched a page at a time on first
+    access, so showing a viewport costs one or two page queries however
+    long the list is. The most recently used `max_pages` pages are kept.
+    The data is a snapshot: make a new sequence when the source changes
+    (rows it no longer has read as None, which the model hides).
+    """
+    
+    def __init__(self, count: Callable[[], int], fetch: Callable[[int, int], List],
+                 page_size: int = 200, max_pages: int = 8):
+        """
+        Args:
+            count: Number of items
+            fetch: (offset, limit) -> items
+        """
+        self._count = count
+        self._fetch = fetch
+        self.page_size = max(1, page_size)
+        self.max_pages = max(1, max_pages)
+        self._len = None
+        self._pages: OrderedDict = OrderedDict()  # page number -> items, least recently used first
+    
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = self._count()
+        return self._len
+    
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        number, offset = divmod(index, self.page_size)
+        page = self._pages.get(number)
+        if page is None:
+            page = self._fetch(number * self.page_size, self.page_size)
+            self._pages[number] = page
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(number)
+        return page[offset] if offset < len(page) else None  # None: source shrank since len() (hidden row)